@@ -0,0 +1,218 @@
+import itertools
+import math
+import sys
+import threading
+
+METHODS = ("fast", "kahan")
+# As in vectorized: from 3.12 sum() keeps a Neumaier correction, so "fast" keeps one too to match suma.
+COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def _check_method(method):
+    if method not in METHODS:
+        raise ValueError(f"Unknown accumulator method '{method}', expected one of {METHODS}.")
+
+
+class SumAccumulator:
+    __slots__ = ("total", "compensation", "count", "compensated")
+
+    def __init__(self, values=(), compensated=False):
+        self.total = 0.0
+        self.compensation = 0.0
+        self.count = 0
+        self.compensated = compensated
+        self.add_many(values)
+
+    def __repr__(self):
+        return f"SumAccumulator(value={self.value!r}, count={self.count})"
+
+    @property
+    def value(self):
+        # Like sum(), a zero correction leaves the sign of -0.0 alone and an infinite total is not made nan.
+        compensation = self.compensation
+        if compensation and math.isfinite(compensation):
+            return self.total + compensation
+        return self.total
+
+    def add(self, value):
+        self._accumulate(float(value))
+        self.count += 1
+
+    def add_many(self, values):
+        values = list(map(float, values))
+        self._accumulate_many(values)
+        self.count += len(values)
+
+    def remove(self, value):
+        self._accumulate(-float(value))
+        self.count -= 1
+
+    def remove_many(self, values):
+        values = [-float(value) for value in values]
+        self._accumulate_many(values)
+        self.count -= len(values)
+
+    def merge(self, other):
+        self._accumulate_many((other.total, other.compensation))
+        self.count += other.count
+        return self
+
+    def _accumulate(self, value):
+        if not (self.compensated or COMPENSATED_SUM):
+            self.total += value
+            return
+        # Neumaier step: keep the low-order bits the addition drops.
+        total = self.total
+        step = total + value
+        if abs(total) >= abs(value):
+            self.compensation += (total - step) + value
+        else:
+            self.compensation += (value - step) + total
+        self.total = step
+
+    def _accumulate_many(self, values):
+        if not (self.compensated or COMPENSATED_SUM):
+            # Starting sum() from the running total adds in the same order as one call to suma.
+            self.total = sum(values, self.total)
+            return
+        total = self.total
+        compensation = self.compensation
+        for value in values:
+            step = total + value
+            if abs(total) >= abs(value):
+                compensation += (total - step) + value
+            else:
+                compensation += (value - step) + total
+            total = step
+        self.total = total
+        self.compensation = compensation
+
+
+class RestaAccumulator:
+    __slots__ = ("first", "subtrahend")
+
+    def __init__(self, values=(), compensated=False):
+        self.first = None
+        self.subtrahend = SumAccumulator(compensated=compensated)
+        self.add_many(values)
+
+    def __repr__(self):
+        first = "empty" if self.first is None else repr(self.value)
+        return f"RestaAccumulator(value={first}, count={self.count})"
+
+    @property
+    def count(self):
+        return self.subtrahend.count + (self.first is not None)
+
+    @property
+    def value(self):
+        if self.first is None:
+            raise IndexError("resta() requires at least one number.")
+        return self.first - self.subtrahend.value
+
+    def add(self, value):
+        if self.first is None:
+            self.first = float(value)
+        else:
+            self.subtrahend.add(value)
+
+    def add_many(self, values):
+        values = iter(values)
+        if self.first is None:
+            for value in values:
+                self.first = float(value)
+                break
+        self.subtrahend.add_many(values)
+
+    def remove(self, value):
+        # Removes a subtrahend; the first operand stays fixed.
+        self.subtrahend.remove(value)
+
+    def remove_many(self, values):
+        self.subtrahend.remove_many(values)
+
+    def merge(self, other):
+        # other holds the values that come after this shard, so its first operand is subtracted too.
+        if other.first is None:
+            return self
+        if self.first is None:
+            self.first = other.first
+        else:
+            self.subtrahend.add(other.first)
+        self.subtrahend.merge(other.subtrahend)
+        return self
+
+
+KINDS = {"suma": SumAccumulator, "resta": RestaAccumulator}
+
+_lock = threading.Lock()
+_handles = {}
+_ids = itertools.count(1)
+
+
+def _kind(accumulator):
+    return next(kind for kind, cls in KINDS.items() if type(accumulator) is cls)
+
+
+def _entry(handle):
+    try:
+        return _handles[handle]
+    except KeyError:
+        raise LookupError(f"No accumulator with handle {handle}.") from None
+
+
+def crear(kind="suma", method="fast"):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown accumulator kind '{kind}', expected one of {tuple(KINDS)}.")
+    _check_method(method)
+    accumulator = KINDS[kind](compensated=method == "kahan")
+    with _lock:
+        handle = next(_ids)
+        _handles[handle] = (accumulator, threading.Lock())
+    return handle
+
+
+def agregar(handle, *values):
+    accumulator, lock = _entry(handle)
+    with lock:
+        accumulator.add_many(values)
+        return accumulator.value
+
+
+def quitar(handle, *values):
+    accumulator, lock = _entry(handle)
+    with lock:
+        accumulator.remove_many(values)
+        return accumulator.value
+
+
+def valor(handle):
+    accumulator, lock = _entry(handle)
+    with lock:
+        return accumulator.value
+
+
+def combinar(handle, other):
+    accumulator, lock = _entry(handle)
+    source, source_lock = _entry(other)
+    if source is accumulator:
+        raise ValueError("Cannot merge an accumulator into itself.")
+    if type(source) is not type(accumulator):
+        raise ValueError(f"Cannot merge a {_kind(source)} accumulator into a {_kind(accumulator)} accumulator.")
+    # Lock in handle order so two opposite merges cannot deadlock.
+    first, second = (lock, source_lock) if handle < other else (source_lock, lock)
+    with first, second:
+        accumulator.merge(source)
+        return accumulator.value
+
+
+def cerrar(handle):
+    with _lock:
+        accumulator, lock = _entry(handle)
+        del _handles[handle]
+    with lock:
+        try:
+            return accumulator.value
+        except IndexError:
+            # An empty resta has no value, but closing it is not an error.
+            return None
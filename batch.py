@@ -0,0 +1,131 @@
+import collections
+import json
+import json.encoder
+import sys
+import time
+
+import dispatcher
+
+# Jobs per dispatcher task; big enough that queueing and futures cost little per job.
+CHUNK_SIZE = 1024
+# Chunks in flight per worker thread; bounds memory however long the input is.
+AHEAD = 2
+OUTPUT_BUFFER = 1 << 20
+
+_decoder = json.JSONDecoder()
+
+
+def _loads(line):
+    # The scanner alone skips json.loads' per-call wrapper; anything it does not fully accept goes through
+    # json.loads, which also produces the error message.
+    try:
+        value, end = _decoder.scan_once(line, 0)
+    except StopIteration:
+        return json.loads(line)
+    if end == len(line) or line[end:].isspace():
+        return value
+    return json.loads(line)
+
+
+if json.encoder.c_make_encoder is not None:
+    # Built once instead of on every JSONEncoder.encode call; same output as ensure_ascii=False, default=str.
+    _iterencode = json.encoder.c_make_encoder(
+        {}, str, json.encoder.encode_basestring, None, ": ", ", ", False, False, True,
+    )
+
+    def _encode(value):
+        return "".join(_iterencode(value, 0))
+else:
+    _encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+
+
+def _chunks(lines, size):
+    chunk = []
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse(lines):
+    # Lines that are not JSON get their response now; the rest become jobs for main.run_batch.
+    jobs = []
+    responses = []
+    for line in lines:
+        try:
+            jobs.append(_loads(line))
+            responses.append(None)
+        except json.JSONDecodeError as error:
+            responses.append({"id": None, "error": f"Invalid JSON: {error}"})
+    return jobs, responses
+
+
+def _write(future, jobs, responses, output):
+    try:
+        results = iter(future.result())
+    except Exception as error:
+        results = iter([{"func": None, "error": str(error)}] * len(jobs))
+    jobs = iter(jobs)
+    errors = 0
+    lines = []
+    for response in responses:
+        if response is None:
+            job = next(jobs)
+            response = {"id": job.get("id") if isinstance(job, dict) else None}
+            response.update(next(results))
+        if "error" in response:
+            errors += 1
+        lines.append(_encode(response))
+    lines.append("")
+    output.write("\n".join(lines))
+    return errors
+
+
+def run(lines, output, workers=None, chunk_size=CHUNK_SIZE, parallel=False):
+    # Writes one JSON line per job, in input order, and returns the counts for the final report.
+    started = time.perf_counter()
+    count = 0
+    errors = 0
+    pending = collections.deque()
+    with dispatcher.Dispatcher(workers, timeout=None, parallel=parallel) as pool:
+        ahead = AHEAD * pool.workers
+        for chunk in _chunks(lines, chunk_size):
+            jobs, responses = _parse(chunk)
+            pending.append((pool.submit_batch(jobs), jobs, responses))
+            count += len(chunk)
+            if len(pending) > ahead:
+                errors += _write(*pending.popleft(), output)
+        while pending:
+            errors += _write(*pending.popleft(), output)
+    output.flush()
+    seconds = time.perf_counter() - started
+    return {"jobs": count, "errors": errors, "seconds": seconds, "rate": count / seconds if seconds else 0.0}
+
+
+def report(stats, stream=None):
+    stream = stream or sys.stderr
+    stream.write(
+        f"{stats['jobs']} jobs in {stats['seconds']:.3f}s ({stats['rate']:.0f} jobs/s), {stats['errors']} errors\n"
+    )
+    stream.flush()
+
+
+def main(path="-", output_path=None, workers=None):
+    # "-" reads jobs from stdin; results go to stdout unless output_path is given.
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    if output_path is None:
+        output = open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=OUTPUT_BUFFER, closefd=False)
+    else:
+        output = open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER)
+    try:
+        with output:
+            stats = run(source, output, workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    report(stats)
+    return stats
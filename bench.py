@@ -0,0 +1,170 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import main
+import sinks
+import text
+import utils
+
+DEFAULT_SIZES = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_MIN_TIME = 0.2
+
+
+def make_inputs(kind, size):
+    if kind == "numeric":
+        return [n * 0.5 for n in range(size)]
+    if kind == "string":
+        return [str(n * 0.5) for n in range(size)]
+    if kind == "ascii":
+        return [f"TEXTO NUMERO {n}" for n in range(size)]
+    if kind == "unicode":
+        return [f"ÑANDÚ CAFÉ {n}" for n in range(size)]
+    raise ValueError(f"Unknown input kind '{kind}'.")
+
+
+def _dispatch(func):
+    def call(params):
+        main.main(func=func, params=params)
+    return call
+
+
+def _direct(function):
+    def call(values):
+        function(*values)
+    return call
+
+
+def _lower_joined(texts):
+    text.lower_texts(texts, output="joined")
+
+
+def _as_params(values):
+    return {f"var{n}": value for n, value in enumerate(values)}
+
+
+def _as_is(values):
+    return values
+
+
+# name -> (prepare, call, input kinds); prepare runs once per input, outside the timing.
+CASES = {
+    "suma": (_as_is, _direct(utils.suma), ("numeric", "string")),
+    "resta": (_as_is, _direct(utils.resta), ("numeric", "string")),
+    "mayuscula_a_minuscula": (_as_is, _direct(utils.mayuscula_a_minuscula), ("ascii", "unicode")),
+    "text.lower_texts[joined]": (_as_is, _lower_joined, ("ascii", "unicode")),
+    "main.suma": (_as_params, _dispatch("suma"), ("numeric", "string")),
+    "main.resta": (_as_params, _dispatch("resta"), ("numeric", "string")),
+    "main.mayuscula_a_minuscula": (_as_params, _dispatch("mayuscula_a_minuscula"), ("ascii", "unicode")),
+}
+
+
+def measure(call, values, min_time=DEFAULT_MIN_TIME, repeat=3):
+    # Grow the loop count until one round takes min_time, then keep the best round.
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            call(values)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            call(values)
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+
+def run(sizes=DEFAULT_SIZES, cases=None, min_time=DEFAULT_MIN_TIME, report=None):
+    previous = sinks.set_sink(None)
+    results = {}
+    try:
+        for size in sizes:
+            inputs = {}
+            for name in cases or CASES:
+                prepare, call, kinds = CASES[name]
+                for kind in kinds:
+                    if kind not in inputs:
+                        inputs[kind] = make_inputs(kind, size)
+                    seconds = measure(call, prepare(inputs[kind]), min_time)
+                    key = f"{name}[{kind},{size}]"
+                    results[key] = {"seconds": seconds, "per_item": seconds / size}
+                    if report is not None:
+                        report(key, results[key])
+    finally:
+        sinks.set_sink(previous)
+    _add_overheads(results)
+    return {"meta": metadata(), "results": results}
+
+
+def _add_overheads(results):
+    for key, result in list(results.items()):
+        if key.startswith("main."):
+            direct = results.get(key[len("main."):])
+            if direct is not None:
+                result["dispatch_overhead"] = result["seconds"] - direct["seconds"]
+
+
+def metadata():
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "timestamp": time.time(),
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None or reference["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append({"case": key, "ratio": ratio, "seconds": result["seconds"], "baseline": reference["seconds"]})
+    return regressions
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dispatch and the utils functions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="input sizes to measure")
+    parser.add_argument("--max-size", type=int, help="skip sizes above this")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="seconds per timing round")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown ratio")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+    current = run(sizes, args.cases, args.min_time, report=lambda key, result: print(
+        f"{key:45} {result['seconds'] * 1e6:14.3f} us", flush=True
+    ))
+    with open(args.output, "w") as output:
+        json.dump(current, output, indent=2)
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(current, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['case']}: {regression['ratio']:.2f}x slower than baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,139 @@
+import collections
+import decimal
+import functools
+import math
+import threading
+import time
+
+MISSING = object()
+
+
+def tag(arg):
+    # Tag every argument with its type: 1, 1.0 and True hash alike but lower differently.
+    kind = type(arg)
+    if kind is float and arg == 0.0:
+        # 0.0 == -0.0, but the sign survives into results such as str() and 1 / x.
+        return (kind, arg, math.copysign(1.0, arg))
+    if kind is decimal.Decimal:
+        # Decimal("1.0") == Decimal("1.00"), but the exponent carries into their sums.
+        return (kind, arg.as_tuple())
+    return (kind, arg)
+
+
+def make_key(name, args):
+    return (name, tuple(map(tag, args)))
+
+
+class ResultCache:
+    def __init__(self, maxsize=1024, ttl=None, functions=(), clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._functions = set(functions)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def enable(self, name):
+        self._functions.add(name)
+
+    def disable(self, name):
+        self._functions.discard(name)
+
+    def covers(self, name):
+        return name in self._functions
+
+    def lookup(self, name, args):
+        try:
+            key = make_key(name, args)
+            hash(key)
+        except TypeError:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires = entry
+            if expires is not None and expires <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return list(value) if isinstance(value, list) else value
+
+    def store(self, name, args, value):
+        try:
+            key = make_key(name, args)
+            hash(key)
+        except TypeError:
+            return
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        if isinstance(value, list):
+            value = list(value)
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def call(self, name, function, args):
+        value = self.lookup(name, args)
+        if value is MISSING:
+            value = function(*args)
+            self.store(name, args, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_active = None
+
+
+def active():
+    return _active
+
+
+def install(cache):
+    global _active
+    previous = _active
+    _active = cache
+    return previous
+
+
+def configure(maxsize=1024, ttl=None, functions=()):
+    cache = ResultCache(maxsize, ttl, functions)
+    install(cache)
+    return cache
+
+
+def memoize(function, name=None, cache=None):
+    name = name or function.__name__
+
+    @functools.wraps(function)
+    def wrapper(*args):
+        store = cache if cache is not None else _active
+        if store is None or not store.covers(name):
+            return function(*args)
+        return store.call(name, function, args)
+
+    return wrapper
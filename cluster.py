@@ -0,0 +1,279 @@
+import array
+import collections
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import files
+import wire
+
+# Values per shard sent to a worker; about 8 MiB of float64.
+SHARD_SIZE = 1 << 20
+# Seconds a worker may take to answer one shard before the shard goes to another worker.
+DEFAULT_TIMEOUT = 60.0
+# Shards queued ahead of the workers, per worker, so the input is never read much faster than it is reduced.
+QUEUE_DEPTH = 2
+REDUCTIONS = ("suma", "resta")
+
+
+def parse_address(address):
+    # "host:port" is TCP; anything else is a Unix socket path.
+    host, colon, port = address.rpartition(":")
+    if colon and port.isdigit() and "/" not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def connect(address, timeout=None):
+    family, target = parse_address(address)
+    connection = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        connection.settimeout(timeout)
+        connection.connect(target)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def listen(address):
+    family, target = parse_address(address)
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)
+    else:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(target)
+    listener.listen()
+    return listener
+
+
+def _serve_connection(connection):
+    with connection, connection.makefile("rb") as reader, connection.makefile("wb") as writer:
+        try:
+            wire.serve(reader, writer)
+        except OSError:
+            pass
+
+
+def serve_worker(address, listener=None):
+    # Each coordinator connection gets a thread that answers wire frames until it disconnects.
+    listener = listener or listen(address)
+    with listener:
+        while True:
+            connection, _ = listener.accept()
+            threading.Thread(target=_serve_connection, args=(connection,), daemon=True).start()
+
+
+def wait_ready(address, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connect(address, timeout).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def spawn_workers(count, directory, timeout=10.0):
+    # Local worker processes on Unix sockets in directory, for running a cluster on one machine.
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    addresses = [os.path.join(directory, f"worker-{n}.sock") for n in range(count)]
+    processes = [
+        subprocess.Popen([sys.executable, main_path, "--worker", address], stdin=subprocess.DEVNULL)
+        for address in addresses
+    ]
+    try:
+        for address in addresses:
+            wait_ready(address, timeout)
+    except OSError:
+        stop_workers(processes)
+        raise
+    return processes, addresses
+
+
+def stop_workers(processes):
+    for process in processes:
+        process.kill()
+    for process in processes:
+        process.wait()
+
+
+def shards(values, size=SHARD_SIZE):
+    values = iter(values)
+    while True:
+        shard = array.array("d", map(float, itertools.islice(values, size)))
+        if not shard:
+            return
+        yield shard
+
+
+def file_shards(path, format="text"):
+    for chunk in files.chunks(path, format):
+        # Binary chunks are views into the mapping and are released on the next step, so keep a copy
+        # in case the shard has to be sent again to another worker.
+        if format == "float64":
+            shard = array.array("d")
+            shard.frombytes(chunk.cast("B"))
+        else:
+            shard = array.array("d", chunk)
+        chunk = None
+        if shard:
+            yield shard
+
+
+class _Job:
+    def __init__(self, workers, limit):
+        self.condition = threading.Condition()
+        self.pending = collections.deque()
+        self.limit = limit
+        self.alive = workers
+        self.submitted = 0
+        self.reassigned = 0
+        self.partials = {}
+        self.producing = True
+        self.error = None
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+        if not self.alive:
+            raise ConnectionError("No cluster workers left to run the remaining shards.")
+
+    def put(self, index, shard):
+        with self.condition:
+            while len(self.pending) >= self.limit and self.alive and self.error is None:
+                self.condition.wait()
+            self._check()
+            self.pending.append((index, shard))
+            self.submitted += 1
+            self.condition.notify_all()
+
+    def take(self):
+        with self.condition:
+            while not self.pending:
+                finished = not self.producing and len(self.partials) == self.submitted
+                if finished or self.error is not None:
+                    return None
+                self.condition.wait()
+            item = self.pending.popleft()
+            self.condition.notify_all()
+            return item
+
+    def finish(self, index, value):
+        with self.condition:
+            self.partials[index] = value
+            self.condition.notify_all()
+
+    def retry(self, item):
+        with self.condition:
+            self.pending.appendleft(item)
+            self.reassigned += 1
+            self.alive -= 1
+            self.condition.notify_all()
+
+    def lost(self):
+        with self.condition:
+            self.alive -= 1
+            self.condition.notify_all()
+
+    def fail(self, error):
+        with self.condition:
+            if self.error is None:
+                self.error = error
+            self.condition.notify_all()
+
+    def wait(self):
+        with self.condition:
+            self.producing = False
+            self.condition.notify_all()
+            while len(self.partials) < self.submitted:
+                self._check()
+                self.condition.wait()
+            self._check()
+            return [self.partials[index] for index in range(self.submitted)]
+
+
+class Coordinator:
+    def __init__(self, addresses, timeout=DEFAULT_TIMEOUT, shard_size=SHARD_SIZE):
+        if not addresses:
+            raise ValueError("A cluster needs at least one worker address.")
+        self.addresses = list(addresses)
+        self.timeout = timeout
+        self.shard_size = shard_size
+        self.reassigned = 0
+
+    def _drive(self, address, job):
+        # One connection per worker, one shard in flight; a worker that fails hands its shard back.
+        try:
+            connection = connect(address, self.timeout)
+        except OSError:
+            job.lost()
+            return
+        with connection, connection.makefile("rb") as reader, connection.makefile("wb") as writer:
+            while True:
+                item = job.take()
+                if item is None:
+                    return
+                index, shard = item
+                try:
+                    wire.write_frame(writer, {"id": index, "func": "suma", "params": {"data": shard}})
+                    response = wire.read_frame(reader)
+                except (OSError, wire.WireError):
+                    response = None
+                if response is None or response.get("id") != index:
+                    job.retry(item)
+                    return
+                if "error" in response:
+                    job.fail(ValueError(f"Shard {index} failed on {address}: {response['error']}"))
+                    return
+                job.finish(index, response["value"])
+
+    def partial_sums(self, shard_iterable):
+        # Sends every shard to a worker for utils.suma and returns the partial sums in input order.
+        job = _Job(len(self.addresses), QUEUE_DEPTH * len(self.addresses))
+        threads = [threading.Thread(target=self._drive, args=(address, job), daemon=True) for address in self.addresses]
+        for thread in threads:
+            thread.start()
+        try:
+            for index, shard in enumerate(shard_iterable):
+                job.put(index, shard)
+            return job.wait()
+        except BaseException as error:
+            job.fail(error)
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            self.reassigned += job.reassigned
+
+    def suma(self, shard_iterable):
+        return sum(self.partial_sums(shard_iterable))
+
+    def resta(self, shard_iterable):
+        shard_iterable = iter(shard_iterable)
+        for first_shard in shard_iterable:
+            if first_shard:
+                break
+        else:
+            raise IndexError("resta() requires at least one number.")
+        first = first_shard[0]
+        rest = itertools.chain([first_shard[1:]], shard_iterable)
+        return first - sum(self.partial_sums(shard for shard in rest if shard))
+
+    def reduce(self, func, values):
+        if func not in REDUCTIONS:
+            raise ValueError(f"Cluster reduction should be one of {REDUCTIONS}, not '{func}'.")
+        return getattr(self, func)(shards(values, self.shard_size))
+
+    def reduce_file(self, func, path, format="text"):
+        if func not in REDUCTIONS:
+            raise ValueError(f"Cluster reduction should be one of {REDUCTIONS}, not '{func}'.")
+        return getattr(self, func)(file_shards(path, format))
@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import random
+
+import pytest
+
+import parsing
+import planner
+import vectorized
+
+
+@pytest.fixture(autouse=True, scope="session")
+def planner_config(tmp_path_factory):
+    """Plan with the built-in costs, never a calibration saved on this machine."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(planner.CONFIG_ENV, str(tmp_path_factory.mktemp("planner") / "planner.json"))
+        planner._costs = None
+        yield
+    planner._costs = None
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with and without NumPy available."""
+    if request.param == "python":
+        monkeypatch.setattr(vectorized, "np", None)
+        monkeypatch.setattr(parsing, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def values():
+    """Provide reproducible random floats."""
+    rng = random.Random(1234)
+    return [rng.uniform(-1000, 1000) for _ in range(10_000)]
@@ -0,0 +1,115 @@
+import concurrent.futures
+import os
+import queue
+import threading
+
+import main
+import planner
+import registry
+
+DEFAULT_MAX_QUEUE = 1024
+
+_STOP = object()
+
+
+class Dispatcher:
+    # A fixed set of worker threads fed by a bounded queue; submit never lets the backlog grow past max_queue.
+    # The bound is a semaphore rather than the queue's maxsize, so stop markers never wait for room.
+    def __init__(self, workers=None, max_queue=DEFAULT_MAX_QUEUE, timeout=0, parallel=False):
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.parallel = parallel
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_queue) if max_queue and max_queue > 0 else None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"dispatcher-{n}", daemon=True) for n in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func, params=None, timeout=None):
+        # timeout 0 rejects at once when the queue is full, None uses the dispatcher default,
+        # and a number of seconds waits that long for room before rejecting.
+        return self._put(self._call, (func, params), timeout)
+
+    def submit_batch(self, jobs, timeout=None):
+        # One queue slot for many jobs: the future's result is main.run_batch's list of results.
+        return self._put(main.run_batch, (jobs, self.parallel), timeout)
+
+    def _put(self, call, args, timeout):
+        if self._closed:
+            raise RuntimeError("Cannot submit to a dispatcher that has been shut down.")
+        timeout = self.timeout if timeout is None else timeout
+        if self._slots is not None and not self._slots.acquire(timeout != 0, timeout or None):
+            raise queue.Full(f"Dispatcher queue is full ({self.max_queue} pending requests).")
+        future = concurrent.futures.Future()
+        # Checked again under the lock, so nothing is queued behind the stop markers.
+        with self._lock:
+            if not self._closed:
+                self._queue.put((future, call, args))
+                return future
+        self._release()
+        raise RuntimeError("Cannot submit to a dispatcher that has been shut down.")
+
+    def _release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._release()
+            future, call, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(call(*args))
+            except Exception as error:
+                future.set_exception(error)
+
+    def _call(self, func, params):
+        spec = registry.resolve(func)
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            raise TypeError("Params should be a dictionary.")
+        args, backend = planner.bind(spec, params, self.parallel)
+        return main._call(spec, args, self.parallel, backend)
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if cancel_pending:
+                self._cancel_queued()
+            # The queue itself is unbounded, so these never block, however full the dispatcher is.
+            for _ in self._threads:
+                self._queue.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _cancel_queued(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                self._release()
+                item[0].cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
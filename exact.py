@@ -0,0 +1,169 @@
+import decimal
+import fractions
+import itertools
+import math
+
+import sinks
+
+MODES = ("auto", "int", "decimal", "fraction", "fsum", "float")
+# Addition never rounds in this context, so decimal sums are exact however many digits they need.
+EXACT_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+_INTS = {int, bool}
+_BINARY = {int, bool, float}
+_DECIMALS = {decimal.Decimal, int, bool}
+_FRACTIONS = {fractions.Fraction, int, bool}
+
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"Unknown numeric mode '{mode}', expected one of {MODES}.")
+
+
+def _parse_strings(values, types):
+    # Numeric strings are integers if they all parse as one, and decimals otherwise.
+    strings = [value for value in values if type(value) is str]
+    try:
+        parsed = dict(zip(strings, map(int, strings)))
+    except ValueError:
+        parsed = dict(zip(strings, map(_decimal, strings)))
+    values = [parsed[value] if type(value) is str else value for value in values]
+    return values, set(map(type, values))
+
+
+def detect(values, types=None):
+    # The mode auto resolves to for values, from one scan of their types.
+    types = set(map(type, values)) if types is None else types
+    if all(issubclass(kind, int) for kind in types):
+        return "int"
+    if all(issubclass(kind, (int, float)) for kind in types):
+        return "fsum"
+    if any(issubclass(kind, fractions.Fraction) for kind in types):
+        return "fraction"
+    if any(issubclass(kind, decimal.Decimal) for kind in types):
+        return "decimal"
+    if str in types:
+        return detect(*_parse_strings(values, types))
+    raise TypeError(f"Unsupported types for exact arithmetic: {', '.join(sorted(kind.__name__ for kind in types))}.")
+
+
+def _int(value):
+    if isinstance(value, (int, str)):
+        return int(value)
+    if isinstance(value, (float, decimal.Decimal, fractions.Fraction)) and value == int(value):
+        return int(value)
+    raise ValueError(f"{value!r} is not an integer.")
+
+
+def _decimal(value):
+    if isinstance(value, str):
+        try:
+            return decimal.Decimal(value)
+        except decimal.InvalidOperation:
+            raise ValueError(f"could not convert string to Decimal: {value!r}") from None
+    if isinstance(value, float):
+        # A float stands for its shortest repr, so 0.1 becomes Decimal("0.1") rather than its binary expansion.
+        return decimal.Decimal(repr(value))
+    if isinstance(value, fractions.Fraction):
+        raise TypeError(f"{value!r} has no exact Decimal value; use mode 'fraction'.")
+    return decimal.Decimal(value)
+
+
+def _fraction(value):
+    if isinstance(value, str):
+        try:
+            return fractions.Fraction(value)
+        except ValueError:
+            raise ValueError(f"could not convert string to Fraction: {value!r}") from None
+    return fractions.Fraction(value)
+
+
+def _sum_fractions(values):
+    # Numerators over the same denominator add as integers; only distinct denominators pay for gcd.
+    numerators = {}
+    for value in values:
+        denominator = value.denominator
+        numerators[denominator] = numerators.get(denominator, 0) + value.numerator
+    return sum(itertools.starmap(fractions.Fraction, ((n, d) for d, n in numerators.items())), fractions.Fraction(0))
+
+
+def _resolve(values, mode):
+    # One type scan per call picks the mode and whether values already have the right types.
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    types = set(map(type, values))
+    if mode == "auto":
+        if str in types:
+            values, types = _parse_strings(values, types)
+        mode = detect(values, types)
+    return values, types, mode
+
+
+def _sum(values, types, mode):
+    # types is a superset of the types in values, so the homogeneous checks also hold for slices.
+    if mode == "int":
+        return sum(values if types <= _INTS else map(_int, values))
+    if mode == "fsum":
+        return math.fsum(values if types <= _BINARY else map(float, values))
+    if mode == "decimal":
+        with decimal.localcontext(EXACT_CONTEXT):
+            return sum(values if types <= _DECIMALS else map(_decimal, values), decimal.Decimal(0))
+    if mode == "fraction":
+        return _sum_fractions(values if types <= _FRACTIONS else map(_fraction, values))
+    return sum(map(float, values))
+
+
+def total(values, mode="auto"):
+    _check_mode(mode)
+    if mode == "float":
+        return sum(map(float, values))
+    if mode in ("auto", "int") and isinstance(values, (list, tuple)) and values and type(values[0]) is int:
+        # Fast homogeneous path: a sum that comes out as an int can only have added ints.
+        try:
+            result = sum(values)
+        except TypeError:
+            result = None
+        if type(result) is int:
+            return result
+    return _sum(*_resolve(values, mode))
+
+
+def diferencia(values, mode="auto"):
+    # The first value minus the exact sum of the rest, converted in the mode chosen for all of them.
+    _check_mode(mode)
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    if not values:
+        raise IndexError("resta() requires at least one number.")
+    if mode == "float":
+        # Same operation order as utils.resta.
+        result = float(values[0])
+        for value in itertools.islice(values, 1, None):
+            result -= float(value)
+        return result
+    if mode in ("auto", "int") and type(values[0]) is int:
+        try:
+            rest = sum(itertools.islice(values, 1, None))
+        except TypeError:
+            rest = None
+        if type(rest) is int:
+            return values[0] - rest
+    values, types, mode = _resolve(values, mode)
+    if mode == "fsum":
+        # Correctly rounded first - sum(rest), not a rounded sum subtracted afterwards.
+        negated = (-float(value) for value in itertools.islice(values, 1, None))
+        return math.fsum(itertools.chain([float(values[0])], negated))
+    if mode == "decimal":
+        # The subtraction has to happen in the exact context too, or it rounds to the default 28 digits.
+        with decimal.localcontext(EXACT_CONTEXT):
+            return _sum(values[:1], types, mode) - _sum(values[1:], types, mode)
+    return _sum(values[:1], types, mode) - _sum(values[1:], types, mode)
+
+
+def suma_exacta(mode="auto", *nums):
+    sinks.emit('suma', 'sumando')
+    return total(nums, mode)
+
+
+def resta_exacta(mode="auto", *nums):
+    sinks.emit('resta', 'restando')
+    return diferencia(nums, mode)
@@ -0,0 +1,107 @@
+import mmap
+import os
+
+import parsing
+import vectorized
+
+FORMATS = ("text", "float64", "int64")
+# Bytes of the mapping reduced at a time; a multiple of the page size so consumed pages can be dropped.
+CHUNK_SIZE = 1 << 22
+# Text chunks are split into one bytes object per value, so they are kept smaller.
+TEXT_CHUNK_SIZE = 1 << 20
+_TYPECODES = {"float64": "d", "int64": "q"}
+
+
+def _check_format(format):
+    if format not in FORMATS:
+        raise ValueError(f"Unknown file format '{format}', expected one of {FORMATS}.")
+
+
+def _release(mapping, stop):
+    # Tell the kernel the pages before stop will not be read again, so resident memory stays flat.
+    stop -= stop % mmap.PAGESIZE
+    if stop and hasattr(mapping, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        mapping.madvise(mmap.MADV_DONTNEED, 0, stop)
+
+
+def _text_chunks(path, mapping, chunk_size):
+    start = 0
+    count = 0
+    size = len(mapping)
+    while start < size:
+        stop = min(start + chunk_size, size)
+        if stop < size:
+            # Cut after the last newline so no value is split across chunks.
+            newline = mapping.rfind(b"\n", start, stop)
+            stop = newline + 1 if newline >= 0 else mapping.find(b"\n", stop) + 1 or size
+        values, errors = parsing.parse_buffer(mapping[start:stop])
+        if errors:
+            index, item, _ = errors[0]
+            raise ValueError(f"{path}: could not convert value {count + index} ({item!r}) to float.")
+        count += len(values)
+        yield values, stop
+        start = stop
+
+
+def _binary_chunks(path, mapping, format, chunk_size):
+    if len(mapping) % 8:
+        raise ValueError(f"{path}: size {len(mapping)} is not a multiple of 8 bytes for {format}.")
+    view = memoryview(mapping)
+    try:
+        for start in range(0, len(mapping), chunk_size):
+            stop = min(start + chunk_size, len(mapping))
+            chunk = view[start:stop].cast(_TYPECODES[format])
+            yield chunk, stop
+            chunk.release()
+    finally:
+        view.release()
+
+
+def chunks(path, format="text"):
+    # Yields the file's values a chunk at a time: lists of floats for text, memoryviews for binary formats.
+    # A binary chunk is released when the generator resumes, so copy it to keep it.
+    _check_format(format)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            if format == "text":
+                parts = _text_chunks(path, mapping, TEXT_CHUNK_SIZE)
+            else:
+                parts = _binary_chunks(path, mapping, format, CHUNK_SIZE - CHUNK_SIZE % 8)
+            for values, stop in parts:
+                yield values
+                values = None
+                _release(mapping, stop)
+
+
+def _reduce_file(path, format, method, skip_first):
+    _check_format(format)
+    vectorized._check_method(method)
+    first = None
+    partials = []
+    for values in chunks(path, format):
+        if skip_first and first is None and len(values):
+            first = float(values[0])
+            values = values[1:]
+        partials.extend(vectorized.partial_sums(values, method))
+        values = None
+    return first, partials
+
+
+def _combine(partials, method):
+    return vectorized._PYTHON_REDUCERS[method](partials)
+
+
+def suma_file(path, format="text", method="fast"):
+    _, partials = _reduce_file(path, format, method, skip_first=False)
+    return _combine(partials, method)
+
+
+def resta_file(path, format="text", method="fast"):
+    first, partials = _reduce_file(path, format, method, skip_first=True)
+    if first is None:
+        raise IndexError("resta_file() requires at least one value.")
+    return first - _combine(partials, method)
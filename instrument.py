@@ -0,0 +1,171 @@
+import bisect
+import os
+import threading
+
+PHASES = ("lookup", "coercion", "execution")
+# Half-octave buckets from 100ns to about 100s.
+BOUNDS = tuple(1e-7 * 2 ** (step / 2) for step in range(61))
+
+enabled = False
+
+_lock = threading.Lock()
+_stats = {}
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BOUNDS[index] if index < len(BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class FunctionStats:
+    __slots__ = ("calls", "errors", "latency", "phases", "backends")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.backends = {}
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def record(func, lookup, coercion, execution, error=False, backend=None):
+    with _lock:
+        stats = _stats.get(func)
+        if stats is None:
+            stats = _stats[func] = FunctionStats()
+        stats.calls += 1
+        if error:
+            stats.errors += 1
+        if backend is not None:
+            stats.backends[backend] = stats.backends.get(backend, 0) + 1
+        stats.latency.observe(lookup + coercion + execution)
+        stats.phases["lookup"].observe(lookup)
+        stats.phases["coercion"].observe(coercion)
+        stats.phases["execution"].observe(execution)
+
+
+def get_stats():
+    with _lock:
+        return {
+            func: {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "latency": stats.latency.summary(),
+                "phases": {phase: histogram.summary() for phase, histogram in stats.phases.items()},
+                "backends": dict(stats.backends),
+            }
+            for func, stats in _stats.items()
+        }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name, labels, histogram):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BOUNDS, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound:.3g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text():
+    with _lock:
+        items = sorted(_stats.items())
+        lines = [
+            "# HELP functions_calls_total Calls dispatched per function.",
+            "# TYPE functions_calls_total counter",
+        ]
+        lines += [f'functions_calls_total{{func="{_label(func)}"}} {stats.calls}' for func, stats in items]
+        lines += [
+            "# HELP functions_errors_total Calls that raised, per function.",
+            "# TYPE functions_errors_total counter",
+        ]
+        lines += [f'functions_errors_total{{func="{_label(func)}"}} {stats.errors}' for func, stats in items]
+        lines += [
+            "# HELP functions_backend_calls_total Calls per function and the backend the planner chose.",
+            "# TYPE functions_backend_calls_total counter",
+        ]
+        lines += [
+            f'functions_backend_calls_total{{func="{_label(func)}",backend="{_label(backend)}"}} {count}'
+            for func, stats in items
+            for backend, count in sorted(stats.backends.items())
+        ]
+        lines += [
+            "# HELP functions_latency_seconds End-to-end dispatch latency per function.",
+            "# TYPE functions_latency_seconds histogram",
+        ]
+        for func, stats in items:
+            lines += _histogram_lines("functions_latency_seconds", f'func="{_label(func)}"', stats.latency)
+        lines += [
+            "# HELP functions_phase_seconds Time per dispatch phase per function.",
+            "# TYPE functions_phase_seconds histogram",
+        ]
+        for func, stats in items:
+            for phase, histogram in stats.phases.items():
+                labels = f'func="{_label(func)}",phase="{phase}"'
+                lines += _histogram_lines("functions_phase_seconds", labels, histogram)
+    return "\n".join(lines) + "\n"
+
+
+def dump_prometheus(path):
+    # Write then rename, so scrapers never read a half-written file.
+    text = prometheus_text()
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as output:
+        output.write(text)
+    os.replace(temporary, path)
+    return text
@@ -1,37 +1,250 @@
-import utils
+import argparse
+import functools
+import time
+
+import cache
+import instrument
+import planner
+import registry
+import sinks
 
 def main(**kwargs):
     func = kwargs.get("func")
     params = kwargs.get("params", {})
+    parallel = kwargs.get("parallel", False)
+    timing = instrument.enabled
+    if timing:
+        started = time.perf_counter()
     
     if not func:
-        print("No function provided.")
+        sinks.emit(func, "No function provided.")
+        return
+    if not isinstance(func, str):
+        sinks.emit(func, "Function name should be a string.")
         return
-    if not hasattr(utils, func):
-        print(f"Function '{func}' not found in utils module.")
+    spec = registry.get(func)
+    if spec is None:
+        sinks.emit(func, "Function '%s' not found in utils module.", func)
         return
     if not isinstance(params, dict):
-        print("Params should be a dictionary.")
+        sinks.emit(func, "Params should be a dictionary.")
         return
+    if timing:
+        looked_up = bound = time.perf_counter()
+    failed = False
+    backend = None
     try:
-        function_to_call = getattr(utils, func)
-        result = function_to_call(*params.values())
-        print(f"Result: {result}")
+        # A lone float64 buffer is passed whole instead of being bound into a tuple of floats.
+        args = planner.buffer_argument(spec, params)
+        if args is None:
+            args, backend = planner.bind(spec, params, parallel)
+        else:
+            backend = planner.choose(spec, args, parallel)
+        if timing:
+            bound = time.perf_counter()
+        result = _call(spec, args, parallel, backend)
+        sinks.emit(func, "Result: %s", result)
+        return result
     except Exception as error:
-        print(f"An error occurred: {error}")
+        failed = True
+        sinks.emit(func, "An error occurred: %s", error)
+    finally:
+        if timing:
+            instrument.record(
+                spec.name, looked_up - started, bound - looked_up, time.perf_counter() - bound, failed, backend,
+            )
+
+
+def _call(spec, args, parallel=False, backend=None):
+    store = cache.active()
+    # Buffers are neither hashable nor worth hashing, so buffer calls are never cached.
+    if store is None or not spec.pure or not store.covers(spec.name) or isinstance(args, memoryview):
+        return _invoke(spec, args, parallel, backend)
+    result = store.lookup(spec.name, args)
+    if result is cache.MISSING:
+        result = _invoke(spec, args, parallel, backend)
+        store.store(spec.name, args, result)
+    return result
+
+
+def _invoke(spec, args, parallel=False, backend=None):
+    if backend is None:
+        backend = planner.choose(spec, args, parallel)
+    return planner.run(spec, args, backend)
+
+
+def get_stats():
+    return instrument.get_stats()
+
+
+def _cached_lookups(store, spec, jobs, arg_lists, pending, results):
+    missed_args = []
+    missed = []
+    for index, args in zip(pending, arg_lists):
+        value = store.lookup(spec.name, args)
+        if value is cache.MISSING:
+            missed_args.append(args)
+            missed.append(index)
+        else:
+            results[index] = {"func": jobs[index]["func"], "value": value}
+    return missed_args, missed
+
+
+def _run_group(spec, jobs, indices, results, parallel):
+    arg_lists = []
+    pending = []
+    for index in indices:
+        params = jobs[index].get("params", {})
+        if not isinstance(params, dict):
+            results[index] = {"func": jobs[index]["func"], "error": "Params should be a dictionary."}
+            continue
+        try:
+            arg_lists.append(planner.bind(spec, params, parallel)[0])
+        except Exception as error:
+            results[index] = {"func": jobs[index]["func"], "error": str(error)}
+            continue
+        pending.append(index)
+    store = cache.active()
+    if store is not None and spec.pure and store.covers(spec.name):
+        arg_lists, pending = _cached_lookups(store, spec, jobs, arg_lists, pending, results)
+    else:
+        store = None
+    if spec.batch is not None and len(pending) > 1 and not parallel:
+        try:
+            values = spec.batch(arg_lists)
+        except Exception:
+            # Fall back to one call per job so each failure is reported on its own job.
+            pass
+        else:
+            for index, args, value in zip(pending, arg_lists, values):
+                results[index] = {"func": jobs[index]["func"], "value": value}
+                if store is not None:
+                    store.store(spec.name, args, value)
+            return
+    for index, args in zip(pending, arg_lists):
+        try:
+            value = _invoke(spec, args, parallel)
+            results[index] = {"func": jobs[index]["func"], "value": value}
+            if store is not None:
+                store.store(spec.name, args, value)
+        except Exception as error:
+            results[index] = {"func": jobs[index]["func"], "error": str(error)}
+
+
+def run_batch(jobs, parallel=False):
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    by_name = {}
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            results[index] = {"func": None, "error": "Job should be a dictionary."}
+            continue
+        func = job.get("func")
+        if not func:
+            results[index] = {"func": func, "error": "No function provided."}
+            continue
+        if not isinstance(func, str):
+            results[index] = {"func": func, "error": "Function name should be a string."}
+            continue
+        by_name.setdefault(func, []).append(index)
+    by_spec = {}
+    for func, indices in by_name.items():
+        spec = registry.get(func)
+        if spec is None:
+            for index in indices:
+                results[index] = {"func": func, "error": f"Function '{func}' not found in utils module."}
+            continue
+        by_spec.setdefault(spec, []).extend(indices)
+    for spec, indices in by_spec.items():
+        _run_group(spec, jobs, sorted(indices), results, parallel)
+    return results
+
+
+async def amain(**kwargs):
+    # Imported here so the interactive prompt does not pay for asyncio at startup.
+    import asyncio
+
+    executor = kwargs.pop("executor", None)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(main, **kwargs))
+
 
 if __name__ == "__main__":
-    
-    while True:
-        print('Enter "exit" to quit.')
-        user_input = input('Enter function name: ').lower()
-        if user_input == "exit": break
-        params = {}
-        params['var1'] = input('Enter value for var1: ')
-        if params['var1'] == 'exit': break
-        params['var2'] = input('Enter value for var2: ')
-        if params['var2'] == 'exit': break
-        
-        main(func=user_input, params=params)
-
-    print("Script executed successfully.")
+    parser = argparse.ArgumentParser(description="Call utils functions by name.")
+    parser.add_argument("--serve", action="store_true", help="answer newline-delimited JSON requests on stdin")
+    parser.add_argument("--socket", metavar="PATH", help="answer requests on a Unix socket instead of stdin")
+    parser.add_argument("--workers", type=int, help="size of the executor that runs requests")
+    parser.add_argument("--processes", action="store_true", help="run requests in a process pool")
+    parser.add_argument("--wire", action="store_true", help="answer binary framed requests on stdin (see wire.py)")
+    parser.add_argument("--worker", metavar="ADDRESS", help="run as a cluster worker on a Unix socket path or host:port")
+    parser.add_argument("--cluster", metavar="ADDRESS", action="append", default=[], help="cluster worker to reduce on")
+    parser.add_argument("--cluster-local", metavar="N", type=int, help="start N local cluster workers for --reduce")
+    parser.add_argument("--reduce", nargs=2, metavar=("FUNC", "PATH"), help="suma or resta of a file on the cluster")
+    parser.add_argument("--format", default="text", help="format of the --reduce file: text, float64 or int64")
+    parser.add_argument(
+        "--cluster-timeout", metavar="SECONDS", type=float, help="time a worker has to answer a shard (default 60)",
+    )
+    parser.add_argument("--batch", metavar="PATH", nargs="?", const="-", help="run JSONL jobs from PATH or stdin")
+    parser.add_argument("--output", metavar="PATH", help="write --batch results here instead of stdout")
+    parser.add_argument("--calibrate", action="store_true", help="time each backend and save the planner's costs")
+    parser.add_argument("--manifest", action="append", default=[], help="JSON manifest of extra functions to register")
+    parser.add_argument("--cache-db", metavar="PATH", help="keep results of pure functions in a SQLite file")
+    args = parser.parse_args()
+    if args.reduce and not (args.cluster or args.cluster_local):
+        parser.error("--reduce needs --cluster ADDRESS or --cluster-local N")
+    for path in args.manifest:
+        try:
+            registry.load_manifest(path)
+        except (OSError, ValueError) as error:
+            parser.error(f"could not read manifest {path}: {error}")
+    if args.cache_db:
+        import persistent_cache
+        persistent_cache.configure(args.cache_db, functions=registry.pure_names())
+
+    if args.batch:
+        import batch
+        batch.main(args.batch, args.output, args.workers)
+    elif args.calibrate:
+        path = planner.save(costs=planner.calibrate())
+        planner.load(path)
+        for (name, kind), size in sorted(planner.thresholds().items()):
+            print(f"{name} ({kind}): " + (f"Python below {size} values" if size is not None else "always Python"))
+        print(f"Saved to {path}")
+    elif args.worker:
+        import cluster
+        cluster.serve_worker(args.worker)
+    elif args.reduce:
+        import cluster
+        import tempfile
+        sinks.verbose()
+        with tempfile.TemporaryDirectory() as directory:
+            processes, addresses = cluster.spawn_workers(args.cluster_local, directory) if args.cluster_local else ([], [])
+            try:
+                func, path = args.reduce
+                timeout = cluster.DEFAULT_TIMEOUT if args.cluster_timeout is None else args.cluster_timeout
+                coordinator = cluster.Coordinator(args.cluster + addresses, timeout)
+                result = coordinator.reduce_file(func, path, args.format)
+                sinks.emit(func, "Result: %s", result)
+            finally:
+                cluster.stop_workers(processes)
+    elif args.wire:
+        import wire
+        wire.serve()
+    elif args.serve or args.socket:
+        import server
+        server.run(args.socket, args.workers, args.processes)
+    else:
+        sinks.verbose()
+        while True:
+            print('Enter "exit" to quit.')
+            user_input = input('Enter function name: ').lower()
+            if user_input == "exit": break
+            params = {}
+            params['var1'] = input('Enter value for var1: ')
+            if params['var1'] == 'exit': break
+            params['var2'] = input('Enter value for var2: ')
+            if params['var2'] == 'exit': break
+            
+            main(func=user_input, params=params)
+
+        print("Script executed successfully.")
@@ -0,0 +1,92 @@
+import concurrent.futures
+import os
+import threading
+
+import sinks
+import utils
+
+DEFAULT_THRESHOLD = 100_000
+
+_lock = threading.Lock()
+_executor = None
+_workers = None
+_threshold = DEFAULT_THRESHOLD
+
+
+def configure(workers=None, threshold=None):
+    global _workers, _threshold
+    with _lock:
+        if workers is not None and workers != _workers:
+            _shutdown_locked()
+            _workers = workers
+        if threshold is not None:
+            _threshold = threshold
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            # Workers never report through the parent's sink.
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=_workers, initializer=sinks.set_sink, initargs=(None,)
+            )
+        return _executor
+
+
+def worker_count():
+    return _workers or os.cpu_count() or 1
+
+
+def threshold():
+    return _threshold
+
+
+def shutdown():
+    with _lock:
+        _shutdown_locked()
+
+
+def _shutdown_locked():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _shards(values):
+    count = worker_count()
+    size = max(1, -(-len(values) // count))
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def _map(kernel, values):
+    return get_executor().map(kernel, _shards(values))
+
+
+def suma(*nums):
+    if len(nums) < _threshold:
+        return utils.suma(*nums)
+    sinks.emit('suma', 'sumando')
+    return sum(_map(utils.suma_stream, nums))
+
+
+def resta(*nums):
+    if len(nums) < _threshold:
+        return utils.resta(*nums)
+    sinks.emit('resta', 'restando')
+    return float(nums[0]) - sum(_map(utils.suma_stream, nums[1:]))
+
+
+def mayuscula_a_minuscula(*texts):
+    if len(texts) < _threshold:
+        return utils.mayuscula_a_minuscula(*texts)
+    sinks.emit('mayuscula_a_minuscula', 'convirtiendo a minúsculas')
+    lower_texts = []
+    for shard in _map(_lower_shard, texts):
+        lower_texts.extend(shard)
+    return lower_texts
+
+
+def _lower_shard(texts):
+    return list(utils.mayuscula_a_minuscula_stream(texts))
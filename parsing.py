@@ -0,0 +1,67 @@
+import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 4096
+
+
+def _parse_each(items, start, values, errors):
+    for offset, item in enumerate(items):
+        try:
+            values[start + offset] = float(item)
+        except (TypeError, ValueError) as error:
+            values[start + offset] = float("nan")
+            errors.append((start + offset, item, error))
+
+
+def _parse_chunk(chunk, start, values, errors):
+    # NumPy turns None into NaN instead of failing like float(None).
+    if None not in chunk:
+        try:
+            values[start:start + len(chunk)] = np.array(chunk, dtype=np.float64)
+            return
+        except (TypeError, ValueError):
+            pass
+    _parse_each(chunk, start, values, errors)
+
+
+def parse_floats(items):
+    if not isinstance(items, (list, tuple)):
+        items = list(items)
+    errors = []
+    if np is None:
+        values = array.array("d", bytes(8 * len(items)))
+        _parse_each(items, 0, values, errors)
+        return values, errors
+    values = np.empty(len(items), dtype=np.float64)
+    if len(items) <= CHUNK_SIZE:
+        _parse_chunk(items, 0, values, errors)
+        return values, errors
+    # Parse everything in one pass first; only a batch with bad items pays for chunking.
+    if None not in items:
+        try:
+            values[:] = np.array(items, dtype=np.float64)
+            return values, errors
+        except (TypeError, ValueError):
+            pass
+    for start in range(0, len(items), CHUNK_SIZE):
+        _parse_chunk(items[start:start + CHUNK_SIZE], start, values, errors)
+    return values, errors
+
+
+def parse_buffer(buffer, sep=None):
+    data = bytes(buffer)
+    parts = data.split(sep)
+    if sep is not None and parts and not parts[-1]:
+        parts.pop()
+    return parse_floats(parts)
+
+
+def to_floats(items):
+    values, errors = parse_floats(items)
+    if errors:
+        raise errors[0][2]
+    return values
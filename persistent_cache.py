@@ -0,0 +1,253 @@
+import ast
+import decimal
+import fractions
+import hashlib
+import importlib.util
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+import cache
+import registry
+
+DEFAULT_MAXSIZE = 100_000
+# Eviction scans the table, so it runs once every this many stores rather than on each one.
+EVICT_EVERY = 64
+# Hits refresh an entry's access time at most this often, so reads rarely need a write lock.
+TOUCH_INTERVAL = 60.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    " key BLOB PRIMARY KEY, name TEXT NOT NULL, version TEXT NOT NULL, value BLOB NOT NULL, accessed REAL NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)",
+    "CREATE INDEX IF NOT EXISTS results_name ON results (name, version)",
+)
+# Argument types whose repr is deterministic and round-trips, so equal arguments always give equal keys.
+_SCALARS = frozenset((type(None), bool, int, float, complex, str, bytes, decimal.Decimal, fractions.Fraction))
+
+
+def _module_of(function):
+    if isinstance(function, str):
+        return function.partition(":")[0]
+    return getattr(function, "__module__", None)
+
+
+def _module_path(module_name):
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    if path is None and module_name:
+        try:
+            found = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            found = None
+        path = found.origin if found is not None and found.has_location else None
+    return path
+
+
+def _module_digest(module_name):
+    path = _module_path(module_name)
+    if path is None:
+        # Built-in or dynamic code: fall back to the interpreter version.
+        return f"{module_name}@{sys.version}"
+    with open(path, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+def _local_imports(path):
+    # Modules imported anywhere in path, including inside functions, that sit next to it in the same project.
+    with open(path, "rb") as source:
+        tree = ast.parse(source.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    directory = os.path.dirname(path)
+    return {name for name in names if os.path.isfile(os.path.join(directory, *name.split(".")) + ".py")}
+
+
+def _with_local_imports(modules):
+    found = set()
+    pending = list(modules)
+    while pending:
+        module_name = pending.pop()
+        if module_name in found:
+            continue
+        found.add(module_name)
+        path = _module_path(module_name)
+        if path is not None and path.endswith(".py"):
+            pending.extend(_local_imports(path))
+    return found
+
+
+def code_version(functions):
+    # Hash the source of every module that can compute a function's results, and of the project modules they
+    # import, so editing any of them invalidates the results.
+    modules = {_module_of(function) for function in functions if function is not None} - {None}
+    modules = sorted(_with_local_imports(modules))
+    digest = hashlib.sha256()
+    for module_name in modules:
+        digest.update(f"{module_name}={_module_digest(module_name)};".encode())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    kind = type(value)
+    if kind in _SCALARS:
+        return (kind.__name__, value)
+    if kind is list or kind is tuple:
+        return (kind.__name__, tuple(map(_canonical, value)))
+    raise TypeError(f"{kind.__name__} arguments are not cached.")
+
+
+class PersistentCache:
+    def __init__(self, path, maxsize=DEFAULT_MAXSIZE, functions=(), clock=time.time):
+        self.path = path
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._functions = set(functions)
+        self._versions = {}
+        self._stores = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        connection = self._connection()
+        for statement in _SCHEMA:
+            connection.execute(statement)
+
+    def _connection(self):
+        # sqlite3 connections belong to one thread, and must not cross a fork.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def enable(self, name):
+        self._functions.add(name)
+
+    def disable(self, name):
+        self._functions.discard(name)
+
+    def covers(self, name):
+        return name in self._functions
+
+    def version(self, name, function=None):
+        version = self._versions.get(name)
+        if version is None:
+            spec = registry.get(name)
+            if spec is not None:
+                # The raw slots hold "module:attr" references, so hashing does not import anything.
+                # compile_binder converts the arguments before any of them runs.
+                functions = (
+                    spec._function, spec._kernel, spec._batch, spec._parallel, spec._vectorized,
+                    registry.compile_binder,
+                )
+            elif function is not None:
+                functions = (function,)
+            else:
+                raise LookupError(f"Function '{name}' not found in utils module.")
+            version = code_version(functions)
+            # Entries from older code can never be hit again.
+            self._connection().execute("DELETE FROM results WHERE name = ? AND version != ?", (name, version))
+            self._versions[name] = version
+        return version
+
+    def _key(self, name, args):
+        # Keyed by value, not by pickle bytes, which depend on which arguments are the same object.
+        try:
+            payload = repr(tuple(map(_canonical, args))).encode()
+        except TypeError:
+            return None
+        return hashlib.sha256(b"%s\0%s\0%s" % (name.encode(), self.version(name).encode(), payload)).digest()
+
+    def lookup(self, name, args):
+        key = self._key(name, args)
+        if key is None:
+            return cache.MISSING
+        connection = self._connection()
+        row = connection.execute("SELECT value, accessed FROM results WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return cache.MISSING
+        now = self.clock()
+        if now - row[1] > TOUCH_INTERVAL:
+            connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def store(self, name, args, value):
+        key = self._key(name, args)
+        if key is None:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO results (key, name, version, value, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, name, self._versions[name], blob, self.clock()),
+        )
+        with self._lock:
+            self._stores += 1
+            due = self._stores % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        cursor = self._connection().execute(
+            "DELETE FROM results WHERE key IN"
+            " (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+        with self._lock:
+            self.evictions += cursor.rowcount
+
+    def call(self, name, function, args):
+        self.version(name, function)
+        value = self.lookup(name, args)
+        if value is cache.MISSING:
+            value = function(*args)
+            self.store(name, args, value)
+        return value
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self):
+        size = self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": size,
+                "maxsize": self.maxsize,
+                "path": self.path,
+            }
+
+
+def configure(path, maxsize=DEFAULT_MAXSIZE, functions=()):
+    store = PersistentCache(path, maxsize, functions)
+    cache.install(store)
+    return store
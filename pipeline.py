@@ -0,0 +1,192 @@
+import concurrent.futures
+import re
+import threading
+
+import cache
+import main
+import planner
+import registry
+
+# "$N" is the result of step N; "$$..." stands for a literal string starting with "$".
+_REFERENCE = re.compile(r"\$(\d+)")
+
+_lock = threading.Lock()
+_executor = None
+
+
+class Reference:
+    __slots__ = ("step",)
+
+    def __init__(self, step):
+        self.step = step
+
+    def __repr__(self):
+        return f"${self.step}"
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="pipeline")
+        return _executor
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def _template(value, index, canonical, deps):
+    if isinstance(value, str) and value.startswith("$"):
+        if value.startswith("$$"):
+            return value[1:]
+        match = _REFERENCE.fullmatch(value)
+        if match is None:
+            return value
+        step = int(match.group(1))
+        if step >= index:
+            raise ValueError(f"Step {index} refers to step {step}, which does not run before it.")
+        deps.add(canonical[step])
+        return Reference(canonical[step])
+    if isinstance(value, (list, tuple)):
+        return type(value)(_template(item, index, canonical, deps) for item in value)
+    return value
+
+
+def _resolve(template, values):
+    if type(template) is Reference:
+        return values[template.step]
+    if isinstance(template, (list, tuple)):
+        return type(template)(_resolve(item, values) for item in template)
+    return template
+
+
+def _key(template):
+    # Type-tagged like cache.make_key, so 1, 1.0 and True stay distinct steps.
+    if type(template) is Reference:
+        return (Reference, template.step)
+    if isinstance(template, (list, tuple)):
+        return (type(template), tuple(map(_key, template)))
+    return cache.tag(template)
+
+
+def _plan(steps, results):
+    canonical = list(range(len(steps)))
+    nodes = {}
+    depends = {}
+    seen = {}
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            results[index] = {"func": None, "error": "Step should be a dictionary."}
+            continue
+        func = step.get("func")
+        params = step.get("params", {})
+        if not func:
+            results[index] = {"func": func, "error": "No function provided."}
+            continue
+        if not isinstance(func, str):
+            results[index] = {"func": func, "error": "Function name should be a string."}
+            continue
+        spec = registry.get(func)
+        if spec is None:
+            results[index] = {"func": func, "error": f"Function '{func}' not found in utils module."}
+            continue
+        if not isinstance(params, dict):
+            results[index] = {"func": func, "error": "Params should be a dictionary."}
+            continue
+        deps = set()
+        try:
+            template = {name: _template(value, index, canonical, deps) for name, value in params.items()}
+        except ValueError as error:
+            results[index] = {"func": func, "error": str(error)}
+            continue
+        failed = sorted(dep for dep in deps if dep not in nodes)
+        if failed:
+            results[index] = {"func": func, "error": f"Step {index} depends on step {failed[0]}, which failed."}
+            continue
+        if spec.pure:
+            # Common sub-expressions: the same pure function on the same inputs runs once.
+            key = (spec.name, tuple((name, _key(value)) for name, value in template.items()))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+            if key is not None and key in seen:
+                canonical[index] = seen[key]
+                continue
+            if key is not None:
+                seen[key] = index
+        nodes[index] = (spec, template)
+        depends[index] = deps
+    return nodes, depends, canonical
+
+
+def _execute(spec, template, values, parallel):
+    params = {name: _resolve(value, values) for name, value in template.items()}
+    args, backend = planner.bind(spec, params, parallel)
+    return main._call(spec, args, parallel, backend)
+
+
+def _run_now(spec, template, values, parallel):
+    future = concurrent.futures.Future()
+    try:
+        future.set_result(_execute(spec, template, values, parallel))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+def run_pipeline(steps, parallel=False, executor=None):
+    steps = list(steps)
+    results = [None] * len(steps)
+    nodes, depends, canonical = _plan(steps, results)
+    remaining = {index: len(deps) for index, deps in depends.items()}
+    dependents = {index: [] for index in nodes}
+    for index, deps in depends.items():
+        for dep in deps:
+            dependents[dep].append(index)
+    ready = [index for index, count in remaining.items() if not count]
+    blocked = {}
+    values = {}
+    running = {}
+    while ready or running:
+        if len(ready) == 1 and not running:
+            # Nothing to overlap with, so skip the thread hand-off.
+            index = ready.pop()
+            completed = [(index, _run_now(*nodes[index], values, parallel))]
+        else:
+            executor = executor or get_executor()
+            for index in ready:
+                running[executor.submit(_execute, *nodes[index], values, parallel)] = index
+            ready = []
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            completed = [(running.pop(future), future) for future in done]
+        while completed:
+            index, future = completed.pop()
+            func = steps[index]["func"]
+            if future is None:
+                error = f"Step {index} depends on step {blocked[index]}, which failed."
+            else:
+                error = future.exception()
+            if error is None:
+                values[index] = future.result()
+                results[index] = {"func": func, "value": values[index]}
+            else:
+                results[index] = {"func": func, "error": str(error)}
+            for dependent in dependents[index]:
+                if error is not None:
+                    blocked.setdefault(dependent, index)
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    if dependent in blocked:
+                        completed.append((dependent, None))
+                    else:
+                        ready.append(dependent)
+    for index, representative in enumerate(canonical):
+        if representative != index:
+            results[index] = dict(results[representative], func=steps[index]["func"])
+    return results
@@ -0,0 +1,249 @@
+import array
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+
+BACKENDS = ("python", "vectorized", "parallel")
+KINDS = ("values", "buffer")
+CONFIG_ENV = "MULTIPLE_FUNCTIONS_PLANNER"
+DEFAULT_CONFIG = os.path.join(os.path.expanduser("~"), ".cache", "multiple_functions", "planner.json")
+# Input sizes timed by calibrate; the cost of each backend is a line through the two points.
+CALIBRATION_SIZES = (256, 65536)
+CALIBRATION_REPEAT = 5
+
+# Seconds for one call as (fixed, per item), per function, input kind and backend.
+# "values" is the bound argument tuple; "buffer" is one float64 buffer passed as the only parameter.
+# These are measurements from a single-core machine, used until calibrate() writes a config file:
+# summing a tuple is fastest in Python at any size, NumPy only pays off on buffers, and the process
+# pool costs more in pickling than it saves. NumPy reproduces sum() exactly, which from 3.12 on means
+# replaying its Neumaier corrections, and that is slower than sum() itself.
+DEFAULT_COSTS = {
+    "suma": {
+        "values": {"python": (5e-7, 6e-9), "vectorized": (3e-6, 2.5e-8)},
+        "buffer": {"python": (5e-7, 1.4e-8), "vectorized": (2.5e-6, 1.8e-8 if sys.version_info >= (3, 12) else 5e-9)},
+    },
+    "resta": {
+        "values": {"python": (5e-7, 1.5e-8), "vectorized": (3e-6, 2.5e-8)},
+        "buffer": {"python": (5e-7, 2.5e-8), "vectorized": (3e-6, 5e-9)},
+    },
+    "mayuscula_a_minuscula": {
+        "values": {"python": (5e-7, 2e-7), "parallel": (5e-2, 1.4e-6)},
+    },
+}
+
+# The pool adds each shard on its own and then the shard totals, which rounds differently from one sum in order,
+# so these functions only run on it when parallel=True asks for it.
+SHARDED_ROUNDING = frozenset(("suma", "resta"))
+
+_lock = threading.Lock()
+_costs = None
+_floors = {}
+_numpy = None
+
+
+def _smallest_win(lines):
+    # The first size at which any backend is cheaper than Python; below it no other cost is worth computing.
+    python = lines.get("python")
+    if python is None:
+        return 0
+    floor = None
+    for backend, (fixed, per_item) in lines.items():
+        if backend == "python" or per_item >= python[1]:
+            continue
+        size = max(0, int((fixed - python[0]) / (python[1] - per_item)) + 1)
+        floor = size if floor is None else min(floor, size)
+    return floor
+
+
+def configure(costs):
+    global _costs
+    costs = {
+        name: {kind: {backend: tuple(line) for backend, line in lines.items()} for kind, lines in kinds.items()}
+        for name, kinds in costs.items()
+    }
+    floors = {(name, kind): _smallest_win(lines) for name, kinds in costs.items() for kind, lines in kinds.items()}
+    with _lock:
+        _costs = costs
+        _floors.clear()
+        _floors.update(floors)
+    return costs
+
+
+def config_path(path=None):
+    return path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG
+
+
+def load(path=None):
+    # Calibrated costs replace the defaults function by function; a missing file keeps the defaults.
+    costs = {name: dict(kinds) for name, kinds in DEFAULT_COSTS.items()}
+    try:
+        with open(config_path(path)) as config:
+            saved = json.load(config)
+    except FileNotFoundError:
+        saved = {}
+    for name, kinds in saved.get("costs", {}).items():
+        costs.setdefault(name, {}).update(kinds)
+    return configure(costs)
+
+
+def save(path=None, costs=None):
+    path = config_path(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as config:
+        json.dump({"costs": costs if costs is not None else get_costs()}, config, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+    return path
+
+
+def get_costs():
+    if _costs is None:
+        load()
+    return _costs
+
+
+def _has_numpy():
+    global _numpy
+    if _numpy is None:
+        _numpy = importlib.util.find_spec("numpy") is not None
+    return _numpy
+
+
+def buffer_argument(spec, params):
+    # suma/resta-style calls whose only parameter is a float64 buffer skip binding and keep the buffer whole.
+    if len(params) != 1 or spec.coercer is not float or spec.params or spec._kernel is None:
+        return None
+    (value,) = params.values()
+    if not isinstance(value, (memoryview, array.array)) and type(value).__name__ != "ndarray":
+        return None
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    if view.ndim != 1 or view.itemsize != 8 or view.format.lstrip("@=<") != "d":
+        return None
+    return view if view.format == "d" else view.cast("B").cast("d")
+
+
+def _available(spec, backend, kind, size):
+    if backend == "python":
+        return True
+    if backend == "vectorized":
+        return spec._vectorized is not None and _has_numpy()
+    if backend == "parallel":
+        if kind != "values" or spec._parallel is None or spec.name in SHARDED_ROUNDING:
+            return False
+        import parallel
+
+        # The pool refuses calls below its own threshold, so planning one there would not run in parallel.
+        return size >= parallel.threshold()
+    return False
+
+
+def choose(spec, args, parallel=False):
+    if parallel and spec._parallel is not None:
+        return "parallel"
+    costs = _costs if _costs is not None else get_costs()
+    lines = costs.get(spec.name)
+    if lines is None:
+        return "python"
+    kind = "buffer" if isinstance(args, memoryview) else "values"
+    floor = _floors.get((spec.name, kind))
+    size = len(args)
+    if floor is None or size < floor:
+        return "python"
+    best = "python"
+    best_cost = None
+    for backend, (fixed, per_item) in lines[kind].items():
+        cost = fixed + per_item * size
+        if (best_cost is None or cost < best_cost) and _available(spec, backend, kind, size):
+            best, best_cost = backend, cost
+    return best
+
+
+def bind(spec, params, parallel=False):
+    # The parallel variants convert their values in the worker processes, so binding leaves them unconverted
+    # when the pool is chosen; the size the choice depends on is the same either way.
+    if spec._parallel is None or spec.bind_raw is spec.bind:
+        args = spec.bind(params)
+        return args, choose(spec, args, parallel)
+    args = spec.bind_raw(params)
+    backend = choose(spec, args, parallel)
+    if backend != "parallel":
+        args = spec.bind(params)
+    return args, backend
+
+
+def run(spec, args, backend):
+    if backend == "parallel":
+        return spec.parallel(*args)
+    if backend == "vectorized":
+        return spec.vectorized(args)
+    if spec.kernel is not None:
+        return spec.kernel(args)
+    return spec.function(*args)
+
+
+def _inputs(spec, kind, size):
+    if kind == "buffer":
+        return memoryview(array.array("d", [n * 0.5 for n in range(size)]))
+    if spec.coercer is str:
+        return tuple(f"ÑANDÚ CAFÉ {n}" for n in range(size))
+    return tuple(n * 0.5 for n in range(size))
+
+
+def _time(spec, args, backend, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(spec, args, backend)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibrate(names=None, sizes=CALIBRATION_SIZES, repeat=CALIBRATION_REPEAT, backends=BACKENDS):
+    # Times every available backend at two sizes and fits (fixed, per item); takes a second or two.
+    import parallel
+    import registry
+
+    small, large = sizes
+    previous = parallel.threshold()
+    parallel.configure(threshold=0)
+    costs = {}
+    try:
+        for name in names or DEFAULT_COSTS:
+            spec = registry.resolve(name)
+            for kind in KINDS:
+                if kind == "buffer" and spec.coercer is not float:
+                    continue
+                for backend in backends:
+                    if not _available(spec, backend, kind, large):
+                        continue
+                    # Warm up: import the backend and start the pool before timing it.
+                    run(spec, _inputs(spec, kind, small), backend)
+                    timings = [_time(spec, _inputs(spec, kind, size), backend, repeat) for size in sizes]
+                    per_item = max(0.0, (timings[1] - timings[0]) / (large - small))
+                    fixed = max(0.0, timings[0] - per_item * small)
+                    costs.setdefault(name, {}).setdefault(kind, {})[backend] = (fixed, per_item)
+    finally:
+        parallel.configure(threshold=previous)
+    return costs
+
+
+def thresholds(costs=None):
+    # Size from which each function and input kind stops using Python, or None if it never does.
+    if costs is not None:
+        return {
+            (name, kind): _smallest_win({backend: tuple(line) for backend, line in lines.items()})
+            for name, kinds in costs.items()
+            for kind, lines in kinds.items()
+        }
+    get_costs()
+    with _lock:
+        return dict(_floors)
@@ -0,0 +1,351 @@
+import importlib
+import inspect
+import json
+import os
+import threading
+import warnings
+
+ENTRY_POINT_GROUP = "multiple_functions"
+MANIFEST_ENV = "MULTIPLE_FUNCTIONS_MANIFEST"
+# Type names a manifest may use for coercer, returns and parameter kinds.
+TYPES = {"float": float, "int": int, "str": str, "bool": bool, "list": list}
+
+
+def load(reference):
+    # "package.module:attr.path" -> the object, importing the module on first use.
+    module_name, _, attr_path = reference.partition(":")
+    value = importlib.import_module(module_name)
+    for attr in filter(None, attr_path.split(".")):
+        value = getattr(value, attr)
+    return value
+
+
+def _lazy(slot):
+    # Callables may be registered as "module:attr" strings and are imported on first access.
+    def get(self):
+        value = getattr(self, slot)
+        if isinstance(value, str):
+            value = load(value)
+            setattr(self, slot, value)
+        return value
+
+    def set(self, value):
+        setattr(self, slot, value)
+
+    def delete(self):
+        delattr(self, slot)
+
+    return property(get, set, delete)
+
+
+class FunctionSpec:
+    __slots__ = (
+        "name", "_function", "arity", "coercer", "returns", "aliases", "_batch", "_parallel", "pure",
+        "_kernel", "params", "bind", "_vectorized", "bind_raw",
+    )
+
+    function = _lazy("_function")
+    batch = _lazy("_batch")
+    parallel = _lazy("_parallel")
+    kernel = _lazy("_kernel")
+    vectorized = _lazy("_vectorized")
+
+    def __init__(
+        self, name, function, arity=None, coercer=None, returns=None, aliases=(), batch=None, parallel=None,
+        pure=False, kernel=None, params=(), vectorized=None,
+    ):
+        self.name = name
+        self.function = function
+        self.arity = arity
+        self.coercer = coercer
+        self.returns = returns
+        self.aliases = tuple(aliases)
+        self.batch = batch
+        self.parallel = parallel
+        self.pure = pure
+        self.kernel = kernel
+        self.params = tuple(params)
+        self.vectorized = vectorized
+        defaults = lambda: _defaults(self.function)
+        self.bind = compile_binder(name, arity, self.params, coercer, defaults)
+        # Same checks without converting the variadic values, for backends that convert them themselves.
+        self.bind_raw = self.bind if coercer is None else compile_binder(name, arity, self.params, None, defaults)
+
+    def __repr__(self):
+        return f"FunctionSpec({self.name!r}, arity={self.arity!r}, returns={self.returns!r})"
+
+
+def _check_count(name, count, minimum, maximum):
+    if count < minimum:
+        raise TypeError(f"{name}() takes at least {minimum} argument(s) ({count} given)")
+    if maximum is not None and count > maximum:
+        raise TypeError(f"{name}() takes at most {maximum} argument(s) ({count} given)")
+
+
+def _defaults(function):
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        # Some builtins have no signature, so none of their parameters can be skipped.
+        return {}
+    return {param.name: param.default for param in parameters if param.default is not param.empty}
+
+
+def compile_binder(name, arity=None, params=(), coercer=None, defaults=None):
+    minimum, maximum = arity if arity is not None else (0, None)
+    names = tuple(param for param, _ in params)
+    known = frozenset(names)
+    positions = {param: index for index, param in enumerate(names)}
+    kinds = tuple(kind for _, kind in params)
+    fixed = len(params)
+    variadic = coercer
+
+    def coerce_rest(values):
+        # Already-typed inputs (floats into suma) pass through untouched after one C-level type scan;
+        # the scan is skipped when the first value already needs converting.
+        if values and (type(values[0]) is not variadic or set(map(type, values)) != {variadic}):
+            return tuple(map(variadic, values))
+        return values
+
+    if not fixed:
+        def bind(params):
+            values = tuple(params.values())
+            _check_count(name, len(values), minimum, maximum)
+            return values if variadic is None else coerce_rest(values)
+        return bind
+
+    found = None
+
+    def fill(params):
+        # Named arguments that skip an optional parameter: the skipped ones take the function's defaults.
+        nonlocal found
+        count = max(map(positions.__getitem__, params)) + 1
+        values = []
+        skipped = set()
+        for index, param in enumerate(names[:count]):
+            if param in params:
+                values.append(params[param])
+                continue
+            if index >= minimum and defaults is not None:
+                if found is None:
+                    found = defaults()
+                if param in found:
+                    values.append(found[param])
+                    skipped.add(index)
+                    continue
+            raise TypeError(f"{name}() missing argument '{param}'")
+        return values, count, skipped
+
+    def bind(params):
+        count = len(params)
+        skipped = ()
+        if params.keys() <= known:
+            try:
+                values = [params[param] for param in names[:count]]
+            except KeyError:
+                values, count, skipped = fill(params)
+        else:
+            values = list(params.values())
+        _check_count(name, count, minimum, maximum)
+        for index in range(min(count, fixed)):
+            kind = kinds[index]
+            # Defaults are passed as the function declares them, unconverted.
+            if kind is not None and type(values[index]) is not kind and index not in skipped:
+                values[index] = kind(values[index])
+        head = tuple(values[:fixed])
+        if count <= fixed:
+            return head
+        rest = tuple(values[fixed:])
+        return head + (rest if variadic is None else coerce_rest(rest))
+
+    return bind
+
+
+REGISTRY = {}
+
+
+def register(
+    name, function, arity=None, coercer=None, returns=None, aliases=(), batch=None, parallel=None, pure=False,
+    kernel=None, params=(), vectorized=None,
+):
+    spec = FunctionSpec(
+        name, function, arity, coercer, returns, aliases, batch, parallel, pure, kernel, params, vectorized,
+    )
+    for key in (name, *spec.aliases):
+        if key in REGISTRY:
+            raise ValueError(f"Function '{key}' is already registered.")
+    for key in (name, *spec.aliases):
+        REGISTRY[key] = spec
+    return spec
+
+
+def _kind(name):
+    return TYPES.get(name, name) if isinstance(name, str) else name
+
+
+def _register_entry(entry):
+    entry = dict(entry)
+    if entry.get("arity") is not None:
+        entry["arity"] = tuple(entry["arity"])
+    for key in ("coercer", "returns"):
+        entry[key] = _kind(entry.get(key))
+    entry["params"] = tuple((param, _kind(kind)) for param, kind in entry.get("params", ()))
+    return register(**entry)
+
+
+def load_manifest(path):
+    # A missing or malformed file raises; a bad entry is reported and skipped so the rest still load.
+    with open(path) as manifest:
+        entries = json.load(manifest)
+    if isinstance(entries, dict):
+        entries = entries.get("functions")
+    if not isinstance(entries, list):
+        raise ValueError(f"Manifest {path} should be a list of functions or an object with a 'functions' list.")
+    specs = []
+    for entry in entries:
+        name = entry.get("name") if isinstance(entry, dict) else None
+        if name in REGISTRY:
+            # Like entry points, a manifest never replaces a function that is already registered.
+            warnings.warn(f"Manifest {path}: function '{name}' is already registered, skipped.", RuntimeWarning)
+            continue
+        try:
+            specs.append(_register_entry(entry))
+        except (TypeError, ValueError) as error:
+            warnings.warn(f"Manifest {path}: skipped entry {entry!r}: {error}", RuntimeWarning)
+    return specs
+
+
+def load_entry_points(group=ENTRY_POINT_GROUP):
+    from importlib import metadata
+
+    specs = []
+    for entry_point in metadata.entry_points(group=group):
+        # Built-in and manifest names take precedence over installed packages.
+        if entry_point.name not in REGISTRY:
+            specs.append(register(entry_point.name, entry_point.value))
+    return specs
+
+
+_discovered = False
+_discover_lock = threading.Lock()
+
+
+def discover():
+    # Read manifests from the environment and installed entry points, once, without importing any plugin.
+    global _discovered
+    with _discover_lock:
+        if _discovered:
+            return
+        for path in filter(None, os.environ.get(MANIFEST_ENV, "").split(os.pathsep)):
+            try:
+                load_manifest(path)
+            except (OSError, ValueError) as error:
+                warnings.warn(f"Could not read manifest {path}: {error}", RuntimeWarning)
+        load_entry_points()
+        _discovered = True
+
+
+def get(name):
+    spec = REGISTRY.get(name)
+    if spec is None and not _discovered:
+        discover()
+        spec = REGISTRY.get(name)
+    return spec
+
+
+def resolve(name):
+    spec = get(name)
+    if spec is None:
+        raise LookupError(f"Function '{name}' not found in utils module.")
+    return spec
+
+
+def names():
+    discover()
+    return sorted({spec.name for spec in REGISTRY.values()})
+
+
+def pure_names():
+    discover()
+    return sorted({spec.name for spec in REGISTRY.values() if spec.pure})
+
+
+# arity is (minimum, maximum); None as maximum means variadic.
+# batch, when set, takes a list of argument tuples and returns one result per tuple.
+# parallel, when set, is a drop-in replacement that shards large calls across processes.
+# pure marks functions whose results may be cached.
+# params declares the leading (name, type) parameters; coercer is the type of the variadic rest.
+# kernel, when set, takes the bound and coerced argument tuple and does no coercion of its own.
+# vectorized, when set, takes the same sequence as kernel and reduces it with NumPy; planner.py decides when.
+# Callables are "module:attr" references, so no implementation module is imported until it is called.
+register(
+    "suma", "utils:suma", arity=(0, None), coercer=float, returns=float, aliases=("sumar", "sum"),
+    batch="vectorized:suma_batch", parallel="parallel:suma", pure=True, kernel="utils:suma_floats",
+    vectorized="vectorized:suma_array",
+)
+register(
+    "resta", "utils:resta", arity=(1, None), coercer=float, returns=float, aliases=("restar", "subtract"),
+    batch="vectorized:resta_batch", parallel="parallel:resta", pure=True, kernel="utils:resta_floats",
+    vectorized="vectorized:resta_array",
+)
+register(
+    "mayuscula_a_minuscula", "utils:mayuscula_a_minuscula", arity=(0, None), coercer=str, returns=list,
+    aliases=("minusculas", "lower"), parallel="parallel:mayuscula_a_minuscula", pure=True,
+    kernel="utils:mayuscula_a_minuscula_strs",
+)
+register("suma_stream", "utils:suma_stream", arity=(1, 1), returns=float, params=(("nums", None),))
+register("resta_stream", "utils:resta_stream", arity=(1, 1), returns=float, params=(("nums", None),))
+register(
+    "mayuscula_a_minuscula_stream", "utils:mayuscula_a_minuscula_stream", arity=(1, 1), returns="iterator",
+    params=(("texts", None),),
+)
+register(
+    "suma_array", "vectorized:suma_array", arity=(1, 2), returns=float, params=(("data", None), ("method", str)),
+)
+register(
+    "resta_array", "vectorized:resta_array", arity=(1, 2), returns=float, params=(("data", None), ("method", str)),
+)
+register(
+    "suma_file", "files:suma_file", arity=(1, 3), returns=float,
+    params=(("path", str), ("format", str), ("method", str)),
+)
+register(
+    "resta_file", "files:resta_file", arity=(1, 3), returns=float,
+    params=(("path", str), ("format", str), ("method", str)),
+)
+register(
+    "mayuscula_a_minuscula_bulk", "text:mayuscula_a_minuscula_bulk", arity=(1, 3), returns=list,
+    params=(("texts", None), ("output", str), ("sep", str)),
+)
+register(
+    "suma_exacta", "exact:suma_exacta", arity=(1, None), aliases=("exact_sum",), pure=True,
+    params=(("mode", str),),
+)
+register(
+    "resta_exacta", "exact:resta_exacta", arity=(2, None), aliases=("exact_subtract",), pure=True,
+    params=(("mode", str),),
+)
+register(
+    "acumulador_crear", "accumulators:crear", arity=(0, 2), aliases=("accumulator_new",),
+    params=(("kind", str), ("method", str)),
+)
+register(
+    "acumulador_agregar", "accumulators:agregar", arity=(1, None), coercer=float, returns=float,
+    aliases=("accumulator_add",), params=(("handle", int),),
+)
+register(
+    "acumulador_quitar", "accumulators:quitar", arity=(1, None), coercer=float, returns=float,
+    aliases=("accumulator_remove",), params=(("handle", int),),
+)
+register(
+    "acumulador_valor", "accumulators:valor", arity=(1, 1), returns=float, aliases=("accumulator_value",),
+    params=(("handle", int),),
+)
+register(
+    "acumulador_combinar", "accumulators:combinar", arity=(2, 2), returns=float, aliases=("accumulator_merge",),
+    params=(("handle", int), ("other", int)),
+)
+register(
+    "acumulador_cerrar", "accumulators:cerrar", arity=(1, 1), returns=float, aliases=("accumulator_close",),
+    params=(("handle", int),),
+)
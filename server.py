@@ -0,0 +1,134 @@
+import asyncio
+import concurrent.futures
+import json
+import sys
+
+import main
+import pipeline
+
+DEFAULT_CONCURRENCY = 64
+# Longest request line a socket client may send; asyncio's default of 64 KiB is only a few thousand params.
+LINE_LIMIT = 1 << 26
+
+_TOO_LONG = object()
+
+
+def handle(request):
+    if not isinstance(request, dict):
+        return {"id": None, "error": "Request should be a JSON object."}
+    if "pipeline" in request:
+        steps = request["pipeline"]
+        if not isinstance(steps, list):
+            return {"id": request.get("id"), "error": "Pipeline should be a list of steps."}
+        return {"id": request.get("id"), "results": pipeline.run_pipeline(steps)}
+    job = {"func": request.get("func"), "params": request.get("params", {})}
+    response = {"id": request.get("id")}
+    response.update(main.run_batch([job])[0])
+    return response
+
+
+def encode(response):
+    return json.dumps(response, ensure_ascii=False, default=str) + "\n"
+
+
+async def _respond(line, write, executor, slots):
+    try:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            response = {"id": None, "error": f"Invalid JSON: {error}"}
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(executor, handle, request)
+        await write(encode(response))
+    finally:
+        slots.release()
+
+
+async def serve_lines(read_line, write, executor=None, concurrency=DEFAULT_CONCURRENCY):
+    # Requests run concurrently; responses are written as each one finishes, tagged by id.
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+    while True:
+        line = await read_line()
+        if line is _TOO_LONG:
+            await write(encode({"id": None, "error": "Request line too long."}))
+            continue
+        if not line:
+            break
+        if not line.strip():
+            continue
+        await slots.acquire()
+        task = asyncio.ensure_future(_respond(line, write, executor, slots))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def serve_stdio(executor=None, concurrency=DEFAULT_CONCURRENCY, stdin=None, stdout=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    loop = asyncio.get_running_loop()
+    # A dedicated reader thread works for ttys, pipes and regular files alike.
+    reader = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    async def read_line():
+        return await loop.run_in_executor(reader, stdin.readline)
+
+    async def write(text):
+        stdout.write(text)
+        stdout.flush()
+
+    try:
+        await serve_lines(read_line, write, executor, concurrency)
+    finally:
+        reader.shutdown()
+
+
+async def _read_line(reader):
+    # Like StreamReader.readline, but an over-long line is skipped up to its newline instead of raising.
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return _TOO_LONG
+        except asyncio.IncompleteReadError:
+            return _TOO_LONG
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+async def serve_unix(path, executor=None, concurrency=DEFAULT_CONCURRENCY, limit=LINE_LIMIT):
+    async def client(reader, writer):
+        async def write(text):
+            writer.write(text.encode("utf-8"))
+            await writer.drain()
+
+        try:
+            await serve_lines(lambda: _read_line(reader), write, executor, concurrency)
+        finally:
+            writer.close()
+
+    return await asyncio.start_unix_server(client, path, limit=limit)
+
+
+def run(socket_path=None, workers=None, processes=False):
+    pool_type = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    with pool_type(max_workers=workers) as executor:
+        if socket_path is None:
+            asyncio.run(serve_stdio(executor))
+        else:
+            asyncio.run(_serve_forever(socket_path, executor))
+
+
+async def _serve_forever(path, executor):
+    server = await serve_unix(path, executor)
+    async with server:
+        await server.serve_forever()
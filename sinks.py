@@ -0,0 +1,139 @@
+import queue
+import sys
+import threading
+
+# Longest QueueSink.flush and close wait for the background thread before giving up.
+FLUSH_TIMEOUT = 10.0
+
+
+class NullSink:
+    def write(self, func, message):
+        pass
+
+    def flush(self):
+        pass
+
+
+class PrintSink:
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def write(self, func, message):
+        with self._lock:
+            print(message)
+
+    def flush(self):
+        pass
+
+
+class BufferedSink:
+    def __init__(self, stream=None, capacity=1024):
+        self.stream = stream
+        self.capacity = capacity
+        self._lines = []
+        self._lock = threading.Lock()
+
+    def write(self, func, message):
+        with self._lock:
+            self._lines.append(message)
+            if len(self._lines) >= self.capacity:
+                self._drain()
+
+    def flush(self):
+        with self._lock:
+            self._drain()
+
+    def _drain(self):
+        if not self._lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+
+
+class LoggingSink:
+    def __init__(self, logger="multiple_functions", level=None):
+        # logging is only imported by programs that use it, so plain startup stays fast.
+        import logging
+
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = logging.INFO if level is None else level
+
+    def write(self, func, message):
+        self.logger.log(self.level, message, extra={"func": func})
+
+    def flush(self):
+        for handler in self.logger.handlers:
+            handler.flush()
+
+
+class QueueSink:
+    # Callers only enqueue; a background thread does the slow writes to the wrapped sink.
+    _CONTROL = object()
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.errors = 0
+        self.last_error = None
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="QueueSink", daemon=True)
+        self._thread.start()
+
+    def write(self, func, message):
+        self._queue.put((func, message))
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        # Returns False when the queue was not drained in time, e.g. because the wrapped sink is stuck.
+        done = threading.Event()
+        self._queue.put((self._CONTROL, done))
+        if not done.wait(timeout):
+            return False
+        self.sink.flush()
+        return True
+
+    def close(self, timeout=FLUSH_TIMEOUT):
+        drained = self.flush(timeout)
+        self._queue.put((self._CONTROL, None))
+        self._thread.join(timeout)
+        return drained and not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            func, message = self._queue.get()
+            if func is self._CONTROL:
+                if message is None:
+                    return
+                message.set()
+                continue
+            try:
+                self.sink.write(func, message)
+            except Exception as error:
+                # A failed write, such as to a closed stream, drops that message, not the thread.
+                self.errors += 1
+                self.last_error = error
+
+
+_sink = None
+
+
+def emit(func, message, *args):
+    # Formatting is deferred until a sink is installed, so the default costs one check.
+    sink = _sink
+    if sink is not None:
+        sink.write(func, message % args if args else message)
+
+
+def get_sink():
+    return _sink
+
+
+def set_sink(sink):
+    global _sink
+    previous = _sink
+    _sink = None if isinstance(sink, NullSink) else sink
+    return previous
+
+
+def verbose():
+    return set_sink(PrintSink())
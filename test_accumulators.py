@@ -0,0 +1,178 @@
+"""
+Test suite for accumulators.py.
+"""
+
+import math
+
+import pytest
+import accumulators
+import main
+from utils import suma, resta
+
+
+class TestSumAccumulator:
+    """Test cases for SumAccumulator."""
+
+    def test_add_matches_suma(self, values):
+        """Test that adding one value at a time matches suma exactly."""
+        accumulator = accumulators.SumAccumulator()
+        for value in values:
+            accumulator.add(value)
+        assert accumulator.value == suma(*values)
+        assert accumulator.count == len(values)
+
+    def test_add_many_matches_suma(self, values):
+        """Test that batches add in the same order as one suma call."""
+        accumulator = accumulators.SumAccumulator(values[:300])
+        accumulator.add_many(values[300:])
+        assert accumulator.value == suma(*values)
+
+    def test_batches_match_suma(self, values):
+        """Test that many batches and single adds together still match one suma call exactly."""
+        accumulator = accumulators.SumAccumulator()
+        for start in range(0, len(values), 250):
+            accumulator.add_many(values[start:start + 249])
+            accumulator.add(values[start + 249])
+        assert accumulator.value == suma(*values)
+        for edge in ([1e308, 1e308, -1.0], [-0.0, -0.0], [1e16, 1.0, -1e16]):
+            assert accumulators.SumAccumulator(edge).value == suma(*edge)
+
+    def test_converts_like_suma(self):
+        """Test that numeric strings and ints are accepted."""
+        assert accumulators.SumAccumulator(["1.5", 2, 0.5]).value == 4.0
+        with pytest.raises(ValueError):
+            accumulators.SumAccumulator().add("abc")
+
+    def test_sliding_window(self, values):
+        """Test a fixed-size window updated with add and remove."""
+        window = 50
+        accumulator = accumulators.SumAccumulator(values[:window], compensated=True)
+        for start in range(1, len(values) - window):
+            accumulator.add(values[start + window - 1])
+            accumulator.remove(values[start - 1])
+            assert accumulator.value == pytest.approx(math.fsum(values[start:start + window]), abs=1e-9)
+            assert accumulator.count == window
+
+    def test_remove_many(self):
+        """Test removing several values at once."""
+        accumulator = accumulators.SumAccumulator([1, 2, 3, 4])
+        accumulator.remove_many([1, 2])
+        assert accumulator.value == 7.0
+        assert accumulator.count == 2
+
+    def test_compensated(self):
+        """Test that compensated summation recovers what plain addition loses."""
+        values = [1e16, 1.0, -1e16] * 3
+        assert accumulators.SumAccumulator(values, compensated=True).value == 3.0
+
+    def test_merge(self, values):
+        """Test that shard accumulators merge into the total."""
+        shards = [accumulators.SumAccumulator(values[start:start + 250], True) for start in range(0, len(values), 250)]
+        total = shards[0]
+        for shard in shards[1:]:
+            assert total.merge(shard) is total
+        assert total.value == pytest.approx(math.fsum(values), abs=1e-9)
+        assert total.count == len(values)
+
+    def test_slots(self):
+        """Test that accumulators carry no per-instance dict."""
+        assert not hasattr(accumulators.SumAccumulator(), "__dict__")
+        assert not hasattr(accumulators.RestaAccumulator(), "__dict__")
+
+
+class TestRestaAccumulator:
+    """Test cases for RestaAccumulator."""
+
+    def test_matches_resta(self, values):
+        """Test that incremental updates match resta up to rounding."""
+        accumulator = accumulators.RestaAccumulator()
+        accumulator.add(values[0])
+        accumulator.add_many(values[1:])
+        assert accumulator.first == values[0]
+        assert accumulator.value == pytest.approx(resta(*values))
+        assert accumulator.count == len(values)
+
+    def test_empty(self):
+        """Test that an empty accumulator has nothing to subtract from."""
+        with pytest.raises(IndexError):
+            accumulators.RestaAccumulator().value
+
+    def test_remove(self):
+        """Test that remove takes a value back out of the subtrahend."""
+        accumulator = accumulators.RestaAccumulator([10, 1, 2, 3])
+        accumulator.remove(2)
+        assert accumulator.value == 6.0
+
+    def test_merge_shards(self, values):
+        """Test that merging consecutive shards gives the resta of the whole sequence."""
+        left = accumulators.RestaAccumulator(values[:400])
+        right = accumulators.RestaAccumulator(values[400:])
+        assert left.merge(right).value == pytest.approx(resta(*values))
+
+    def test_merge_with_empty(self):
+        """Test merging into and from an empty accumulator."""
+        empty = accumulators.RestaAccumulator()
+        assert empty.merge(accumulators.RestaAccumulator([5, 1])).value == 4.0
+        assert empty.merge(accumulators.RestaAccumulator()).value == 4.0
+
+
+class TestHandles:
+    """Test cases for accumulators used by handle through main.main."""
+
+    def test_suma_handle(self):
+        """Test creating, updating, reading and closing a suma accumulator."""
+        handle = main.main(func="acumulador_crear", params={})
+        assert main.main(func="acumulador_agregar", params={"var1": handle, "var2": "1.5", "var3": 2}) == 3.5
+        assert main.main(func="accumulator_remove", params={"var1": handle, "var2": 1.5}) == 2.0
+        assert main.main(func="acumulador_valor", params={"handle": str(handle)}) == 2.0
+        assert main.main(func="acumulador_cerrar", params={"handle": handle}) == 2.0
+        assert main.main(func="acumulador_valor", params={"handle": handle}) is None
+
+    def test_resta_handle(self):
+        """Test a resta accumulator with compensated summation."""
+        handle = main.main(func="acumulador_crear", params={"kind": "resta", "method": "kahan"})
+        params = {"var1": handle, "var2": 1.0, "var3": 1e16, "var4": 1.0, "var5": 1.0}
+        main.main(func="acumulador_agregar", params=params)
+        assert main.main(func="acumulador_agregar", params={"var1": handle, "var2": -1e16}) == -1.0
+        assert accumulators.cerrar(handle) == -1.0
+
+    def test_merge_handles(self):
+        """Test merging one handle's values into another."""
+        left = accumulators.crear("resta")
+        right = accumulators.crear("resta")
+        accumulators.agregar(left, 10, 1)
+        accumulators.agregar(right, 2, 3)
+        assert main.main(func="acumulador_combinar", params={"handle": left, "other": right}) == 4.0
+        assert accumulators.valor(right) == -1.0
+        with pytest.raises(ValueError):
+            accumulators.combinar(left, left)
+        accumulators.cerrar(left)
+        accumulators.cerrar(right)
+
+    def test_merge_different_kinds(self):
+        """Test that a suma handle and a resta handle cannot be merged."""
+        suma_handle = accumulators.crear("suma")
+        resta_handle = accumulators.crear("resta")
+        with pytest.raises(ValueError, match="Cannot merge a resta accumulator into a suma accumulator"):
+            accumulators.combinar(suma_handle, resta_handle)
+        with pytest.raises(ValueError, match="Cannot merge a suma accumulator into a resta accumulator"):
+            accumulators.combinar(resta_handle, suma_handle)
+        accumulators.cerrar(suma_handle)
+        accumulators.cerrar(resta_handle)
+
+    def test_close_empty_resta(self):
+        """Test that closing an empty resta accumulator gives None."""
+        assert accumulators.cerrar(accumulators.crear("resta")) is None
+
+    def test_invalid_arguments(self):
+        """Test unknown kinds, methods and handles."""
+        with pytest.raises(ValueError):
+            accumulators.crear("producto")
+        with pytest.raises(ValueError):
+            accumulators.crear("suma", "pairwise")
+        with pytest.raises(LookupError):
+            accumulators.agregar(-1, 1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
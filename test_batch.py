@@ -0,0 +1,130 @@
+"""
+Test suite for batch.py.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+import batch
+import main
+
+
+def run_lines(lines, **kwargs):
+    """Run jobs given as text lines and return the decoded responses and the stats."""
+    output = io.StringIO()
+    stats = batch.run(io.StringIO("".join(line + "\n" for line in lines)), output, **kwargs)
+    return [json.loads(line) for line in output.getvalue().splitlines()], stats
+
+
+class TestRun:
+    """Test cases for running JSONL jobs."""
+
+    def test_results_in_order(self):
+        """Test that every job gets one response line, in input order, with its id."""
+        responses, stats = run_lines([
+            '{"id": 1, "func": "suma", "params": {"a": 1, "b": 2, "c": 3, "d": 4}}',
+            '{"id": "x", "func": "resta", "params": {"a": 10}}',
+            '{"func": "lower", "params": {"a": "ÑANDÚ"}}',
+        ])
+        assert responses == [
+            {"id": 1, "func": "suma", "value": 10.0},
+            {"id": "x", "func": "resta", "value": 10.0},
+            {"id": None, "func": "lower", "value": ["ñandú"]},
+        ]
+        assert stats["jobs"] == 3
+        assert stats["errors"] == 0
+        assert stats["rate"] > 0
+
+    def test_errors_counted(self):
+        """Test invalid JSON, unknown functions, bad params, non-object jobs and non-string names."""
+        responses, stats = run_lines([
+            "not json",
+            '{"id": 2, "func": "nope"}',
+            '{"id": 3, "func": "suma", "params": {"a": "abc"}}',
+            "[1, 2]",
+            '{"id": 5, "func": "suma", "params": {"a": 1}}',
+            '{"id": 6, "func": ["suma"]}',
+        ])
+        assert responses[0]["error"].startswith("Invalid JSON")
+        assert responses[1] == {"id": 2, "func": "nope", "error": "Function 'nope' not found in utils module."}
+        assert "could not convert" in responses[2]["error"]
+        assert responses[3] == {"id": None, "func": None, "error": "Job should be a dictionary."}
+        assert responses[4] == {"id": 5, "func": "suma", "value": 1.0}
+        assert responses[5] == {"id": 6, "func": ["suma"], "error": "Function name should be a string."}
+        assert stats["errors"] == 5
+
+    def test_many_chunks(self):
+        """Test that order is kept across chunks run by several workers."""
+        lines = [json.dumps({"id": n, "func": "suma", "params": {"a": n, "b": n}}) for n in range(200)]
+        responses, stats = run_lines(lines, workers=4, chunk_size=7)
+        assert [response["value"] for response in responses] == [2.0 * n for n in range(200)]
+        assert stats["jobs"] == 200
+
+    def test_blank_lines_skipped(self):
+        """Test that blank lines are not jobs."""
+        responses, stats = run_lines(["", '{"func": "suma", "params": {}}', "   "])
+        assert responses == [{"id": None, "func": "suma", "value": 0}]
+        assert stats["jobs"] == 1
+
+    def test_report(self):
+        """Test the throughput line."""
+        stream = io.StringIO()
+        batch.report({"jobs": 10, "errors": 1, "seconds": 0.5, "rate": 20.0}, stream)
+        assert stream.getvalue() == "10 jobs in 0.500s (20 jobs/s), 1 errors\n"
+
+
+class TestJson:
+    """Test cases for the JSON helpers."""
+
+    def test_loads(self):
+        """Test that lines parse like json.loads, including its errors."""
+        assert batch._loads('{"a": [1, 2.5]}\n') == {"a": [1, 2.5]}
+        assert batch._loads('  {"a": 1}\r\n') == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            batch._loads('{"a": 1} trailing\n')
+        with pytest.raises(json.JSONDecodeError):
+            batch._loads("{\n")
+
+    def test_encode(self):
+        """Test that responses encode like json.dumps(ensure_ascii=False, default=str)."""
+        value = {"id": None, "value": ["ñandú", 1.5, float("inf")], "other": {1, 2}}
+        assert batch._encode(value) == json.dumps(value, ensure_ascii=False, default=str)
+
+
+class TestCli:
+    """Test cases for main.py --batch."""
+
+    def test_stdin(self):
+        """Test jobs on stdin, results on stdout and the report on stderr."""
+        jobs = "".join(json.dumps({"id": n, "func": "suma", "params": {"a": n, "b": 1, "c": 1}}) + "\n" for n in range(50))
+        process = subprocess.run(
+            [sys.executable, "main.py", "--batch", "--workers", "2"], input=jobs, capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(main.__file__) or ".",
+        )
+        responses = [json.loads(line) for line in process.stdout.splitlines()]
+        assert [response["value"] for response in responses] == [n + 2.0 for n in range(50)]
+        assert "50 jobs in" in process.stderr
+        assert "0 errors" in process.stderr
+
+    def test_files(self, tmp_path):
+        """Test reading jobs from a file and writing results to --output."""
+        jobs = tmp_path / "jobs.jsonl"
+        jobs.write_text('{"func": "resta", "params": {"a": 3, "b": 1}}\n{"func": "resta", "params": {}}\n')
+        results = tmp_path / "results.jsonl"
+        process = subprocess.run(
+            [sys.executable, "main.py", "--batch", str(jobs), "--output", str(results)],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(main.__file__) or ".",
+        )
+        assert process.stdout == ""
+        lines = results.read_text().splitlines()
+        assert json.loads(lines[0]) == {"id": None, "func": "resta", "value": 2.0}
+        assert "error" in json.loads(lines[1])
+        assert "1 errors" in process.stderr
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
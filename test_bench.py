@@ -0,0 +1,69 @@
+"""
+Test suite for bench.py.
+"""
+
+import json
+
+import pytest
+import bench
+import sinks
+
+
+class TestBench:
+    """Test cases for the benchmark runner."""
+
+    @pytest.mark.parametrize("kind", ["numeric", "string", "ascii", "unicode"])
+    def test_make_inputs(self, kind):
+        """Test that every input kind produces the requested size."""
+        assert len(bench.make_inputs(kind, 5)) == 5
+
+    def test_make_inputs_unknown_kind(self):
+        """Test that an unknown input kind is rejected."""
+        with pytest.raises(ValueError):
+            bench.make_inputs("binary", 5)
+
+    def test_run_covers_every_case(self):
+        """Test that run measures every case and kind at every size."""
+        report = bench.run(sizes=(1, 10), min_time=0.001)
+        expected = sum(len(kinds) for _, _, kinds in bench.CASES.values()) * 2
+        assert len(report["results"]) == expected
+        assert report["results"]["suma[string,10]"]["seconds"] > 0
+        assert "dispatch_overhead" in report["results"]["main.suma[numeric,1]"]
+        assert report["meta"]["python"]
+
+    def test_run_restores_sink(self):
+        """Test that run silences output and restores the previous sink."""
+        previous = sinks.verbose()
+        try:
+            installed = sinks.get_sink()
+            bench.run(sizes=(1,), cases=["suma"], min_time=0.001)
+            assert sinks.get_sink() is installed
+        finally:
+            sinks.set_sink(previous)
+
+    def test_compare_flags_regressions(self):
+        """Test that compare reports cases slower than the tolerance allows."""
+        baseline = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}}
+        current = {"results": {"a": {"seconds": 1.05}, "b": {"seconds": 1.5}, "c": {"seconds": 9.0}}}
+        regressions = bench.compare(current, baseline, tolerance=0.10)
+        assert [regression["case"] for regression in regressions] == ["b"]
+        assert regressions[0]["ratio"] == pytest.approx(1.5)
+
+    def test_cli_writes_json_and_compares(self, tmp_path, capsys):
+        """Test the command line runner end to end."""
+        output = tmp_path / "current.json"
+        argv = ["--sizes", "1", "10", "--cases", "suma", "--min-time", "0.001", "--output", str(output)]
+        assert bench.cli(argv) == 0
+        saved = json.loads(output.read_text())
+        assert set(saved["results"]) == {"suma[numeric,1]", "suma[string,1]", "suma[numeric,10]", "suma[string,10]"}
+
+        baseline = tmp_path / "baseline.json"
+        for result in saved["results"].values():
+            result["seconds"] /= 1000
+        baseline.write_text(json.dumps(saved))
+        assert bench.cli(argv + ["--baseline", str(baseline)]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
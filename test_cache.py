@@ -0,0 +1,190 @@
+"""
+Test suite for cache.py.
+"""
+
+import decimal
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+import cache
+import main
+import registry
+import utils
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def active_cache():
+    """Install a cache covering every pure registry function."""
+    previous = cache.active()
+    store = cache.configure(maxsize=8, functions=registry.pure_names())
+    yield store
+    cache.install(previous)
+
+
+class TestResultCache:
+    """Test cases for the ResultCache class."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups count hits and misses."""
+        store = cache.ResultCache(functions=["suma"])
+        assert store.lookup("suma", (1, 2)) is cache.MISSING
+        store.store("suma", (1, 2), 3.0)
+        assert store.lookup("suma", (1, 2)) == 3.0
+        assert store.stats()["hits"] == 1
+        assert store.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        store = cache.ResultCache(maxsize=2)
+        store.store("suma", (1,), 1.0)
+        store.store("suma", (2,), 2.0)
+        store.lookup("suma", (1,))
+        store.store("suma", (3,), 3.0)
+        assert store.lookup("suma", (2,)) is cache.MISSING
+        assert store.lookup("suma", (1,)) == 1.0
+        assert store.stats()["evictions"] == 1
+        assert store.stats()["size"] == 2
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        clock = FakeClock()
+        store = cache.ResultCache(ttl=10, clock=clock)
+        store.store("suma", (1,), 1.0)
+        clock.now = 9.9
+        assert store.lookup("suma", (1,)) == 1.0
+        clock.now = 10.0
+        assert store.lookup("suma", (1,)) is cache.MISSING
+        assert store.stats()["expirations"] == 1
+
+    def test_keys_distinguish_types(self):
+        """Test that 1, 1.0 and True are cached separately."""
+        store = cache.ResultCache()
+        store.store("mayuscula_a_minuscula", (True,), ["true"])
+        assert store.lookup("mayuscula_a_minuscula", (1,)) is cache.MISSING
+
+    def test_keys_keep_exponent_and_sign(self):
+        """Test that equal Decimals with different exponents, and 0.0 and -0.0, are cached separately."""
+        store = cache.ResultCache()
+        store.store("suma_exacta", ("decimal", decimal.Decimal("1.0")), decimal.Decimal("1.0"))
+        assert store.lookup("suma_exacta", ("decimal", decimal.Decimal("1.00"))) is cache.MISSING
+        assert store.lookup("suma_exacta", ("decimal", decimal.Decimal("1.0"))) == decimal.Decimal("1.0")
+        store.store("mayuscula_a_minuscula", (0.0,), ["0.0"])
+        assert store.lookup("mayuscula_a_minuscula", (-0.0,)) is cache.MISSING
+        assert store.lookup("mayuscula_a_minuscula", (1.0,)) is cache.MISSING
+
+    def test_unhashable_arguments_bypass(self):
+        """Test that unhashable arguments are computed but never stored."""
+        store = cache.ResultCache(functions=["suma"])
+        function = MagicMock(return_value=3.0)
+        assert store.call("suma", function, ([1, 2],)) == 3.0
+        assert store.call("suma", function, ([1, 2],)) == 3.0
+        assert function.call_count == 2
+        assert store.stats()["size"] == 0
+
+    def test_list_results_are_copied(self):
+        """Test that mutating a returned list does not change the cached value."""
+        store = cache.ResultCache()
+        store.store("mayuscula_a_minuscula", ("A",), ["a"])
+        store.lookup("mayuscula_a_minuscula", ("A",)).append("oops")
+        assert store.lookup("mayuscula_a_minuscula", ("A",)) == ["a"]
+
+    def test_enable_disable(self):
+        """Test per-function enable flags."""
+        store = cache.ResultCache()
+        assert not store.covers("suma")
+        store.enable("suma")
+        assert store.covers("suma")
+        store.disable("suma")
+        assert not store.covers("suma")
+
+    def test_thread_safety(self):
+        """Test that concurrent callers keep the counters consistent."""
+        store = cache.ResultCache(maxsize=16, functions=["suma"])
+
+        def worker():
+            for n in range(500):
+                store.call("suma", utils.suma, (n % 32,))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = store.stats()
+        assert stats["hits"] + stats["misses"] == 4000
+        assert stats["size"] <= 16
+
+
+class TestCacheIntegration:
+    """Test cases for the cache through main and direct utils calls."""
+
+    def test_main_uses_cache(self, active_cache):
+        """Test that a repeated main call is served from the cache."""
+        spec = registry.REGISTRY["mayuscula_a_minuscula"]
+        with patch.object(spec, 'kernel', wraps=spec.kernel) as mock_kernel:
+            assert main.main(func="mayuscula_a_minuscula", params={"v": "HOLA"}) == ["hola"]
+            assert main.main(func="lower", params={"v": "HOLA"}) == ["hola"]
+        mock_kernel.assert_called_once_with(("HOLA",))
+        assert active_cache.stats()["hits"] == 1
+
+    def test_main_exact_decimal_exponent(self, active_cache):
+        """Test that a cached decimal sum keeps the exponent of its own inputs."""
+        one = decimal.Decimal("1.0")
+        assert str(main.main(func="suma_exacta", params={"mode": "decimal", "a": one, "b": one})) == "2.0"
+        hundredths = decimal.Decimal("1.00")
+        assert str(main.main(func="suma_exacta", params={"mode": "decimal", "a": hundredths, "b": hundredths})) == "2.00"
+
+    def test_main_without_cache(self):
+        """Test that main computes every call when no cache is installed."""
+        previous = cache.install(None)
+        try:
+            spec = registry.REGISTRY["suma"]
+            with patch.object(spec, 'kernel', wraps=spec.kernel) as mock_kernel:
+                main.main(func="suma", params={"a": 1})
+                main.main(func="suma", params={"a": 1})
+            assert mock_kernel.call_count == 2
+        finally:
+            cache.install(previous)
+
+    def test_disabled_function_not_cached(self, active_cache):
+        """Test that functions disabled in the cache are recomputed."""
+        active_cache.disable("suma")
+        main.main(func="suma", params={"a": 1})
+        assert active_cache.stats()["size"] == 0
+
+    def test_run_batch_uses_cache(self, active_cache):
+        """Test that run_batch serves repeats from the cache and fills it."""
+        jobs = [{"func": "suma", "params": {"a": 1, "b": 2}}, {"func": "suma", "params": {"a": 5}}]
+        main.run_batch(jobs)
+        results = main.run_batch(jobs)
+        assert [result["value"] for result in results] == [3.0, 5.0]
+        assert active_cache.stats()["hits"] == 2
+
+    def test_memoize_direct_utils_calls(self, active_cache):
+        """Test memoize wrapping a utils function directly."""
+        calls = []
+
+        def lower(*texts):
+            calls.append(texts)
+            return utils.mayuscula_a_minuscula(*texts)
+
+        cached_lower = cache.memoize(lower, name="mayuscula_a_minuscula")
+        assert cached_lower("ÑANDÚ") == ["ñandú"]
+        assert cached_lower("ÑANDÚ") == ["ñandú"]
+        assert calls == [("ÑANDÚ",)]
+        assert cached_lower.__name__ == "lower"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,210 @@
+"""
+Test suite for cluster.py.
+"""
+
+import array
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+import cluster
+import main
+import wire
+from utils import suma, resta
+
+
+def start_worker(address, behaviour=None):
+    """Listen on address in a thread, serving wire frames or running behaviour on each connection."""
+    listener = cluster.listen(address)
+    if behaviour is None:
+        threading.Thread(target=cluster.serve_worker, args=(address, listener), daemon=True).start()
+        return address
+
+    def accept():
+        with listener:
+            while True:
+                connection, _ = listener.accept()
+                threading.Thread(target=behaviour, args=(connection,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return address
+
+
+def dies_after_one_frame(connection):
+    """Read one request and hang up without answering."""
+    with connection, connection.makefile("rb") as reader:
+        wire.read_frame(reader)
+
+
+def never_answers(connection):
+    """Read requests without ever answering them."""
+    with connection, connection.makefile("rb") as reader:
+        while wire.read_frame(reader) is not None:
+            pass
+
+
+def answers_with_error(connection):
+    """Answer every request with an error."""
+    with connection, connection.makefile("rb") as reader, connection.makefile("wb") as writer:
+        while (request := wire.read_frame(reader)) is not None:
+            wire.write_frame(writer, {"id": request["id"], "error": "disk full"})
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Provide three in-process workers on Unix sockets."""
+    return [start_worker(str(tmp_path / f"w{n}.sock")) for n in range(3)]
+
+
+class TestAddresses:
+    """Test cases for worker addresses."""
+
+    def test_parse(self):
+        """Test TCP and Unix socket addresses."""
+        assert cluster.parse_address("127.0.0.1:9000") == (socket.AF_INET, ("127.0.0.1", 9000))
+        assert cluster.parse_address(":9000") == (socket.AF_INET, ("127.0.0.1", 9000))
+        assert cluster.parse_address("/tmp/w.sock") == (socket.AF_UNIX, "/tmp/w.sock")
+
+    def test_tcp_worker(self, values):
+        """Test a worker on a local TCP port."""
+        listener = cluster.listen("127.0.0.1:0")
+        address = "127.0.0.1:%d" % listener.getsockname()[1]
+        threading.Thread(target=cluster.serve_worker, args=(address, listener), daemon=True).start()
+        assert cluster.Coordinator([address], shard_size=1000).reduce("suma", values) == pytest.approx(suma(*values))
+
+
+class TestShards:
+    """Test cases for splitting input into shards."""
+
+    def test_shards(self):
+        """Test that values are split into float64 arrays of the shard size."""
+        parts = list(cluster.shards(["1", 2, 3.5, 4, 5], size=2))
+        assert [part.tolist() for part in parts] == [[1.0, 2.0], [3.5, 4.0], [5.0]]
+        assert all(part.typecode == "d" for part in parts)
+
+    def test_file_shards(self, tmp_path):
+        """Test shards read from text and binary files."""
+        text = tmp_path / "values.txt"
+        text.write_text("1\n2.5\n-3\n")
+        binary = tmp_path / "values.bin"
+        binary.write_bytes(array.array("q", [4, 5]).tobytes())
+        assert [part.tolist() for part in cluster.file_shards(str(text))] == [[1.0, 2.5, -3.0]]
+        assert [part.tolist() for part in cluster.file_shards(str(binary), "int64")] == [[4.0, 5.0]]
+
+
+class TestCoordinator:
+    """Test cases for reductions spread over workers."""
+
+    def test_suma(self, workers, values):
+        """Test that the merged partial sums match suma."""
+        coordinator = cluster.Coordinator(workers, shard_size=700)
+        assert coordinator.reduce("suma", values) == pytest.approx(suma(*values))
+        assert coordinator.reassigned == 0
+
+    def test_partials_in_order(self, workers):
+        """Test that partial sums come back in shard order."""
+        coordinator = cluster.Coordinator(workers)
+        assert coordinator.partial_sums(cluster.shards(range(10), size=3)) == [3.0, 12.0, 21.0, 9.0]
+
+    def test_resta(self, workers, values):
+        """Test that resta subtracts the sum of the remaining shards from the first value."""
+        assert cluster.Coordinator(workers, shard_size=700).reduce("resta", values) == pytest.approx(resta(*values))
+        assert cluster.Coordinator(workers).reduce("resta", [5]) == 5.0
+
+    def test_empty(self, workers):
+        """Test empty input."""
+        assert cluster.Coordinator(workers).reduce("suma", []) == 0
+        with pytest.raises(IndexError):
+            cluster.Coordinator(workers).reduce("resta", [])
+
+    def test_reduce_file(self, workers, values, tmp_path):
+        """Test reducing a binary file."""
+        path = tmp_path / "values.bin"
+        path.write_bytes(array.array("d", values).tobytes())
+        assert cluster.Coordinator(workers).reduce_file("suma", str(path), "float64") == pytest.approx(suma(*values))
+
+    def test_unknown_reduction(self, workers):
+        """Test that only suma and resta can be spread over the cluster."""
+        with pytest.raises(ValueError):
+            cluster.Coordinator(workers).reduce("mayuscula_a_minuscula", ["A"])
+        with pytest.raises(ValueError):
+            cluster.Coordinator([])
+
+
+class TestFailures:
+    """Test cases for workers that fail."""
+
+    def test_shard_reassigned(self, workers, values, tmp_path):
+        """Test that a shard sent to a worker that hangs up is run by another worker."""
+        broken = start_worker(str(tmp_path / "broken.sock"), dies_after_one_frame)
+        coordinator = cluster.Coordinator([broken] + workers, shard_size=500)
+        assert coordinator.reduce("suma", values) == pytest.approx(suma(*values))
+        assert coordinator.reassigned == 1
+
+    def test_hung_worker(self, workers, values, tmp_path):
+        """Test that a shard sent to a worker that never answers is run by another worker after the timeout."""
+        hung = start_worker(str(tmp_path / "hung.sock"), never_answers)
+        coordinator = cluster.Coordinator([hung] + workers, timeout=0.2, shard_size=500)
+        assert coordinator.reduce("suma", values) == pytest.approx(suma(*values))
+        assert coordinator.reassigned == 1
+        assert cluster.Coordinator(workers).timeout == cluster.DEFAULT_TIMEOUT
+
+    def test_unreachable_worker(self, workers, values, tmp_path):
+        """Test that a worker that cannot be reached is skipped."""
+        coordinator = cluster.Coordinator([str(tmp_path / "missing.sock")] + workers, shard_size=500)
+        assert coordinator.reduce("suma", values) == pytest.approx(suma(*values))
+
+    def test_no_workers_left(self, values, tmp_path):
+        """Test that the job fails once every worker is gone."""
+        broken = [start_worker(str(tmp_path / f"b{n}.sock"), dies_after_one_frame) for n in range(2)]
+        with pytest.raises(ConnectionError):
+            cluster.Coordinator(broken, shard_size=500).reduce("suma", values)
+
+    def test_error_response(self, values, tmp_path):
+        """Test that an error from a worker fails the job instead of being retried."""
+        failing = start_worker(str(tmp_path / "failing.sock"), answers_with_error)
+        with pytest.raises(ValueError, match="disk full"):
+            cluster.Coordinator([failing], shard_size=500).reduce("suma", values)
+
+
+class TestProcesses:
+    """Test cases for worker processes on one machine."""
+
+    def test_killed_worker(self, values, tmp_path):
+        """Test reductions with worker processes, one of them killed."""
+        processes, addresses = cluster.spawn_workers(2, str(tmp_path))
+        try:
+            coordinator = cluster.Coordinator(addresses, shard_size=1000)
+            assert coordinator.reduce("suma", values) == pytest.approx(suma(*values))
+            processes[0].kill()
+            processes[0].wait()
+            assert coordinator.reduce("resta", values) == pytest.approx(resta(*values))
+        finally:
+            cluster.stop_workers(processes)
+
+    def test_cli(self, tmp_path):
+        """Test main.py --reduce with local workers."""
+        path = tmp_path / "values.txt"
+        path.write_text("".join(f"{n}\n" for n in range(1000)))
+        process = subprocess.run(
+            [sys.executable, "main.py", "--cluster-local", "2", "--reduce", "suma", str(path)],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(main.__file__) or ".",
+        )
+        assert "Result: 499500.0" in process.stdout
+
+    def test_cli_needs_workers(self, tmp_path):
+        """Test that --reduce without --cluster or --cluster-local is a usage error."""
+        process = subprocess.run(
+            [sys.executable, "main.py", "--reduce", "suma", str(tmp_path / "values.txt"), "--cluster-timeout", "5"],
+            capture_output=True, text=True, cwd=os.path.dirname(main.__file__) or ".",
+        )
+        assert process.returncode == 2
+        assert "--reduce needs --cluster" in process.stderr
+        assert "Traceback" not in process.stderr
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
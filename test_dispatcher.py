@@ -0,0 +1,199 @@
+"""
+Test suite for dispatcher.py.
+"""
+
+import concurrent.futures
+import queue
+import threading
+
+import pytest
+from unittest.mock import patch
+import dispatcher
+import registry
+import sinks
+
+
+@pytest.fixture
+def blocker():
+    """Register a function that waits until the test releases it."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def bloquear(value):
+        started.set()
+        release.wait(5)
+        return value
+
+    with patch.dict(registry.REGISTRY):
+        registry.register("bloquear", bloquear, arity=(1, 1))
+        yield started, release
+        release.set()
+
+
+class TestSubmit:
+    """Test cases for submitting requests."""
+
+    def test_result(self):
+        """Test that submit returns a future for the function's result."""
+        with dispatcher.Dispatcher(workers=2) as pool:
+            assert pool.submit("suma", {"a": "1", "b": 2}).result(5) == 3.0
+            assert pool.submit("lower", {"a": "ÑANDÚ"}).result(5) == ["ñandú"]
+
+    def test_no_params(self):
+        """Test that params may be omitted."""
+        with dispatcher.Dispatcher(workers=1) as pool:
+            assert pool.submit("suma").result(5) == 0
+
+    def test_errors_raised_from_future(self):
+        """Test that failures are raised by the future instead of printed."""
+        with dispatcher.Dispatcher(workers=1) as pool:
+            with pytest.raises(ValueError):
+                pool.submit("suma", {"a": "abc"}).result(5)
+            with pytest.raises(LookupError, match="not found"):
+                pool.submit("nope").result(5)
+            with pytest.raises(TypeError, match="Params should be a dictionary"):
+                pool.submit("suma", [1, 2]).result(5)
+
+    def test_submit_batch(self):
+        """Test that a list of jobs runs as one request with one result per job."""
+        jobs = [{"func": "suma", "params": {"a": 1, "b": 2}}, {"func": "nope"}, {"func": "resta", "params": {"a": 5}}]
+        with dispatcher.Dispatcher(workers=1) as pool:
+            results = pool.submit_batch(jobs).result(5)
+        assert results == [
+            {"func": "suma", "value": 3.0},
+            {"func": "nope", "error": "Function 'nope' not found in utils module."},
+            {"func": "resta", "value": 5.0},
+        ]
+
+    def test_submit_after_shutdown(self):
+        """Test that a closed dispatcher rejects new requests."""
+        pool = dispatcher.Dispatcher(workers=1)
+        pool.shutdown()
+        with pytest.raises(RuntimeError):
+            pool.submit("suma")
+
+
+class TestBackpressure:
+    """Test cases for the bounded request queue."""
+
+    def test_reject_when_full(self, blocker):
+        """Test that a full queue rejects at once by default."""
+        started, release = blocker
+        with dispatcher.Dispatcher(workers=1, max_queue=1) as pool:
+            running = pool.submit("bloquear", {"a": 1})
+            assert started.wait(5)
+            queued = pool.submit("bloquear", {"a": 2})
+            assert pool.pending() == 1
+            with pytest.raises(queue.Full):
+                pool.submit("bloquear", {"a": 3})
+            release.set()
+            assert running.result(5) == 1
+            assert queued.result(5) == 2
+
+    def test_timeout_when_full(self, blocker):
+        """Test that a timeout waits for room before rejecting."""
+        started, release = blocker
+        with dispatcher.Dispatcher(workers=1, max_queue=1, timeout=0.05) as pool:
+            pool.submit("bloquear", {"a": 1})
+            assert started.wait(5)
+            pool.submit("bloquear", {"a": 2})
+            with pytest.raises(queue.Full):
+                pool.submit("bloquear", {"a": 3})
+            release.set()
+
+    def test_waits_for_room(self, blocker):
+        """Test that a submit with a timeout succeeds once the queue drains."""
+        started, release = blocker
+        with dispatcher.Dispatcher(workers=1, max_queue=1) as pool:
+            pool.submit("bloquear", {"a": 1})
+            assert started.wait(5)
+            pool.submit("bloquear", {"a": 2})
+            threading.Timer(0.05, release.set).start()
+            assert pool.submit("bloquear", {"a": 3}, timeout=5).result(5) == 3
+
+    def test_cancel_pending_on_shutdown(self, blocker):
+        """Test that queued requests can be cancelled at shutdown."""
+        started, release = blocker
+        pool = dispatcher.Dispatcher(workers=1, max_queue=4)
+        running = pool.submit("bloquear", {"a": 1})
+        assert started.wait(5)
+        queued = [pool.submit("suma", {"a": n}) for n in range(3)]
+        release.set()
+        pool.shutdown(cancel_pending=True)
+        assert running.result(5) == 1
+        assert all(future.cancelled() for future in queued)
+
+    def test_shutdown_with_full_queue(self, blocker):
+        """Test that shutdown without waiting returns at once while the queue is full."""
+        started, release = blocker
+        pool = dispatcher.Dispatcher(workers=1, max_queue=2)
+        running = pool.submit("bloquear", {"a": 1})
+        assert started.wait(5)
+        queued = [pool.submit("suma", {"a": n}) for n in range(2)]
+        finished = threading.Event()
+        threading.Thread(target=lambda: (pool.shutdown(wait=False), finished.set()), daemon=True).start()
+        assert finished.wait(2)
+        with pytest.raises(RuntimeError):
+            pool.submit("suma")
+        release.set()
+        assert running.result(5) == 1
+        assert [future.result(5) for future in queued] == [0.0, 1.0]
+
+    def test_submit_waiting_for_room_after_shutdown(self, blocker):
+        """Test that a submit blocked on a full queue is rejected once the dispatcher shuts down."""
+        started, release = blocker
+        pool = dispatcher.Dispatcher(workers=1, max_queue=1)
+        pool.submit("bloquear", {"a": 1})
+        assert started.wait(5)
+        pool.submit("suma", {"a": 2})
+        errors = []
+
+        def late_submit():
+            try:
+                pool.submit("suma", {"a": 3}, timeout=5)
+            except RuntimeError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=late_submit)
+        thread.start()
+        pool.shutdown(wait=False)
+        release.set()
+        thread.join(5)
+        assert len(errors) == 1
+
+
+class TestConcurrentUse:
+    """Test cases that hammer one dispatcher from many threads."""
+
+    def test_many_threads(self):
+        """Test that every request from every thread gets its own correct result."""
+        threads = 16
+        per_thread = 200
+        with dispatcher.Dispatcher(workers=8, max_queue=64, timeout=30) as pool:
+            def client(offset):
+                futures = [pool.submit("resta", {"a": offset + n, "b": n}) for n in range(per_thread)]
+                return [future.result(30) for future in futures]
+
+            with concurrent.futures.ThreadPoolExecutor(threads) as clients:
+                results = list(clients.map(client, range(threads)))
+        assert results == [[float(offset)] * per_thread for offset in range(threads)]
+
+    def test_output_lines_not_interleaved(self):
+        """Test that concurrent functions writing to the print sink produce whole lines."""
+        lines = []
+
+        def write(text, **kwargs):
+            lines.append(text)
+
+        previous = sinks.set_sink(sinks.PrintSink())
+        try:
+            with patch('builtins.print', side_effect=write), dispatcher.Dispatcher(workers=8) as pool:
+                futures = [pool.submit("suma", {"a": n}) for n in range(500)]
+                concurrent.futures.wait(futures)
+        finally:
+            sinks.set_sink(previous)
+        assert lines == ["sumando"] * 500
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""
+Test suite for exact.py.
+"""
+
+import decimal
+import fractions
+import time
+
+import pytest
+import exact
+import main
+
+
+class TestTotal:
+    """Test cases for exact sums in each mode."""
+
+    def test_int(self):
+        """Test that integers add exactly, however large."""
+        assert exact.total([2 ** 70, 1, -(2 ** 70)]) == 1
+        assert exact.total([3.0, "2", True], "int") == 6
+        assert exact.total([]) == 0
+
+    def test_int_rejects_fractions(self):
+        """Test that int mode refuses values with a fractional part."""
+        with pytest.raises(ValueError, match="not an integer"):
+            exact.total([1, 3.5], "int")
+
+    def test_decimal(self):
+        """Test that decimal strings add without binary rounding."""
+        assert exact.total(["0.10", "0.20"], "decimal") == decimal.Decimal("0.30")
+        assert exact.total([0.1, 0.2], "decimal") == decimal.Decimal("0.3")
+        assert exact.total(["1e-30", 1], "decimal") == decimal.Decimal("1.000000000000000000000000000001")
+
+    def test_fraction(self):
+        """Test that fractions add exactly."""
+        assert exact.total([fractions.Fraction(1, 3)] * 3) == 1
+        assert exact.total(["1/2", "1/3", 1], "fraction") == fractions.Fraction(11, 6)
+
+    def test_fsum(self):
+        """Test that fsum mode is correctly rounded."""
+        assert exact.total([1e16, 1.0, -1e16]) == 1.0
+        assert exact.total([0.1] * 10) == 1.0
+
+    def test_float(self):
+        """Test that float mode matches the plain float sum."""
+        assert exact.total(["1.5", 2], "float") == 3.5
+
+    def test_auto(self):
+        """Test that auto picks the mode from the types present."""
+        assert type(exact.total([1, 2])) is int
+        assert type(exact.total([1, 2.5])) is float
+        assert type(exact.total([1, decimal.Decimal("2.5")])) is decimal.Decimal
+        assert type(exact.total([decimal.Decimal("2.5"), fractions.Fraction(1, 2)])) is fractions.Fraction
+        assert exact.total(["1", "2"]) == 3
+        assert exact.total(["0.1", "0.2"]) == decimal.Decimal("0.3")
+        assert exact.detect([1, True]) == "int"
+
+    def test_errors(self):
+        """Test unknown modes, unsupported types and bad strings."""
+        with pytest.raises(ValueError, match="Unknown numeric mode"):
+            exact.total([1], "double")
+        with pytest.raises(TypeError, match="Unsupported types"):
+            exact.total([1, None])
+        with pytest.raises(ValueError):
+            exact.total(["abc"], "decimal")
+        with pytest.raises(TypeError):
+            exact.total([fractions.Fraction(1, 3)], "decimal")
+
+
+class TestDiferencia:
+    """Test cases for exact differences."""
+
+    def test_modes(self):
+        """Test the first value minus the rest in each mode."""
+        assert exact.diferencia([2 ** 70, 1, 2]) == 2 ** 70 - 3
+        assert exact.diferencia(["10.00", "0.01"]) == decimal.Decimal("9.99")
+        assert exact.diferencia([fractions.Fraction(1, 2), fractions.Fraction(1, 3)]) == fractions.Fraction(1, 6)
+        assert exact.diferencia([1e16, -1.0, 1e16]) == 1.0
+        assert exact.diferencia(["1", "0.5"], "fsum") == 0.5
+        assert exact.diferencia([5, 1.5], "float") == 3.5
+
+    def test_decimal_not_rounded(self):
+        """Test that decimal differences keep every digit, in decimal mode and for Decimal inputs in auto mode."""
+        first, expected = "12345678901234567890123456789.5", decimal.Decimal("12345678901234567890123456789.25")
+        assert exact.diferencia([first, "0.25"], "decimal") == expected
+        assert exact.diferencia([decimal.Decimal(first), decimal.Decimal("0.25")]) == expected
+        assert main.main(func="resta_exacta", params={"mode": "decimal", "a": first, "b": "0.25"}) == expected
+
+    def test_single_and_empty(self):
+        """Test that one value is returned as is and none is an error."""
+        assert exact.diferencia([7]) == 7
+        with pytest.raises(IndexError, match="at least one number"):
+            exact.diferencia([])
+
+
+class TestDispatch:
+    """Test cases for suma_exacta and resta_exacta through main.main."""
+
+    def test_main(self):
+        """Test that mode is the first parameter and the rest are the values."""
+        assert main.main(func="suma_exacta", params={"mode": "decimal", "a": "0.1", "b": "0.2"}) == decimal.Decimal("0.3")
+        assert main.main(func="exact_sum", params={"mode": "auto", "a": 1, "b": 2 ** 70}) == 2 ** 70 + 1
+        assert main.main(func="resta_exacta", params={"mode": "fraction", "a": "1/2", "b": "1/3"}) == fractions.Fraction(1, 6)
+
+    def test_int_speed(self):
+        """Test that exact integer sums of 10^6 values are not much slower than a float sum."""
+        values = list(range(10 ** 6))
+
+        def best(function):
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        assert best(lambda: exact.total(values)) < 3 * best(lambda: sum(map(float, values)))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
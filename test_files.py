@@ -0,0 +1,130 @@
+"""
+Test suite for files.py.
+"""
+
+import array
+import math
+
+import pytest
+import files
+import main
+from utils import suma, resta
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Force many chunks on small files."""
+    monkeypatch.setattr(files, "CHUNK_SIZE", 64)
+    monkeypatch.setattr(files, "TEXT_CHUNK_SIZE", 64)
+
+
+def write_text(tmp_path, values, name="values.txt"):
+    path = tmp_path / name
+    path.write_text("\n".join(repr(value) for value in values) + "\n")
+    return str(path)
+
+
+def write_binary(tmp_path, values, typecode, name="values.bin"):
+    path = tmp_path / name
+    path.write_bytes(array.array(typecode, values).tobytes())
+    return str(path)
+
+
+class TestSumaFile:
+    """Test cases for suma_file."""
+
+    def test_text(self, backend, small_chunks, tmp_path, values):
+        """Test a newline-delimited text file reduced in chunks."""
+        assert files.suma_file(write_text(tmp_path, values)) == pytest.approx(suma(*values))
+
+    def test_text_without_trailing_newline(self, backend, small_chunks, tmp_path):
+        """Test that the last line does not need a newline."""
+        path = tmp_path / "values.txt"
+        path.write_text("1.5\n2.5\n3")
+        assert files.suma_file(str(path)) == 7.0
+
+    def test_float64(self, backend, small_chunks, tmp_path, values):
+        """Test a raw float64 file."""
+        path = write_binary(tmp_path, values, "d")
+        assert files.suma_file(path, "float64") == pytest.approx(suma(*values))
+
+    def test_int64(self, backend, small_chunks, tmp_path):
+        """Test a raw int64 file."""
+        path = write_binary(tmp_path, range(1000), "q")
+        assert files.suma_file(path, "int64") == 499500.0
+
+    def test_kahan(self, backend, small_chunks, tmp_path):
+        """Test that the accurate method survives cancellation across chunks."""
+        path = write_binary(tmp_path, [1e16, 1.0, -1e16] * 20, "d")
+        assert files.suma_file(path, "float64", "kahan") == math.fsum([1e16, 1.0, -1e16] * 20)
+
+    def test_empty_file(self, backend, tmp_path):
+        """Test that an empty file sums to zero."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert files.suma_file(str(path)) == 0.0
+
+    def test_invalid_value(self, backend, small_chunks, tmp_path):
+        """Test that a bad value reports its position in the file."""
+        path = write_text(tmp_path, list(range(50)) + ["abc"])
+        with pytest.raises(ValueError, match="value 50"):
+            files.suma_file(path)
+
+    def test_truncated_binary(self, backend, tmp_path):
+        """Test that a binary file with a partial value is rejected."""
+        path = tmp_path / "values.bin"
+        path.write_bytes(b"\x00" * 12)
+        with pytest.raises(ValueError):
+            files.suma_file(str(path), "float64")
+
+    def test_unknown_format(self, tmp_path):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError):
+            files.suma_file(write_text(tmp_path, [1.0]), "csv")
+
+
+class TestRestaFile:
+    """Test cases for resta_file."""
+
+    def test_text(self, backend, small_chunks, tmp_path, values):
+        """Test that resta_file matches resta over the same values."""
+        assert files.resta_file(write_text(tmp_path, values)) == pytest.approx(resta(*values))
+
+    def test_float64(self, backend, small_chunks, tmp_path, values):
+        """Test a raw float64 file."""
+        path = write_binary(tmp_path, values, "d")
+        assert files.resta_file(path, "float64") == pytest.approx(resta(*values))
+
+    def test_single_value(self, backend, tmp_path):
+        """Test a file holding one value."""
+        assert files.resta_file(write_text(tmp_path, [4.0])) == 4.0
+
+    def test_empty_file(self, backend, tmp_path):
+        """Test that an empty file has nothing to subtract from."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        with pytest.raises(IndexError):
+            files.resta_file(str(path))
+
+
+class TestMainFileDispatch:
+    """Test cases for file reductions through main.main."""
+
+    def test_main_suma_file(self, tmp_path):
+        """Test suma_file with a path parameter."""
+        path = write_text(tmp_path, [1, 2, 3])
+        assert main.main(func="suma_file", params={"path": path}) == 6.0
+
+    def test_main_resta_file_binary(self, tmp_path):
+        """Test resta_file with format and method parameters."""
+        path = write_binary(tmp_path, [10, 1, 2], "q")
+        params = {"path": path, "format": "int64", "method": "kahan"}
+        assert main.main(func="resta_file", params=params) == 7.0
+
+    def test_main_missing_file(self, tmp_path):
+        """Test that a missing file is reported like any other error."""
+        assert main.main(func="suma_file", params={"path": str(tmp_path / "nope.txt")}) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""
+Test suite for instrument.py and main.get_stats.
+"""
+
+import pytest
+from unittest.mock import patch
+import instrument
+import main
+
+
+@pytest.fixture
+def instrumented():
+    """Enable instrumentation with empty stats for one test."""
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+class TestHistogram:
+    """Test cases for the latency histogram."""
+
+    def test_empty_percentiles(self):
+        """Test that an empty histogram has no percentiles."""
+        assert instrument.Histogram().percentile(0.5) is None
+
+    def test_percentiles(self):
+        """Test percentiles against bucket upper bounds."""
+        histogram = instrument.Histogram()
+        for _ in range(90):
+            histogram.observe(1e-6)
+        for _ in range(10):
+            histogram.observe(1e-3)
+        assert 1e-6 <= histogram.percentile(0.50) < 1.5e-6
+        assert 1e-3 <= histogram.percentile(0.95) < 1.5e-3
+        assert histogram.summary()["count"] == 100
+        assert histogram.summary()["max"] == 1e-3
+
+    def test_overflow_bucket(self):
+        """Test values above the last bound report the maximum seen."""
+        histogram = instrument.Histogram()
+        histogram.observe(1000.0)
+        assert histogram.percentile(0.99) == 1000.0
+
+
+class TestDispatchStats:
+    """Test cases for stats recorded by main.main."""
+
+    def test_disabled_records_nothing(self):
+        """Test that nothing is recorded while instrumentation is off."""
+        instrument.reset()
+        main.main(func="suma", params={"a": 1})
+        assert main.get_stats() == {}
+
+    def test_calls_and_phases(self, instrumented):
+        """Test call counts and phase histograms per function."""
+        for n in range(5):
+            main.main(func="suma", params={"a": n})
+        main.main(func="sum", params={"a": 1})
+        stats = main.get_stats()
+        assert stats["suma"]["calls"] == 6
+        assert stats["suma"]["errors"] == 0
+        assert set(stats["suma"]["phases"]) == {"lookup", "coercion", "execution"}
+        assert stats["suma"]["phases"]["execution"]["count"] == 6
+        assert stats["suma"]["latency"]["p50"] is not None
+
+    def test_errors_counted(self, instrumented):
+        """Test that calls which raise are counted as errors."""
+        main.main(func="resta", params={"a": "abc"})
+        main.main(func="resta", params={"a": 3})
+        stats = main.get_stats()["resta"]
+        assert stats["calls"] == 2
+        assert stats["errors"] == 1
+
+    def test_execution_time_measured(self, instrumented):
+        """Test that execution time reflects the function's own time."""
+        ticks = iter([0.0, 0.001, 0.002, 0.5])
+        with patch.object(instrument, 'record') as mock_record, patch('main.time.perf_counter', lambda: next(ticks)):
+            main.main(func="suma", params={"a": 1})
+        mock_record.assert_called_once_with("suma", 0.001, 0.001, 0.498, False, "python")
+
+    def test_unknown_functions_not_recorded(self, instrumented):
+        """Test that unknown names do not create stats entries."""
+        main.main(func="nope", params={})
+        assert main.get_stats() == {}
+
+
+class TestPrometheus:
+    """Test cases for the Prometheus text dump."""
+
+    def test_dump_prometheus(self, instrumented, tmp_path):
+        """Test the text exposition format written to a file."""
+        main.main(func="suma", params={"a": 1})
+        main.main(func="suma", params={"a": "x"})
+        path = tmp_path / "functions.prom"
+        instrument.dump_prometheus(str(path))
+        text = path.read_text()
+        assert "# TYPE functions_calls_total counter" in text
+        assert 'functions_calls_total{func="suma"} 2' in text
+        assert 'functions_errors_total{func="suma"} 1' in text
+        assert 'functions_latency_seconds_bucket{func="suma",le="+Inf"} 2' in text
+        assert 'functions_phase_seconds_count{func="suma",phase="lookup"} 2' in text
+        assert not (tmp_path / "functions.prom.tmp").exists()
+
+    def test_buckets_are_cumulative(self, instrumented):
+        """Test that bucket counts never decrease."""
+        for n in range(20):
+            main.main(func="suma", params={"a": n})
+        counts = [
+            int(line.rsplit(" ", 1)[1])
+            for line in instrument.prometheus_text().splitlines()
+            if line.startswith('functions_latency_seconds_bucket{func="suma"')
+        ]
+        assert counts == sorted(counts)
+        assert counts[-1] == 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
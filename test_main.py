@@ -7,7 +7,16 @@ from unittest.mock import patch, MagicMock
 from io import StringIO
 import sys
 import main
-import utils
+import registry
+import sinks
+
+
+@pytest.fixture(autouse=True)
+def verbose_output():
+    """Reproduce the interactive CLI output, which these tests inspect."""
+    previous = sinks.verbose()
+    yield
+    sinks.set_sink(previous)
 
 
 class TestMainFunction:
@@ -19,6 +28,12 @@ class TestMainFunction:
         main.main()
         mock_print.assert_called_with("No function provided.")
     
+    @patch('builtins.print')
+    def test_main_function_not_string(self, mock_print):
+        """Test main with a function name that is not a string."""
+        main.main(func=["suma"], params={"var1": 1})
+        mock_print.assert_called_with("Function name should be a string.")
+
     @patch('builtins.print')
     def test_main_function_not_found(self, mock_print):
         """Test main with non-existent function."""
@@ -65,9 +80,10 @@ class TestMainFunction:
     @patch('builtins.print')
     def test_main_with_exception(self, mock_print):
         """Test main when function raises an exception."""
-        # Mock utils.suma to raise an exception
-        with patch.object(utils, 'suma', side_effect=ValueError("Test error")):
-            params = {"var1": "invalid", "var2": "data"}
+        # Mock the registered suma kernel to raise an exception; the params
+        # must bind cleanly, since bad input is now rejected before the call
+        with patch.object(registry.REGISTRY['suma'], 'kernel', side_effect=ValueError("Test error")):
+            params = {"var1": 1, "var2": 2}
             main.main(func="suma", params=params)
             
             calls = [call.args[0] for call in mock_print.call_args_list]
@@ -265,13 +281,83 @@ class TestMainIntegrationWithUtils:
     @patch('builtins.print')
     def test_integration_error_handling_invalid_conversion(self, mock_print):
         """Test error handling when utils function fails."""
-        # Test with invalid data that might cause an error
-        with patch.object(utils, 'suma', side_effect=Exception("Conversion error")):
-            params = {"var1": "abc", "var2": "def"}
-            main.main(func="suma", params=params)
-            
-            calls = [call.args[0] for call in mock_print.call_args_list]
-            assert any("An error occurred: Conversion error" in str(call) for call in calls)
+        main.main(func="suma", params={"var1": "abc"})
+
+        calls = [call.args[0] for call in mock_print.call_args_list]
+        assert any("An error occurred: could not convert string to float: 'abc'" in str(call) for call in calls)
+
+
+class TestRunBatch:
+    """Test cases for the run_batch entry point."""
+
+    def test_results_in_order(self):
+        """Test that results come back in job order across functions."""
+        jobs = [
+            {"func": "suma", "params": {"var1": 1, "var2": 2}},
+            {"func": "mayuscula_a_minuscula", "params": {"var1": "HOLA"}},
+            {"func": "resta", "params": {"var1": 10, "var2": 4}},
+            {"func": "suma", "params": {"var1": "5", "var2": "5"}},
+        ]
+        results = main.run_batch(jobs)
+        assert [result["value"] for result in results] == [3.0, ["hola"], 6.0, 10.0]
+        assert [result["func"] for result in results] == ["suma", "mayuscula_a_minuscula", "resta", "suma"]
+
+    def test_accepts_generator(self):
+        """Test that run_batch accepts any iterable of jobs."""
+        jobs = ({"func": "suma", "params": {"var1": n}} for n in range(3))
+        assert [result["value"] for result in main.run_batch(jobs)] == [0.0, 1.0, 2.0]
+
+    def test_errors_reported_per_job(self):
+        """Test that one failing job does not affect the others in its group."""
+        jobs = [
+            {"func": "suma", "params": {"var1": 1, "var2": 2}},
+            {"func": "suma", "params": {"var1": "abc"}},
+            {"func": "suma", "params": {"var1": 4}},
+        ]
+        results = main.run_batch(jobs)
+        assert results[0] == {"func": "suma", "value": 3.0}
+        assert "could not convert string to float" in results[1]["error"]
+        assert results[2] == {"func": "suma", "value": 4.0}
+
+    def test_invalid_jobs(self):
+        """Test error results for malformed jobs."""
+        results = main.run_batch([
+            "not a job",
+            {"params": {}},
+            {"func": "nonexistent_function"},
+            {"func": "suma", "params": [1, 2]},
+            {"func": "resta", "params": {}},
+            {"func": ["suma"], "params": {}},
+            {"func": {"name": "suma"}},
+            {"func": "suma", "params": {"a": 1}},
+        ])
+        assert results[0]["error"] == "Job should be a dictionary."
+        assert results[1]["error"] == "No function provided."
+        assert results[2]["error"] == "Function 'nonexistent_function' not found in utils module."
+        assert results[3]["error"] == "Params should be a dictionary."
+        assert "error" in results[4]
+        assert results[5]["error"] == "Function name should be a string."
+        assert results[6]["error"] == "Function name should be a string."
+        assert results[7] == {"func": "suma", "value": 1.0}
+
+    def test_aliases_grouped_with_canonical_name(self):
+        """Test that aliases share one batch call with their canonical name."""
+        spec = registry.REGISTRY["suma"]
+        jobs = [{"func": "suma", "params": {"a": 1}}, {"func": "sum", "params": {"a": 2}}]
+        with patch.object(spec, 'batch', wraps=spec.batch) as mock_batch:
+            results = main.run_batch(jobs)
+        mock_batch.assert_called_once_with([(1,), (2,)])
+        assert results == [{"func": "suma", "value": 1.0}, {"func": "sum", "value": 2.0}]
+
+    def test_does_not_print_results(self):
+        """Test that run_batch returns results instead of printing them."""
+        with patch('builtins.print') as mock_print:
+            main.run_batch([{"func": "suma", "params": {"a": 1}}, {"func": "suma", "params": {"a": 2}}])
+        assert not any("Result:" in str(call.args[0]) for call in mock_print.call_args_list)
+
+    def test_empty_batch(self):
+        """Test run_batch with no jobs."""
+        assert main.run_batch([]) == []
 
 
 # Parametrized tests
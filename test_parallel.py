@@ -0,0 +1,92 @@
+"""
+Test suite for parallel.py.
+"""
+
+import pytest
+from unittest.mock import patch
+import main
+import parallel
+import registry
+import utils
+
+
+@pytest.fixture
+def small_pool():
+    """Use a two-worker pool that shards anything with ten or more values."""
+    previous = parallel.threshold()
+    parallel.configure(workers=2, threshold=10)
+    yield
+    parallel.shutdown()
+    parallel.configure(threshold=previous)
+
+
+@pytest.mark.usefixtures("small_pool")
+class TestParallelFunctions:
+    """Test cases for the process-pool variants."""
+
+    def test_suma_matches_serial(self):
+        """Test that parallel suma agrees with utils.suma."""
+        values = [str(n) for n in range(1000)]
+        assert parallel.suma(*values) == utils.suma(*values)
+
+    def test_resta_is_first_minus_rest(self):
+        """Test that parallel resta subtracts the sum of the rest from the first value."""
+        values = [1000] + list(range(100))
+        assert parallel.resta(*values) == 1000.0 - sum(range(100))
+
+    def test_mayuscula_a_minuscula_keeps_order(self):
+        """Test that text shards are recombined in order."""
+        texts = [f"TEXTO {n} ÑANDÚ" for n in range(101)]
+        assert parallel.mayuscula_a_minuscula(*texts) == utils.mayuscula_a_minuscula(*texts)
+
+    def test_small_input_runs_serial(self):
+        """Test that calls below the threshold never touch the pool."""
+        with patch.object(parallel, 'get_executor') as mock_executor:
+            assert parallel.suma(1, 2, 3) == 6.0
+        mock_executor.assert_not_called()
+
+    def test_pool_is_reused(self):
+        """Test that consecutive calls share one executor."""
+        parallel.suma(*range(20))
+        executor = parallel.get_executor()
+        parallel.resta(*range(20))
+        assert parallel.get_executor() is executor
+
+    def test_reconfigure_replaces_pool(self):
+        """Test that changing the worker count replaces the pool."""
+        executor = parallel.get_executor()
+        parallel.configure(workers=3)
+        assert parallel.worker_count() == 3
+        assert parallel.get_executor() is not executor
+
+    def test_worker_error_propagates(self):
+        """Test that a conversion error in a worker reaches the caller."""
+        values = list(range(20)) + ["abc"]
+        with pytest.raises(ValueError):
+            parallel.suma(*values)
+
+    def test_main_parallel(self):
+        """Test the parallel flag on main.main."""
+        assert main.main(func="suma", params={f"v{n}": n for n in range(50)}, parallel=True) == 1225.0
+
+    def test_values_converted_in_workers(self):
+        """Test that the parallel backend receives the values unconverted, and other backends converted."""
+        params = {f"v{n}": str(n) for n in range(50)}
+        spec = registry.REGISTRY["suma"]
+        with patch.object(spec, "parallel", return_value=0.0) as mock_parallel:
+            main.main(func="suma", params=params, parallel=True)
+            main.run_batch([{"func": "suma", "params": params}], parallel=True)
+        assert [call.args for call in mock_parallel.call_args_list] == [tuple(params.values())] * 2
+        with patch.object(spec, "kernel", return_value=0.0) as mock_kernel:
+            main.main(func="suma", params=params)
+        mock_kernel.assert_called_once_with(tuple(float(value) for value in params.values()))
+
+    def test_run_batch_parallel(self):
+        """Test the parallel flag on main.run_batch."""
+        jobs = [{"func": "resta", "params": {f"v{n}": n for n in range(30)}}, {"func": "suma", "params": {"a": 1}}]
+        results = main.run_batch(jobs, parallel=True)
+        assert [result["value"] for result in results] == [-435.0, 1.0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
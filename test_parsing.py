@@ -0,0 +1,115 @@
+"""
+Test suite for parsing.py.
+"""
+
+import array
+import math
+
+import pytest
+import main
+import parsing
+import vectorized
+
+np = pytest.importorskip("numpy")
+
+
+class TestParseFloats:
+    """Test cases for parse_floats."""
+
+    def test_numeric_strings(self, backend):
+        """Test parsing a list of numeric strings."""
+        values, errors = parsing.parse_floats(["1.5", " 2 ", "-3e2", "inf"])
+        assert list(values) == [1.5, 2.0, -300.0, math.inf]
+        assert errors == []
+
+    def test_contiguous_result(self, backend):
+        """Test that the result is a contiguous float64 array."""
+        values, _ = parsing.parse_floats(("1", "2"))
+        if backend == "numpy":
+            assert values.dtype == np.float64 and values.flags.c_contiguous
+        else:
+            assert isinstance(values, array.array) and values.typecode == "d"
+
+    def test_mixed_types(self, backend):
+        """Test parsing numbers, strings and bytes together."""
+        values, errors = parsing.parse_floats([1, "2", 3.5, b"4"])
+        assert list(values) == [1.0, 2.0, 3.5, 4.0]
+        assert errors == []
+
+    def test_errors_reported_per_item(self, backend):
+        """Test that bad items are reported without aborting the batch."""
+        values, errors = parsing.parse_floats(["1", "abc", "3", None])
+        assert [index for index, _, _ in errors] == [1, 3]
+        assert errors[0][1] == "abc"
+        assert isinstance(errors[0][2], ValueError)
+        assert isinstance(errors[1][2], TypeError)
+        assert values[0] == 1.0 and values[2] == 3.0
+        assert math.isnan(values[1]) and math.isnan(values[3])
+
+    def test_errors_across_chunks(self, backend, monkeypatch):
+        """Test error indices in a batch larger than one chunk."""
+        monkeypatch.setattr(parsing, "CHUNK_SIZE", 4)
+        items = [str(n) for n in range(20)]
+        items[13] = "x"
+        values, errors = parsing.parse_floats(items)
+        assert [index for index, _, _ in errors] == [13]
+        assert values[12] == 12.0 and values[14] == 14.0
+
+    def test_generator_input(self, backend):
+        """Test parsing from a generator."""
+        values, _ = parsing.parse_floats(str(n) for n in range(3))
+        assert list(values) == [0.0, 1.0, 2.0]
+
+    def test_empty(self, backend):
+        """Test parsing nothing."""
+        values, errors = parsing.parse_floats([])
+        assert len(values) == 0 and errors == []
+
+
+class TestParseBuffer:
+    """Test cases for parse_buffer."""
+
+    def test_newline_delimited(self, backend):
+        """Test a newline-delimited buffer with a trailing newline."""
+        values, errors = parsing.parse_buffer(b"1\n2.5\n-3\n", b"\n")
+        assert list(values) == [1.0, 2.5, -3.0]
+        assert errors == []
+
+    def test_whitespace_delimited(self, backend):
+        """Test a whitespace-delimited memoryview."""
+        values, _ = parsing.parse_buffer(memoryview(bytearray(b" 1  2\t3 \n")))
+        assert list(values) == [1.0, 2.0, 3.0]
+
+    def test_buffer_errors(self, backend):
+        """Test per-item errors in a delimited buffer."""
+        _, errors = parsing.parse_buffer(b"1,x,3", b",")
+        assert [(index, item) for index, item, _ in errors] == [(1, b"x")]
+
+
+class TestToFloats:
+    """Test cases for to_floats and its use by the array backend."""
+
+    def test_raises_first_error(self):
+        """Test that to_floats raises the first item's error."""
+        with pytest.raises(ValueError, match="could not convert string to float: 'abc'"):
+            parsing.to_floats(["1", "abc", "def"])
+
+    def test_none_is_rejected(self):
+        """Test that None fails like float(None) instead of becoming NaN."""
+        with pytest.raises(TypeError):
+            parsing.to_floats(["1", None])
+
+    def test_batch_kernel_rejects_none(self):
+        """Test that the resta batch kernel does not turn None into NaN."""
+        with pytest.raises(TypeError):
+            vectorized.resta_batch([("1",), (None,)])
+
+    def test_run_batch_reports_none(self):
+        """Test that run_batch reports None as a per-job error."""
+        results = main.run_batch([{"func": "suma", "params": {"a": 1}}, {"func": "suma", "params": {"a": None}}])
+        assert results[0]["value"] == 1.0
+        assert "error" in results[1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,177 @@
+"""
+Test suite for persistent_cache.py.
+"""
+
+import concurrent.futures
+import decimal
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+import cache
+import main
+import persistent_cache
+import registry
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Provide a fresh database path."""
+    return str(tmp_path / "results.db")
+
+
+@pytest.fixture
+def installed(db_path):
+    """Install a persistent cache covering every pure registry function."""
+    store = persistent_cache.PersistentCache(db_path, functions=registry.pure_names())
+    previous = cache.install(store)
+    yield store
+    cache.install(previous)
+    store.close()
+
+
+def hammer(path, worker):
+    """Store and read back values from one process."""
+    store = persistent_cache.PersistentCache(path, maxsize=1000, functions=["suma"])
+    for n in range(100):
+        store.store("suma", (float(n), float(worker)), n + worker)
+        assert store.lookup("suma", (float(n), float(worker))) == n + worker
+    return store.stats()["evictions"]
+
+
+class TestPersistentCache:
+    """Test cases for the SQLite-backed result cache."""
+
+    def test_miss_then_hit(self, db_path):
+        """Test a stored value is found again with the same argument types."""
+        store = persistent_cache.PersistentCache(db_path, functions=["suma"])
+        assert store.lookup("suma", (1.0, 2.0)) is cache.MISSING
+        store.store("suma", (1.0, 2.0), 3.0)
+        assert store.lookup("suma", (1.0, 2.0)) == 3.0
+        assert store.lookup("suma", (1, 2)) is cache.MISSING
+        assert store.stats()["hits"] == 1
+        assert store.stats()["misses"] == 2
+
+    def test_survives_restart(self, db_path):
+        """Test that a new cache on the same file sees earlier results."""
+        persistent_cache.PersistentCache(db_path).store("mayuscula_a_minuscula", ("ÑANDÚ",), ["ñandú"])
+        reopened = persistent_cache.PersistentCache(db_path)
+        assert reopened.lookup("mayuscula_a_minuscula", ("ÑANDÚ",)) == ["ñandú"]
+
+    def test_lists_are_copies(self, db_path):
+        """Test that callers cannot modify a cached list."""
+        store = persistent_cache.PersistentCache(db_path)
+        store.store("mayuscula_a_minuscula", ("A",), ["a"])
+        store.lookup("mayuscula_a_minuscula", ("A",)).append("x")
+        assert store.lookup("mayuscula_a_minuscula", ("A",)) == ["a"]
+
+    def test_eviction_bound(self, db_path, monkeypatch):
+        """Test that the oldest entries are evicted beyond maxsize."""
+        monkeypatch.setattr(persistent_cache, "EVICT_EVERY", 1)
+        clock = iter(range(1000))
+        store = persistent_cache.PersistentCache(db_path, maxsize=3, clock=lambda: next(clock))
+        for n in range(5):
+            store.store("suma", (float(n),), float(n))
+        assert store.stats()["size"] == 3
+        assert store.stats()["evictions"] == 2
+        assert store.lookup("suma", (0.0,)) is cache.MISSING
+        assert store.lookup("suma", (4.0,)) == 4.0
+
+    def test_unpicklable_values_skipped(self, db_path):
+        """Test that values that cannot be stored are silently not cached."""
+        store = persistent_cache.PersistentCache(db_path)
+        store.store("suma", (1.0,), (n for n in range(3)))
+        assert store.lookup("suma", (1.0,)) is cache.MISSING
+
+    def test_code_change_invalidates(self, db_path, tmp_path, monkeypatch):
+        """Test that editing a function's module invalidates its entries."""
+        module = tmp_path / "plugin_doble.py"
+        module.write_text("def doble(x):\n    return x * 2\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        with patch.dict(registry.REGISTRY):
+            registry.register("doble", "plugin_doble:doble", coercer=float, pure=True)
+            persistent_cache.PersistentCache(db_path).store("doble", (2.0,), 4.0)
+            assert persistent_cache.PersistentCache(db_path).lookup("doble", (2.0,)) == 4.0
+            module.write_text("def doble(x):\n    return x + x\n")
+            assert persistent_cache.PersistentCache(db_path).lookup("doble", (2.0,)) is cache.MISSING
+
+    def test_keys_by_value(self, db_path):
+        """Test that keys depend on argument values and types, not on object identity."""
+        store = persistent_cache.PersistentCache(db_path)
+        text = "".join(["A", "BC"])
+        store.store("mayuscula_a_minuscula", (text, text), ["abc", "abc"])
+        assert store.lookup("mayuscula_a_minuscula", ("ABC", "".join(["AB", "C"]))) == ["abc", "abc"]
+        store.store("suma_exacta", ("decimal", decimal.Decimal("1.0")), decimal.Decimal("1.0"))
+        assert store.lookup("suma_exacta", ("decimal", decimal.Decimal("1.00"))) is cache.MISSING
+        store.store("suma", (0.0,), 0.0)
+        assert store.lookup("suma", (-0.0,)) is cache.MISSING
+        assert store.stats()["size"] == 3
+
+    def test_imported_module_change_invalidates(self, db_path, tmp_path, monkeypatch):
+        """Test that editing a project module imported by a function's module invalidates its entries."""
+        (tmp_path / "plugin_ayuda.py").write_text("FACTOR = 2\n")
+        (tmp_path / "plugin_escala.py").write_text(
+            "def escala(x):\n    import plugin_ayuda\n    return x * plugin_ayuda.FACTOR\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        with patch.dict(registry.REGISTRY):
+            registry.register("escala", "plugin_escala:escala", coercer=float, pure=True)
+            persistent_cache.PersistentCache(db_path).store("escala", (2.0,), 4.0)
+            assert persistent_cache.PersistentCache(db_path).lookup("escala", (2.0,)) == 4.0
+            (tmp_path / "plugin_ayuda.py").write_text("FACTOR = 3\n")
+            assert persistent_cache.PersistentCache(db_path).lookup("escala", (2.0,)) is cache.MISSING
+
+    def test_memoize(self, db_path):
+        """Test memoize with a function that is not in the registry."""
+        calls = []
+
+        def triple(x):
+            calls.append(x)
+            return x * 3
+
+        store = persistent_cache.PersistentCache(db_path, functions=["triple"])
+        wrapped = cache.memoize(triple, cache=store)
+        assert wrapped(2) == 6
+        assert wrapped(2) == 6
+        assert calls == [2]
+
+    def test_processes_share_file(self, db_path):
+        """Test concurrent writers and readers in several processes."""
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(4, mp_context=context) as pool:
+            list(pool.map(hammer, [db_path] * 4, range(4)))
+        store = persistent_cache.PersistentCache(db_path)
+        assert store.stats()["size"] == 400
+        assert store.lookup("suma", (99.0, 3.0)) == 102
+
+
+class TestWarmRestart:
+    """Test cases for main.main backed by the persistent cache."""
+
+    def test_main_uses_cache(self, installed):
+        """Test that a repeated call is answered without running the function."""
+        assert main.main(func="suma", params={"a": 1, "b": 2}) == 3.0
+        with patch.object(registry.REGISTRY["suma"], "kernel", side_effect=AssertionError("recomputed")):
+            assert main.main(func="suma", params={"a": 1, "b": 2}) == 3.0
+        assert installed.stats()["hits"] == 1
+
+    def test_cli_flag(self, db_path):
+        """Test that --cache-db serves a second process from the first one's results."""
+        command = [sys.executable, "main.py", "--cache-db", db_path]
+        runs = [
+            subprocess.run(
+                command, input="suma\n1\n2\nexit\n", capture_output=True, text=True, check=True,
+                cwd=os.path.dirname(main.__file__) or ".",
+            ).stdout
+            for _ in range(2)
+        ]
+        assert "sumando" in runs[0]
+        assert "sumando" not in runs[1]
+        assert "Result: 3.0" in runs[1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
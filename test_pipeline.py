@@ -0,0 +1,205 @@
+"""
+Test suite for pipeline.py.
+"""
+
+import decimal
+import threading
+
+import pytest
+from unittest.mock import patch
+import cache
+import pipeline
+import registry
+
+
+@pytest.fixture
+def counted():
+    """Register a pure function that counts its calls."""
+    calls = []
+
+    def doble(value):
+        calls.append(value)
+        return value * 2
+
+    with patch.dict(registry.REGISTRY):
+        registry.register("doble", doble, arity=(1, 1), coercer=float, pure=True)
+        yield calls
+
+
+class TestReferences:
+    """Test cases for passing results between steps."""
+
+    def test_chain(self):
+        """Test that a step receives an earlier result in memory."""
+        steps = [
+            {"func": "suma", "params": {"a": "1", "b": 2}},
+            {"func": "resta", "params": {"a": 10, "b": "$0"}},
+            {"func": "resta", "params": {"a": "$1", "b": "$0"}},
+        ]
+        assert pipeline.run_pipeline(steps) == [
+            {"func": "suma", "value": 3.0},
+            {"func": "resta", "value": 7.0},
+            {"func": "resta", "value": 4.0},
+        ]
+
+    def test_reference_inside_list(self):
+        """Test references nested in a list parameter."""
+        steps = [
+            {"func": "suma", "params": {"a": 1}},
+            {"func": "suma", "params": {"a": 2}},
+            {"func": "suma_array", "params": {"data": ["$0", "$1", 3]}},
+        ]
+        assert pipeline.run_pipeline(steps)[2] == {"func": "suma_array", "value": 6.0}
+
+    def test_list_result_passed_whole(self):
+        """Test that a list result is passed as one value."""
+        steps = [
+            {"func": "lower", "params": {"a": "HOLA", "b": "MUNDO"}},
+            {"func": "mayuscula_a_minuscula_bulk", "params": {"texts": "$0", "output": "joined", "sep": " "}},
+        ]
+        assert pipeline.run_pipeline(steps)[1]["value"] == "hola mundo"
+
+    def test_escaped_dollar(self):
+        """Test that "$$" passes a literal string starting with "$"."""
+        steps = [{"func": "lower", "params": {"a": "$$0", "b": "$X"}}]
+        assert pipeline.run_pipeline(steps) == [{"func": "lower", "value": ["$0", "$x"]}]
+
+    def test_forward_reference(self):
+        """Test that a step cannot refer to itself or a later step."""
+        steps = [{"func": "suma", "params": {"a": "$0"}}]
+        assert pipeline.run_pipeline(steps) == [
+            {"func": "suma", "error": "Step 0 refers to step 0, which does not run before it."}
+        ]
+
+
+class TestErrors:
+    """Test cases for failing steps."""
+
+    def test_invalid_steps(self):
+        """Test the same per-step errors as run_batch."""
+        results = pipeline.run_pipeline([[1], {"params": {}}, {"func": "nope"}, {"func": "suma", "params": [1]}, {"func": ["suma"]}])
+        assert [result["error"] for result in results] == [
+            "Step should be a dictionary.",
+            "No function provided.",
+            "Function 'nope' not found in utils module.",
+            "Params should be a dictionary.",
+            "Function name should be a string.",
+        ]
+
+    def test_failure_propagates(self):
+        """Test that dependents of a failed step fail without running, and others still run."""
+        steps = [
+            {"func": "suma", "params": {"a": "abc"}},
+            {"func": "resta", "params": {"a": "$0"}},
+            {"func": "suma", "params": {"a": "$1"}},
+            {"func": "suma", "params": {"a": 5}},
+        ]
+        results = pipeline.run_pipeline(steps)
+        assert "could not convert string to float" in results[0]["error"]
+        assert results[1]["error"] == "Step 1 depends on step 0, which failed."
+        assert results[2]["error"] == "Step 2 depends on step 1, which failed."
+        assert results[3] == {"func": "suma", "value": 5.0}
+
+    def test_reference_to_invalid_step(self):
+        """Test a reference to a step that failed before running."""
+        steps = [{"func": "nope"}, {"func": "suma", "params": {"a": "$0"}}]
+        assert pipeline.run_pipeline(steps)[1]["error"] == "Step 1 depends on step 0, which failed."
+
+
+class TestCommonSubexpressions:
+    """Test cases for deduplicating repeated steps."""
+
+    def test_repeated_step_runs_once(self, counted):
+        """Test that the same pure call runs once and every copy gets the result."""
+        steps = [
+            {"func": "doble", "params": {"a": 2}},
+            {"func": "doble", "params": {"a": 2}},
+            {"func": "suma", "params": {"a": "$0", "b": "$1"}},
+        ]
+        assert pipeline.run_pipeline(steps) == [
+            {"func": "doble", "value": 4.0},
+            {"func": "doble", "value": 4.0},
+            {"func": "suma", "value": 8.0},
+        ]
+        assert counted == [2.0]
+
+    def test_aliases_share_work(self):
+        """Test that an alias is the same sub-expression as its function."""
+        steps = [{"func": "suma", "params": {"a": 1}}, {"func": "sum", "params": {"a": 1}}]
+        assert pipeline.run_pipeline(steps) == [{"func": "suma", "value": 1.0}, {"func": "sum", "value": 1.0}]
+
+    def test_duplicates_through_references(self, counted):
+        """Test that steps over duplicated inputs are duplicates too."""
+        steps = [
+            {"func": "doble", "params": {"a": 1}},
+            {"func": "doble", "params": {"a": 1}},
+            {"func": "doble", "params": {"a": "$0"}},
+            {"func": "doble", "params": {"a": "$1"}},
+        ]
+        assert [result["value"] for result in pipeline.run_pipeline(steps)] == [2.0, 2.0, 4.0, 4.0]
+        assert counted == [1.0, 2.0]
+
+    def test_types_kept_apart(self, counted):
+        """Test that 1 and "1" are not treated as the same input."""
+        steps = [{"func": "doble", "params": {"a": 1}}, {"func": "doble", "params": {"a": "1"}}]
+        pipeline.run_pipeline(steps)
+        assert len(counted) == 2
+
+    def test_decimal_exponents_kept_apart(self):
+        """Test that equal Decimals with different exponents are not treated as the same input."""
+        steps = [
+            {"func": "suma_exacta", "params": {"mode": "decimal", "a": decimal.Decimal("1.0")}},
+            {"func": "suma_exacta", "params": {"mode": "decimal", "a": decimal.Decimal("1.000")}},
+        ]
+        assert [str(result["value"]) for result in pipeline.run_pipeline(steps)] == ["1.0", "1.000"]
+
+    def test_impure_steps_not_deduplicated(self):
+        """Test that functions not marked pure always run."""
+        calls = []
+        with patch.dict(registry.REGISTRY):
+            registry.register("anotar", lambda value: calls.append(value), arity=(1, 1))
+            pipeline.run_pipeline([{"func": "anotar", "params": {"a": 1}}] * 2)
+        assert calls == [1, 1]
+
+    def test_uses_result_cache(self):
+        """Test that pipeline steps go through the result cache when one is installed."""
+        previous = cache.active()
+        store = cache.configure(functions=["suma"])
+        try:
+            pipeline.run_pipeline([{"func": "suma", "params": {"a": 1}}])
+            pipeline.run_pipeline([{"func": "suma", "params": {"a": 1}}])
+            assert store.stats()["hits"] == 1
+        finally:
+            cache.install(previous)
+
+
+class TestConcurrency:
+    """Test cases for running independent steps concurrently."""
+
+    def test_independent_steps_overlap(self):
+        """Test that two independent steps run at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def esperar(value):
+            barrier.wait()
+            return value
+
+        with patch.dict(registry.REGISTRY):
+            registry.register("esperar", esperar, arity=(1, 1))
+            steps = [
+                {"func": "esperar", "params": {"a": 1}},
+                {"func": "esperar", "params": {"a": 2}},
+                {"func": "suma", "params": {"a": "$0", "b": "$1"}},
+            ]
+            assert pipeline.run_pipeline(steps)[2] == {"func": "suma", "value": 3.0}
+
+    def test_single_chain_runs_inline(self):
+        """Test that a chain with nothing to overlap does not use the executor."""
+        steps = [{"func": "suma", "params": {"a": 1}}, {"func": "suma", "params": {"a": "$0"}}]
+        with patch.object(pipeline, "get_executor") as mock_get_executor:
+            assert pipeline.run_pipeline(steps)[1] == {"func": "suma", "value": 1.0}
+        mock_get_executor.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,211 @@
+"""
+Test suite for planner.py.
+"""
+
+import array
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+import cache
+import instrument
+import main
+import parallel
+import planner
+import registry
+from utils import suma, resta
+
+
+@pytest.fixture(autouse=True)
+def default_costs(tmp_path, monkeypatch):
+    """Plan with the built-in costs, reading and writing a config file in a temporary directory."""
+    monkeypatch.setenv(planner.CONFIG_ENV, str(tmp_path / "planner.json"))
+    monkeypatch.setattr(planner, "_costs", None)
+    monkeypatch.setattr(planner, "_floors", {})
+    yield
+    planner._costs = None
+
+
+def buffer(size):
+    """Provide a float64 buffer of size values."""
+    return memoryview(array.array("d", [n * 0.5 for n in range(size)]))
+
+
+def cheap_parallel(name="mayuscula_a_minuscula"):
+    """Costs under which the process pool wins for any large call of name."""
+    return {name: {"values": {"python": (0.0, 1e-8), "parallel": (1e-6, 1e-9)}}}
+
+
+class TestChoose:
+    """Test cases for picking a backend."""
+
+    def test_tiny_calls_use_python(self):
+        """Test that small calls never pay for NumPy or the pool."""
+        spec = registry.get("suma")
+        assert planner.choose(spec, (1.0, 2.0)) == "python"
+        assert planner.choose(spec, buffer(4)) == "python"
+
+    def test_large_buffer_vectorized(self):
+        """Test that a large float64 buffer is reduced with NumPy when it is installed."""
+        pytest.importorskip("numpy")
+        assert planner.choose(registry.get("resta"), buffer(100_000)) == "vectorized"
+        # Replaying sum()'s corrections makes NumPy slower than Python for suma from 3.12 on.
+        expected = "python" if sys.version_info >= (3, 12) else "vectorized"
+        assert planner.choose(registry.get("suma"), buffer(100_000)) == expected
+
+    def test_without_numpy(self, monkeypatch):
+        """Test that the vectorized backend is not planned without NumPy."""
+        monkeypatch.setattr(planner, "_numpy", False)
+        assert planner.choose(registry.get("resta"), buffer(100_000)) == "python"
+
+    def test_tuples_stay_python(self):
+        """Test that a tuple of floats is summed in Python whatever its size."""
+        assert planner.choose(registry.get("suma"), tuple(range(1_000_000))) == "python"
+
+    def test_parallel_flag(self):
+        """Test that an explicit parallel request still wins."""
+        assert planner.choose(registry.get("suma"), (1.0,), parallel=True) == "parallel"
+        assert planner.choose(registry.get("suma_stream"), (1.0,), parallel=True) == "python"
+
+    def test_parallel_by_cost(self, monkeypatch):
+        """Test that the pool is planned when it is cheaper and the call reaches its threshold."""
+        planner.configure(cheap_parallel())
+        monkeypatch.setattr(parallel, "_threshold", 1000)
+        spec = registry.get("lower")
+        assert planner.choose(spec, ("A",) * 2000) == "parallel"
+        assert planner.choose(spec, ("A",) * 500) == "python"
+
+    def test_sums_not_parallel_by_cost(self, monkeypatch):
+        """Test that suma and resta only use the pool when asked, since its shard totals round differently."""
+        planner.configure({**cheap_parallel("suma"), **cheap_parallel("resta")})
+        monkeypatch.setattr(parallel, "_threshold", 1000)
+        assert planner.choose(registry.get("suma"), tuple(range(2000))) == "python"
+        assert planner.choose(registry.get("resta"), tuple(range(2000))) == "python"
+        values = [1e16] + [1.0] * 2000
+        params = {f"v{n}": value for n, value in enumerate(values)}
+        assert main.main(func="resta", params=params) == resta(*values)
+        assert main.main(func="suma", params=params) == suma(*values)
+
+    def test_unplanned_function(self):
+        """Test functions without costs."""
+        assert planner.choose(registry.get("suma_array"), (buffer(100_000),)) == "python"
+
+
+class TestBufferArgument:
+    """Test cases for recognising a lone float64 buffer."""
+
+    def test_accepted(self):
+        """Test array.array, memoryview and NumPy inputs."""
+        spec = registry.get("suma")
+        assert planner.buffer_argument(spec, {"data": array.array("d", [1.0])}).tolist() == [1.0]
+        assert planner.buffer_argument(spec, {"data": buffer(3)}).format == "d"
+        np = pytest.importorskip("numpy")
+        assert planner.buffer_argument(spec, {"data": np.arange(3.0)}).tolist() == [0.0, 1.0, 2.0]
+
+    def test_rejected(self):
+        """Test inputs that are bound as usual."""
+        spec = registry.get("suma")
+        assert planner.buffer_argument(spec, {"a": 1.0}) is None
+        assert planner.buffer_argument(spec, {"a": buffer(2), "b": 1.0}) is None
+        assert planner.buffer_argument(spec, {"data": array.array("q", [1])}) is None
+        assert planner.buffer_argument(spec, {"data": b"12345678"}) is None
+        assert planner.buffer_argument(registry.get("lower"), {"data": buffer(2)}) is None
+        assert planner.buffer_argument(registry.get("suma_array"), {"data": buffer(2)}) is None
+
+
+class TestMain:
+    """Test cases for planned calls through main.main."""
+
+    def test_buffer_results(self):
+        """Test that buffers give exactly the results of the variadic call."""
+        rng = random.Random(7)
+        values = [rng.uniform(-1e6, 1e6) for _ in range(100_000)] + [1e16, 1.0, -1e16]
+        data = array.array("d", values)
+        assert main.main(func="suma", params={"data": data}) == suma(*values)
+        assert main.main(func="resta", params={"data": data}) == resta(*values)
+        assert main.main(func="suma", params={"data": array.array("d")}) == 0.0
+
+    def test_backend_in_stats(self):
+        """Test that the chosen backend is counted in the call's stats."""
+        pytest.importorskip("numpy")
+        instrument.reset()
+        instrument.enable()
+        try:
+            main.main(func="resta", params={"a": 1, "b": 2})
+            main.main(func="resta", params={"data": buffer(100_000)})
+        finally:
+            instrument.disable()
+        assert main.get_stats()["resta"]["backends"] == {"python": 1, "vectorized": 1}
+        assert 'functions_backend_calls_total{func="resta",backend="vectorized"} 1' in instrument.prometheus_text()
+        instrument.reset()
+
+    def test_parallel_runs(self, monkeypatch):
+        """Test that a planned parallel call goes to the parallel implementation."""
+        planner.configure(cheap_parallel())
+        monkeypatch.setattr(parallel, "_threshold", 10)
+        spec = registry.REGISTRY["mayuscula_a_minuscula"]
+        with patch.object(spec, "parallel", return_value=["a"]) as mock_parallel:
+            assert main.main(func="lower", params={f"v{n}": "A" for n in range(200)}) == ["a"]
+        assert mock_parallel.call_count == 1
+
+    def test_buffers_not_cached(self):
+        """Test that buffer calls bypass the result cache."""
+        store = cache.ResultCache(functions=["suma"])
+        previous = cache.install(store)
+        try:
+            main.main(func="suma", params={"data": buffer(10)})
+            main.main(func="suma", params={"data": buffer(10)})
+        finally:
+            cache.install(previous)
+        assert store.stats()["misses"] == 0
+
+
+class TestConfig:
+    """Test cases for calibration and the config file."""
+
+    def test_defaults_without_file(self):
+        """Test that a missing config file keeps the built-in costs."""
+        assert planner.load() == planner.DEFAULT_COSTS
+
+    def test_saved_costs_override(self, tmp_path):
+        """Test that saved costs replace the defaults for their function only."""
+        planner.save(costs=cheap_parallel("suma"))
+        with open(tmp_path / "planner.json") as config:
+            assert json.load(config)["costs"]["suma"]["values"]["parallel"] == [1e-6, 1e-9]
+        costs = planner.load()
+        assert costs["suma"]["values"]["parallel"] == (1e-6, 1e-9)
+        assert "buffer" in costs["suma"]
+        assert costs["resta"] == planner.DEFAULT_COSTS["resta"]
+
+    def test_thresholds(self):
+        """Test the size from which Python stops being the cheapest."""
+        assert planner.thresholds(cheap_parallel("suma")) == {("suma", "values"): 112}
+        assert planner.thresholds()[("suma", "values")] is None
+        assert planner.thresholds()[("resta", "buffer")] > 0
+
+    def test_calibrate(self):
+        """Test that calibration fits a cost line for every available backend."""
+        costs = planner.calibrate(["suma"], sizes=(16, 1024), repeat=1, backends=("python", "vectorized"))
+        lines = costs["suma"]["values"]
+        assert set(lines) <= {"python", "vectorized"} and "python" in lines
+        assert all(fixed >= 0 and per_item >= 0 for fixed, per_item in lines.values())
+        assert "buffer" in costs["suma"]
+
+    def test_cli(self, tmp_path):
+        """Test main.py --calibrate writes the config file."""
+        path = tmp_path / "calibrated.json"
+        process = subprocess.run(
+            [sys.executable, "main.py", "--calibrate"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(main.__file__) or ".", env={**os.environ, planner.CONFIG_ENV: str(path)},
+        )
+        assert f"Saved to {path}" in process.stdout
+        with open(path) as config:
+            assert set(json.load(config)["costs"]) == set(planner.DEFAULT_COSTS)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,286 @@
+"""
+Test suite for registry.py.
+"""
+
+import json
+import operator
+import subprocess
+import sys
+from importlib import metadata
+
+import pytest
+from unittest.mock import patch
+import main
+import registry
+import sinks
+import utils
+
+
+@pytest.fixture
+def verbose_output():
+    """Install the verbose sink so main reports through print."""
+    previous = sinks.verbose()
+    yield
+    sinks.set_sink(previous)
+
+
+class TestRegistry:
+    """Test cases for the function registry."""
+
+    def test_builtin_functions_registered(self):
+        """Test that every utils function is registered under its own name."""
+        assert registry.REGISTRY["suma"].function is utils.suma
+        assert registry.REGISTRY["resta"].function is utils.resta
+        assert registry.REGISTRY["mayuscula_a_minuscula"].function is utils.mayuscula_a_minuscula
+
+    def test_aliases_share_spec(self):
+        """Test that aliases resolve to the same spec as the canonical name."""
+        assert registry.REGISTRY["sum"] is registry.REGISTRY["suma"]
+        assert registry.REGISTRY["subtract"] is registry.REGISTRY["resta"]
+        assert registry.REGISTRY["lower"] is registry.REGISTRY["mayuscula_a_minuscula"]
+
+    def test_metadata(self):
+        """Test arity, coercer and return kind metadata."""
+        spec = registry.REGISTRY["resta"]
+        assert spec.arity == (1, None)
+        assert spec.coercer is float
+        assert spec.returns is float
+
+    def test_module_imports_not_exposed(self):
+        """Test that module-level names other than functions are not dispatchable."""
+        assert "utils" not in registry.REGISTRY
+        assert "__name__" not in registry.REGISTRY
+
+    def test_resolve_unknown(self):
+        """Test that resolving an unknown name raises LookupError."""
+        with pytest.raises(LookupError, match="Function 'nope' not found in utils module."):
+            registry.resolve("nope")
+
+    def test_names(self):
+        """Test that names lists canonical names only."""
+        assert registry.names() == [
+            "acumulador_agregar", "acumulador_cerrar", "acumulador_combinar", "acumulador_crear",
+            "acumulador_quitar", "acumulador_valor",
+            "mayuscula_a_minuscula", "mayuscula_a_minuscula_bulk", "mayuscula_a_minuscula_stream",
+            "resta", "resta_array", "resta_exacta", "resta_file", "resta_stream",
+            "suma", "suma_array", "suma_exacta", "suma_file", "suma_stream",
+        ]
+
+    def test_register_duplicate(self):
+        """Test that registering a taken name or alias is rejected."""
+        with pytest.raises(ValueError):
+            registry.register("nuevo", utils.suma, aliases=("sum",))
+        assert "nuevo" not in registry.REGISTRY
+
+    def test_register_new_function(self):
+        """Test that a registered function is dispatchable through main."""
+        with patch.dict(registry.REGISTRY):
+            registry.register("doble", lambda x: float(x) * 2)
+            with patch('builtins.print'):
+                assert main.main(func="doble", params={"x": "4"}) == 8.0
+
+
+class TestBinding:
+    """Test cases for compiled parameter binding."""
+
+    def test_floats_pass_through_untouched(self):
+        """Test that already-float arguments skip coercion."""
+        params = {"a": 1.5, "b": 2.5}
+        bound = registry.REGISTRY["suma"].bind(params)
+        assert bound == (1.5, 2.5)
+        assert all(value is original for value, original in zip(bound, params.values()))
+
+    def test_mixed_inputs_coerced_once(self):
+        """Test that mixed inputs are coerced to the declared type."""
+        assert registry.REGISTRY["suma"].bind({"a": 1, "b": "2", "c": 3.0}) == (1.0, 2.0, 3.0)
+        assert registry.REGISTRY["mayuscula_a_minuscula"].bind({"a": 1, "b": None}) == ("1", "None")
+
+    def test_bad_input_rejected_before_call(self):
+        """Test that a bad value fails binding and the kernel never runs."""
+        spec = registry.REGISTRY["suma"]
+        with patch.object(spec, 'kernel') as mock_kernel, patch('builtins.print'):
+            assert main.main(func="suma", params={"a": 1, "b": "abc"}) is None
+        mock_kernel.assert_not_called()
+
+    def test_arity_checked(self):
+        """Test that too few or too many arguments are rejected."""
+        with pytest.raises(TypeError, match="at least 1 argument"):
+            registry.REGISTRY["resta"].bind({})
+        with pytest.raises(TypeError, match="at most 2 argument"):
+            registry.REGISTRY["suma_array"].bind({"a": 1, "b": 2, "c": 3})
+
+    def test_keyword_binding(self):
+        """Test that declared parameter names bind by name, in any order."""
+        spec = registry.REGISTRY["suma_array"]
+        data = [1, 2]
+        assert spec.bind({"method": "kahan", "data": data}) == (data, "kahan")
+        assert spec.bind({"data": data}) == (data,)
+
+    def test_keyword_binding_missing_argument(self):
+        """Test that skipping a leading named parameter is rejected."""
+        with pytest.raises(TypeError, match="missing argument 'data'"):
+            registry.REGISTRY["suma_array"].bind({"method": "kahan"})
+
+    def test_skipped_optional_parameter_uses_default(self, tmp_path):
+        """Test that an optional named parameter can be skipped and takes the function's default."""
+        assert registry.REGISTRY["suma_file"].bind({"path": "x", "method": "kahan"}) == ("x", "text", "kahan")
+        path = tmp_path / "values.txt"
+        path.write_text("1 2 3.5\n")
+        assert main.main(func="suma_file", params={"path": str(path), "method": "kahan"}) == 6.5
+        params = {"texts": ["A", "B"], "sep": ","}
+        assert main.main(func="mayuscula_a_minuscula_bulk", params=params) == ["a", "b"]
+        assert main.main(func="mayuscula_a_minuscula_bulk", params={**params, "output": "joined"}) == "a,b"
+
+    def test_skipped_parameter_without_default(self):
+        """Test that a skipped parameter the function has no default for is still missing."""
+        binder = registry.compile_binder("f", (0, 2), (("a", None), ("b", None)), defaults=lambda: {})
+        with pytest.raises(TypeError, match="missing argument 'a'"):
+            binder({"b": 1})
+
+    def test_positional_binding_for_unknown_names(self):
+        """Test that unknown key names bind positionally, as before."""
+        data = [1, 2]
+        assert registry.REGISTRY["suma_array"].bind({"var1": data, "var2": "kahan"}) == (data, "kahan")
+
+    def test_fixed_parameter_coerced(self):
+        """Test that declared fixed parameter types are applied."""
+        binder = registry.compile_binder("f", (1, None), (("count", int),), float)
+        assert binder({"count": "3"}) == (3,)
+        assert binder({"a": "3", "b": "1.5", "c": 2}) == (3, 1.5, 2.0)
+
+    def test_kernel_receives_bound_tuple(self):
+        """Test that main hands the coerced tuple straight to the kernel."""
+        spec = registry.REGISTRY["resta"]
+        with patch.object(spec, 'kernel', wraps=spec.kernel) as mock_kernel:
+            assert main.main(func="resta", params={"a": "10", "b": 4}) == 6.0
+        mock_kernel.assert_called_once_with((10.0, 4.0))
+
+
+@pytest.mark.usefixtures("verbose_output")
+class TestMainDispatch:
+    """Test cases for main dispatch through the registry."""
+
+    @patch('builtins.print')
+    def test_main_dispatches_alias(self, mock_print):
+        """Test that main accepts aliases."""
+        main.main(func="sum", params={"var1": 1, "var2": 2})
+        mock_print.assert_called_with("Result: 3.0")
+
+    @patch('builtins.print')
+    def test_main_returns_result(self, mock_print):
+        """Test that main returns the result as well as printing it."""
+        assert main.main(func="resta", params={"var1": 10, "var2": 4}) == 6.0
+
+    @patch('builtins.print')
+    def test_main_rejects_module_attribute(self, mock_print):
+        """Test that non-function module attributes are not dispatchable."""
+        main.main(func="__doc__", params={})
+        mock_print.assert_called_with("Function '__doc__' not found in utils module.")
+
+
+@pytest.fixture
+def undiscovered(monkeypatch):
+    """Let discovery run again with the registry restored afterwards."""
+    monkeypatch.setattr(registry, "_discovered", False)
+    monkeypatch.delenv(registry.MANIFEST_ENV, raising=False)
+    with patch.dict(registry.REGISTRY):
+        yield
+
+
+class TestLazyLoading:
+    """Test cases for lazily imported functions, manifests and entry points."""
+
+    def test_startup_imports_no_implementation(self):
+        """Test that importing main does not import any function module."""
+        modules = ("utils", "vectorized", "parallel", "files", "text", "numpy", "asyncio")
+        code = f"import main, sys; print([m for m in {modules!r} if m in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == "[]"
+
+    def test_reference_loaded_on_first_access(self):
+        """Test that a "module:attr" reference is imported when first used and then kept."""
+        with patch.dict(registry.REGISTRY):
+            spec = registry.register("sumar_dos", "operator:add", arity=(2, 2), coercer=float)
+            assert spec._function == "operator:add"
+            assert main.main(func="sumar_dos", params={"a": "1", "b": 2}) == 3.0
+            assert spec._function is operator.add
+
+    def test_load_attribute_path(self):
+        """Test references to nested attributes."""
+        assert registry.load("os:path.join") is __import__("os").path.join
+
+    def test_bad_reference_reported_on_call(self, verbose_output):
+        """Test that a broken reference only fails when the function is called."""
+        with patch.dict(registry.REGISTRY):
+            registry.register("roto", "no_such_module:roto")
+            with patch('builtins.print') as mock_print:
+                assert main.main(func="roto", params={}) is None
+            assert "An error occurred" in mock_print.call_args[0][0]
+
+    def test_load_manifest(self, undiscovered, tmp_path):
+        """Test registering functions from a JSON manifest."""
+        manifest = tmp_path / "functions.json"
+        manifest.write_text(json.dumps({"functions": [
+            {"name": "negar", "function": "operator:neg", "arity": [1, 1], "coercer": "float", "returns": "float",
+             "aliases": ["neg"]},
+            {"name": "potencia", "function": "math:pow", "arity": [2, 2], "params": [["x", "float"], ["y", "float"]]},
+        ]}))
+        specs = registry.load_manifest(str(manifest))
+        assert [spec.name for spec in specs] == ["negar", "potencia"]
+        assert main.main(func="neg", params={"a": "3"}) == -3.0
+        assert main.main(func="potencia", params={"x": "2", "y": 3}) == 8.0
+
+    def test_manifest_from_environment(self, undiscovered, monkeypatch, tmp_path):
+        """Test that manifests named in the environment are read on the first unknown name."""
+        manifest = tmp_path / "functions.json"
+        manifest.write_text(json.dumps([{"name": "absoluto", "function": "operator:abs", "coercer": "float"}]))
+        monkeypatch.setenv(registry.MANIFEST_ENV, str(manifest))
+        assert "absoluto" not in registry.REGISTRY
+        assert registry.get("absoluto").function is operator.abs
+
+    def test_missing_manifest_reported(self, undiscovered, verbose_output, monkeypatch, tmp_path):
+        """Test that an unreadable manifest is reported once and unknown names stay unknown."""
+        monkeypatch.setenv(registry.MANIFEST_ENV, str(tmp_path / "missing.json"))
+        with patch('builtins.print') as mock_print, pytest.warns(RuntimeWarning, match="Could not read manifest"):
+            assert main.main(func="nope", params={}) is None
+        mock_print.assert_called_with("Function 'nope' not found in utils module.")
+        assert registry._discovered
+
+    def test_manifest_entries_skipped(self, undiscovered, monkeypatch, tmp_path):
+        """Test that taken names and bad entries are skipped while the rest of the manifest loads."""
+        manifest = tmp_path / "functions.json"
+        manifest.write_text(json.dumps([
+            {"name": "suma", "function": "math:fsum"},
+            {"name": "roto", "function": "math:fabs", "arity": [1, 1], "unknown": True},
+            {"name": "absoluto", "function": "operator:abs", "coercer": "float"},
+        ]))
+        monkeypatch.setenv(registry.MANIFEST_ENV, str(manifest))
+        with pytest.warns(RuntimeWarning) as record:
+            results = main.run_batch([{"func": "absoluto", "params": {"a": "-2"}}, {"func": "suma", "params": {"a": 1}}])
+        assert results == [{"func": "absoluto", "value": 2.0}, {"func": "suma", "value": 1.0}]
+        assert "roto" not in registry.REGISTRY
+        assert len(record) == 2
+        assert registry.REGISTRY["suma"].function is utils.suma
+
+    def test_entry_points(self, undiscovered):
+        """Test that installed entry points are registered without being imported."""
+        entry_points = [
+            metadata.EntryPoint("factorial", "math:factorial", registry.ENTRY_POINT_GROUP),
+            metadata.EntryPoint("suma", "math:fsum", registry.ENTRY_POINT_GROUP),
+        ]
+        with patch.object(metadata, "entry_points", return_value=entry_points) as mock_entry_points:
+            spec = registry.get("factorial")
+        mock_entry_points.assert_called_once_with(group=registry.ENTRY_POINT_GROUP)
+        assert spec._function == "math:factorial"
+        assert registry.REGISTRY["suma"].function is utils.suma
+
+    def test_discovery_runs_once(self, undiscovered):
+        """Test that unknown names do not rescan entry points."""
+        with patch.object(metadata, "entry_points", return_value=[]) as mock_entry_points:
+            assert registry.get("nope") is None
+            assert registry.get("nope") is None
+        mock_entry_points.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+"""
+Test suite for server.py and main.amain.
+"""
+
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+from unittest.mock import patch
+import main
+import registry
+import server
+
+
+def run(coroutine):
+    """Run a coroutine to completion."""
+    return asyncio.run(coroutine)
+
+
+def serve_text(text, concurrency=server.DEFAULT_CONCURRENCY):
+    """Feed text to serve_stdio and return the decoded responses."""
+    stdout = io.StringIO()
+    run(server.serve_stdio(stdin=io.StringIO(text), stdout=stdout, concurrency=concurrency))
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+class TestHandle:
+    """Test cases for handling one decoded request."""
+
+    def test_successful_request(self):
+        """Test a request that succeeds."""
+        response = server.handle({"id": 7, "func": "suma", "params": {"a": "1", "b": 2}})
+        assert response == {"id": 7, "func": "suma", "value": 3.0}
+
+    def test_failing_request(self):
+        """Test a request whose function fails."""
+        response = server.handle({"id": 8, "func": "suma", "params": {"a": "abc"}})
+        assert response["id"] == 8
+        assert "could not convert string to float" in response["error"]
+
+    def test_function_name_not_string(self):
+        """Test a request whose function name is not a string."""
+        response = server.handle({"id": 11, "func": ["suma"], "params": {"a": 1}})
+        assert response == {"id": 11, "func": ["suma"], "error": "Function name should be a string."}
+
+    def test_request_not_object(self):
+        """Test a request that is valid JSON but not an object."""
+        assert server.handle([1, 2]) == {"id": None, "error": "Request should be a JSON object."}
+
+    def test_pipeline_request(self):
+        """Test a request that runs a pipeline in one round-trip."""
+        steps = [{"func": "suma", "params": {"a": 1, "b": 2}}, {"func": "resta", "params": {"a": "$0", "b": 1}}]
+        response = server.handle({"id": 9, "pipeline": steps})
+        assert response == {"id": 9, "results": [{"func": "suma", "value": 3.0}, {"func": "resta", "value": 2.0}]}
+
+    def test_pipeline_not_list(self):
+        """Test a pipeline request whose steps are not a list."""
+        assert server.handle({"id": 10, "pipeline": {}}) == {"id": 10, "error": "Pipeline should be a list of steps."}
+
+
+class TestServeStdio:
+    """Test cases for the newline-delimited JSON loop."""
+
+    def test_responses_for_every_request(self):
+        """Test that every request line gets a response with its id."""
+        text = "\n".join([
+            json.dumps({"id": 1, "func": "suma", "params": {"a": 1, "b": 2}}),
+            "",
+            json.dumps({"id": 2, "func": "lower", "params": {"a": "ÑANDÚ"}}),
+            "not json",
+        ]) + "\n"
+        responses = serve_text(text)
+        by_id = {response["id"]: response for response in responses}
+        assert by_id[1]["value"] == 3.0
+        assert by_id[2]["value"] == ["ñandú"]
+        assert by_id[None]["error"].startswith("Invalid JSON")
+        assert len(responses) == 3
+
+    def test_many_requests(self):
+        """Test a larger stream of requests."""
+        text = "".join(json.dumps({"id": n, "func": "resta", "params": {"a": n, "b": 1}}) + "\n" for n in range(200))
+        responses = serve_text(text, concurrency=8)
+        assert sorted((response["id"], response["value"]) for response in responses) == [
+            (n, n - 1.0) for n in range(200)
+        ]
+
+    def test_slow_request_does_not_block_others(self):
+        """Test that a fast request is answered while a slow one is still running."""
+        answered = threading.Event()
+
+        class Output(io.StringIO):
+            def write(self, text):
+                written = super().write(text)
+                if '"fast"' in text:
+                    answered.set()
+                return written
+
+        def slow():
+            # Returns only once the fast response is out, so the order of the two does not depend on timing.
+            answered.wait(5)
+            return "slow"
+
+        text = json.dumps({"id": "slow", "func": "slow"}) + "\n" + json.dumps({"id": "fast", "func": "fast"}) + "\n"
+        stdout = Output()
+        with patch.dict(registry.REGISTRY):
+            registry.register("slow", slow)
+            registry.register("fast", lambda: "fast")
+            run(server.serve_stdio(stdin=io.StringIO(text), stdout=stdout))
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [response["id"] for response in responses] == ["fast", "slow"]
+
+
+class TestServeUnix:
+    """Test cases for the Unix socket server."""
+
+    def test_round_trip(self, tmp_path):
+        """Test requests and responses over a Unix socket."""
+        path = str(tmp_path / "functions.sock")
+
+        async def scenario():
+            unix_server = await server.serve_unix(path)
+            async with unix_server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                for n in range(3):
+                    writer.write((json.dumps({"id": n, "func": "suma", "params": {"a": n, "b": n}}) + "\n").encode())
+                await writer.drain()
+                lines = [await reader.readline() for _ in range(3)]
+                writer.close()
+                await writer.wait_closed()
+            return [json.loads(line) for line in lines]
+
+        responses = run(scenario())
+        assert sorted(response["value"] for response in responses) == [0.0, 2.0, 4.0]
+
+    def test_long_lines(self, tmp_path):
+        """Test that a large request is served and an over-long one is answered with an error."""
+        path = str(tmp_path / "functions.sock")
+        params = {f"v{n}": n for n in range(20000)}
+
+        async def scenario():
+            unix_server = await server.serve_unix(path, limit=1 << 16)
+            async with unix_server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write((json.dumps({"id": 1, "func": "suma", "params": {"a": 1}}) + "\n").encode())
+                writer.write((json.dumps({"id": 2, "func": "suma", "params": params}) + "\n").encode())
+                writer.write((json.dumps({"id": 3, "func": "suma", "params": {"a": 3}}) + "\n").encode())
+                await writer.drain()
+                lines = [await reader.readline() for _ in range(3)]
+                writer.close()
+                await writer.wait_closed()
+            return [json.loads(line) for line in lines]
+
+        responses = sorted(run(scenario()), key=lambda response: response["id"] or 0)
+        assert "too long" in responses[0]["error"]
+        assert [response["value"] for response in responses[1:]] == [1.0, 3.0]
+        assert server.LINE_LIMIT > len(json.dumps(params))
+
+
+class TestAmain:
+    """Test cases for the async main entry point."""
+
+    def test_amain_returns_result(self):
+        """Test that amain runs main in an executor and returns its result."""
+        assert run(main.amain(func="suma", params={"a": 1, "b": 2})) == 3.0
+
+    def test_amain_concurrent_calls(self):
+        """Test several amain calls awaited together."""
+        async def scenario():
+            return await asyncio.gather(*(main.amain(func="resta", params={"a": n, "b": 1}) for n in range(10)))
+
+        assert run(scenario()) == [n - 1.0 for n in range(10)]
+
+    def test_amain_unknown_function(self):
+        """Test that amain returns None for an unknown function, like main."""
+        assert run(main.amain(func="nope", params={})) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+"""
+Test suite for sinks.py.
+"""
+
+import io
+import logging
+import threading
+
+import pytest
+from unittest.mock import patch
+import main
+import sinks
+from utils import suma, resta, mayuscula_a_minuscula
+
+
+@pytest.fixture
+def restore_sink():
+    """Restore the installed sink after the test."""
+    previous = sinks.get_sink()
+    yield
+    sinks.set_sink(previous)
+
+
+class RecordingSink:
+    """Sink that keeps every (func, message) pair."""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, func, message):
+        self.records.append((func, message))
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.usefixtures("restore_sink")
+class TestDefaultSink:
+    """Test cases for the default no-op sink."""
+
+    @patch('builtins.print')
+    def test_utils_do_not_print_by_default(self, mock_print):
+        """Test that utils functions are silent without a sink."""
+        sinks.set_sink(None)
+        suma(1, 2)
+        resta(3, 1)
+        mayuscula_a_minuscula("A")
+        mock_print.assert_not_called()
+
+    @patch('builtins.print')
+    def test_main_does_not_print_by_default(self, mock_print):
+        """Test that main is silent without a sink but still returns the result."""
+        sinks.set_sink(None)
+        assert main.main(func="suma", params={"var1": 1, "var2": 2}) == 3.0
+        mock_print.assert_not_called()
+
+    def test_null_sink_uninstalls(self):
+        """Test that installing a NullSink leaves no sink installed."""
+        sinks.set_sink(sinks.NullSink())
+        assert sinks.get_sink() is None
+
+    def test_set_sink_returns_previous(self):
+        """Test that set_sink returns the sink it replaced."""
+        first = RecordingSink()
+        sinks.set_sink(first)
+        assert sinks.set_sink(None) is first
+
+
+@pytest.mark.usefixtures("restore_sink")
+class TestSinks:
+    """Test cases for the sink implementations."""
+
+    def test_records_function_and_message(self):
+        """Test that sinks receive the function name and message."""
+        sink = RecordingSink()
+        sinks.set_sink(sink)
+        main.main(func="resta", params={"var1": 5, "var2": 2})
+        assert sink.records == [("resta", "restando"), ("resta", "Result: 3.0")]
+
+    @patch('builtins.print')
+    def test_verbose_reproduces_messages(self, mock_print):
+        """Test that verbose mode prints today's messages."""
+        sinks.verbose()
+        main.main(func="mayuscula_a_minuscula", params={"var1": "HOLA"})
+        calls = [call.args[0] for call in mock_print.call_args_list]
+        assert calls == ["convirtiendo a minúsculas", "Result: ['hola']"]
+
+    def test_deferred_formatting(self):
+        """Test that emit formats arguments only when a sink is installed."""
+        sink = RecordingSink()
+        sinks.set_sink(sink)
+        sinks.emit("suma", "Result: %s", 100)
+        sinks.emit("suma", "100%")
+        assert sink.records == [("suma", "Result: 100"), ("suma", "100%")]
+
+    def test_buffered_sink_flushes_at_capacity(self):
+        """Test that BufferedSink writes only when full or flushed."""
+        stream = io.StringIO()
+        sink = sinks.BufferedSink(stream, capacity=2)
+        sink.write("suma", "one")
+        assert stream.getvalue() == ""
+        sink.write("suma", "two")
+        assert stream.getvalue() == "one\ntwo\n"
+        sink.write("suma", "three")
+        sink.flush()
+        assert stream.getvalue() == "one\ntwo\nthree\n"
+
+    def test_logging_sink(self, caplog):
+        """Test that LoggingSink logs with the function name attached."""
+        sinks.set_sink(sinks.LoggingSink())
+        with caplog.at_level(logging.INFO, logger="multiple_functions"):
+            suma(1)
+        assert caplog.records[0].getMessage() == "sumando"
+        assert caplog.records[0].func == "suma"
+
+    def test_queue_sink_delivers_in_order(self):
+        """Test that QueueSink hands every message to the wrapped sink."""
+        inner = RecordingSink()
+        sink = sinks.QueueSink(inner)
+        for n in range(100):
+            sink.write("suma", str(n))
+        sink.flush()
+        assert [message for _, message in inner.records] == [str(n) for n in range(100)]
+        sink.close()
+
+    def test_queue_sink_survives_failed_writes(self):
+        """Test that a write that raises is counted and later messages still arrive."""
+        inner = RecordingSink()
+        failures = iter([ValueError("I/O operation on closed file.")])
+
+        def write(func, message):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            inner.records.append((func, message))
+
+        sink = sinks.QueueSink(inner)
+        with patch.object(inner, "write", side_effect=write):
+            sink.write("suma", "lost")
+            sink.write("suma", "kept")
+            assert sink.flush()
+        assert inner.records == [("suma", "kept")]
+        assert sink.errors == 1
+        assert "closed" in str(sink.last_error)
+        assert sink.close()
+
+    def test_queue_sink_flush_is_bounded(self):
+        """Test that flush and close give up when the wrapped sink never returns."""
+        release = threading.Event()
+        inner = RecordingSink()
+        sink = sinks.QueueSink(inner)
+        with patch.object(inner, "write", side_effect=lambda func, message: release.wait(5)):
+            sink.write("suma", "stuck")
+            assert sink.flush(timeout=0.05) is False
+            assert sink.close(timeout=0.05) is False
+            release.set()
+
+    def test_buffered_sink_is_thread_safe(self):
+        """Test that concurrent writers do not lose or interleave lines."""
+        stream = io.StringIO()
+        sink = sinks.BufferedSink(stream, capacity=7)
+        sinks.set_sink(sink)
+
+        def worker():
+            for _ in range(200):
+                suma(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.flush()
+        assert stream.getvalue().splitlines() == ["sumando"] * 1600
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+Test suite for text.py.
+"""
+
+import array
+
+import pytest
+import main
+import text
+from utils import mayuscula_a_minuscula
+
+CORPUS = ["ÑANDÚ", "Hola MUNDO", "ΟΔΟΣ", "ΑΣ Β", "İstanbul", "STRASSE ẞ", "", "123 ABC!", "ǅemal"]
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    """Hide NumPy from the text module."""
+    monkeypatch.setattr(text, "np", None)
+
+
+class TestLowerTexts:
+    """Test cases for bulk lowering of str inputs."""
+
+    def test_matches_mayuscula_a_minuscula(self):
+        """Test that the list output matches the per-string function."""
+        assert text.lower_texts(CORPUS) == mayuscula_a_minuscula(*CORPUS)
+
+    def test_unicode(self):
+        """Test full Unicode lowering, not just ASCII."""
+        assert text.lower_texts(["ÑANDÚ"]) == ["ñandú"]
+
+    def test_joined_output(self):
+        """Test that the joined output splits back into the per-string results."""
+        joined = text.lower_texts(CORPUS, output="joined")
+        assert joined.split("\n") == mayuscula_a_minuscula(*CORPUS)
+
+    def test_joined_keeps_final_sigma_per_string(self):
+        """Test that joining does not change context-dependent lowering."""
+        assert text.lower_texts(["ΟΔΟΣ", "Σ"], output="joined", sep="|") == "ΟΔΟΣ".lower() + "|" + "Σ".lower()
+
+    def test_joined_case_ignorable_separators(self):
+        """Test that separators final sigma looks through still give the per-string results."""
+        for sep in ("", "'", ".", ":", "|"):
+            assert text.lower_texts(["AΣ", "B"], output="joined", sep=sep) == sep.join(["aς", "b"])
+
+    def test_non_str_inputs_converted(self):
+        """Test that non-str inputs are converted like the original function."""
+        assert text.lower_texts([123, None, True]) == mayuscula_a_minuscula(123, None, True)
+
+    def test_generator_input(self):
+        """Test that any iterable of texts is accepted."""
+        assert text.lower_texts(word for word in ["A", "B"]) == ["a", "b"]
+
+    def test_unknown_output(self):
+        """Test that an unknown output kind is rejected."""
+        with pytest.raises(ValueError):
+            text.lower_texts(["A"], output="tuple")
+
+    def test_numpy_output(self):
+        """Test that the NumPy output holds the same strings."""
+        pytest.importorskip("numpy")
+        assert list(text.lower_texts(CORPUS, output="numpy")) == mayuscula_a_minuscula(*CORPUS)
+
+    def test_numpy_output_without_numpy(self, no_numpy):
+        """Test the error when NumPy output is requested without NumPy."""
+        with pytest.raises(RuntimeError):
+            text.lower_texts(["A"], output="numpy")
+
+
+class TestLowerBytes:
+    """Test cases for lowering bytes-like inputs."""
+
+    def test_ascii_bytes(self):
+        """Test the ASCII fast path on bytes."""
+        assert text.lower_bytes(b"HOLA Mundo\n123") == b"hola mundo\n123"
+
+    def test_bytearray_type_kept(self):
+        """Test that a bytearray comes back as a new bytearray."""
+        data = bytearray(b"ABC")
+        result = text.lower_bytes(data)
+        assert result == bytearray(b"abc")
+        assert isinstance(result, bytearray)
+        assert data == bytearray(b"ABC")
+
+    def test_utf8_bytes(self):
+        """Test that non-ASCII UTF-8 input gets full Unicode lowering."""
+        assert text.lower_bytes("ÑANDÚ".encode()) == "ñandú".encode()
+
+    def test_memoryview(self):
+        """Test that other bytes-like objects are accepted."""
+        assert text.lower_bytes(memoryview(b"XYZ")) == b"xyz"
+
+
+class TestLowerInplace:
+    """Test cases for in-place lowering of mutable buffers."""
+
+    def test_ascii_bytearray(self):
+        """Test that an ASCII bytearray is lowered in place."""
+        data = bytearray(b"HOLA MUNDO")
+        assert text.lower_inplace(data) is data
+        assert data == bytearray(b"hola mundo")
+
+    def test_across_chunks(self, monkeypatch):
+        """Test buffers larger than one chunk."""
+        monkeypatch.setattr(text, "CHUNK_SIZE", 4)
+        data = bytearray(b"ABCDEFGHIJ")
+        text.lower_inplace(data)
+        assert data == bytearray(b"abcdefghij")
+
+    def test_utf8_bytearray(self, monkeypatch):
+        """Test non-ASCII text after some ASCII chunks."""
+        monkeypatch.setattr(text, "CHUNK_SIZE", 4)
+        source = "HOLA ÑANDÚ"
+        data = bytearray(source.encode())
+        text.lower_inplace(data)
+        assert data.decode() == source.lower()
+
+    def test_invalid_utf8_untouched(self, monkeypatch):
+        """Test that invalid UTF-8 is rejected before any chunk is lowered."""
+        monkeypatch.setattr(text, "CHUNK_SIZE", 4)
+        data = bytearray(b"HOLA MUNDO \xff")
+        with pytest.raises(UnicodeDecodeError):
+            text.lower_inplace(data)
+        assert data == bytearray(b"HOLA MUNDO \xff")
+
+    def test_bytearray_resized(self):
+        """Test that a bytearray may grow when lowering changes the encoded length."""
+        data = bytearray("İ".encode())
+        text.lower_inplace(data)
+        assert data.decode() == "İ".lower()
+
+    def test_fixed_size_buffer_cannot_grow(self):
+        """Test that a buffer that cannot be resized is rejected."""
+        data = array.array("B", "İ".encode())
+        with pytest.raises(ValueError):
+            text.lower_inplace(data)
+
+    def test_fixed_size_buffer(self):
+        """Test lowering a writable buffer that is not a bytearray."""
+        data = array.array("B", b"ABC")
+        text.lower_inplace(data)
+        assert data.tobytes() == b"abc"
+
+    def test_readonly_buffer(self):
+        """Test that a read-only buffer is rejected."""
+        with pytest.raises(TypeError):
+            text.lower_inplace(b"ABC")
+
+
+class TestMainBulkDispatch:
+    """Test cases for mayuscula_a_minuscula_bulk through main.main."""
+
+    def test_list_result(self):
+        """Test the default list result."""
+        assert main.main(func="mayuscula_a_minuscula_bulk", params={"texts": ["ÑANDÚ", "ABC"]}) == ["ñandú", "abc"]
+
+    def test_joined_result(self):
+        """Test the joined result with a custom separator."""
+        params = {"texts": ["A", "B"], "output": "joined", "sep": ","}
+        assert main.main(func="mayuscula_a_minuscula_bulk", params=params) == "a,b"
+
+    def test_bytes_input(self):
+        """Test that bytes input takes the bytes path."""
+        assert main.main(func="mayuscula_a_minuscula_bulk", params={"texts": b"ABC"}) == b"abc"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,8 +2,12 @@
 Test suite for utils.py functions.
 """
 
+import types
+import tracemalloc
+
 import pytest
 from utils import suma, resta, mayuscula_a_minuscula
+from utils import suma_stream, resta_stream, mayuscula_a_minuscula_stream
 
 
 class TestSuma:
@@ -217,6 +221,82 @@ class TestUtilsFunctionIntegration:
         assert text_result == ["mixed case 123!"]
 
 
+class TestStreaming:
+    """Test cases for the streaming variants."""
+
+    def test_suma_stream_generator(self):
+        """Test suma_stream with a generator."""
+        assert suma_stream(n for n in range(5)) == 10.0
+
+    def test_suma_stream_file(self, tmp_path):
+        """Test suma_stream reading lines straight from a file."""
+        path = tmp_path / "nums.txt"
+        path.write_text("1.5\n2.5\n-1\n")
+        with open(path) as lines:
+            assert suma_stream(lines) == 3.0
+
+    def test_suma_stream_matches_suma(self):
+        """Test that suma_stream agrees with suma."""
+        values = [0.1 * n for n in range(1000)]
+        assert suma_stream(iter(values)) == suma(*values)
+
+    def test_suma_stream_empty(self):
+        """Test suma_stream with an empty iterable."""
+        assert suma_stream([]) == 0
+
+    def test_suma_stream_invalid(self):
+        """Test suma_stream with a value that is not a number."""
+        with pytest.raises(ValueError):
+            suma_stream(["1", "abc"])
+
+    def test_resta_stream_generator(self):
+        """Test resta_stream with a generator (100 - 10 - 20 - 30)."""
+        assert resta_stream(n for n in (100, 10, 20, 30)) == 40.0
+
+    def test_resta_stream_matches_resta(self):
+        """Test that resta_stream is identical to resta."""
+        values = [0.1 * n for n in range(1000)]
+        assert resta_stream(iter(values)) == resta(*values)
+
+    def test_resta_stream_empty(self):
+        """Test resta_stream with an empty iterable."""
+        with pytest.raises(IndexError):
+            resta_stream(iter(()))
+
+    def test_mayuscula_a_minuscula_stream_is_lazy(self):
+        """Test that the text stream yields lazily."""
+        consumed = []
+
+        def source():
+            for text in ("HOLA", "MUNDO"):
+                consumed.append(text)
+                yield text
+
+        stream = mayuscula_a_minuscula_stream(source())
+        assert isinstance(stream, types.GeneratorType)
+        assert consumed == []
+        assert next(stream) == "hola"
+        assert consumed == ["HOLA"]
+        assert list(stream) == ["mundo"]
+
+    def test_mayuscula_a_minuscula_stream_file(self, tmp_path):
+        """Test the text stream over file lines, unicode included."""
+        path = tmp_path / "names.txt"
+        path.write_text("ÑANDÚ\nCAFÉ\n", encoding="utf-8")
+        with open(path, encoding="utf-8") as lines:
+            assert list(mayuscula_a_minuscula_stream(lines)) == ["ñandú\n", "café\n"]
+
+    def test_suma_stream_constant_memory(self):
+        """Test that reducing a large generator does not grow memory."""
+        tracemalloc.start()
+        try:
+            suma_stream(str(n) for n in range(200000))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 64 * 1024
+
+
 # Fixtures for testing
 @pytest.fixture
 def sample_numbers():
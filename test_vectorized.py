@@ -0,0 +1,163 @@
+"""
+Test suite for vectorized.py.
+"""
+
+import array
+import math
+
+import pytest
+import main
+import vectorized
+from utils import suma, resta
+
+np = pytest.importorskip("numpy")
+
+
+class TestSumaArray:
+    """Test cases for suma_array."""
+
+    def test_list_input(self, backend):
+        """Test suma_array with a plain list."""
+        assert vectorized.suma_array([1, 2, 3.5]) == 6.5
+
+    def test_string_input(self, backend):
+        """Test suma_array with numeric strings."""
+        assert vectorized.suma_array(["5", "3"]) == 8.0
+
+    def test_array_module_input(self, backend):
+        """Test suma_array with an array.array buffer."""
+        assert vectorized.suma_array(array.array("d", [1.5, 2.5])) == 4.0
+        assert vectorized.suma_array(array.array("i", [1, 2, 3])) == 6.0
+
+    def test_numpy_input(self, backend):
+        """Test suma_array with a one-dimensional NumPy array."""
+        assert vectorized.suma_array(np.arange(101)) == 5050.0
+
+    def test_numpy_multidimensional_input(self):
+        """Test that the NumPy backend flattens multidimensional arrays."""
+        assert vectorized.suma_array(np.ones((3, 4), dtype=np.float32)) == 12.0
+
+    def test_returns_python_float(self):
+        """Test that the NumPy backend returns a Python float."""
+        assert type(vectorized.suma_array(np.arange(3.0))) is float
+
+    def test_empty(self):
+        """Test suma_array with no values."""
+        assert vectorized.suma_array(np.array([])) == 0.0
+
+    def test_invalid_string(self, backend):
+        """Test suma_array with a string that is not a number."""
+        with pytest.raises(ValueError):
+            vectorized.suma_array(["1", "abc"])
+
+    def test_matches_suma(self, backend, values):
+        """Test that the default method gives exactly utils.suma's result."""
+        values = values + [1e16, 1.0, -1e16, -0.0]
+        assert vectorized.suma_array(values) == suma(*values)
+        assert vectorized.suma_array([-0.0]) == suma(-0.0)
+
+    def test_matches_suma_across_chunks(self, monkeypatch, values):
+        """Test that sum()'s corrections carry across chunks."""
+        monkeypatch.setattr(vectorized, "CHUNK_SIZE", 7)
+        values = values[:100] + [1e16, 1.0, -1e16]
+        assert vectorized.suma_array(values) == suma(*values)
+
+    def test_compensated_replay(self, monkeypatch):
+        """Test that the replay of sum()'s Neumaier corrections matches a sequential Neumaier sum."""
+        monkeypatch.setattr(vectorized, "CHUNK_SIZE", 5)
+        values = [1e16, 1.0, -1e16, 0.1, 0.2, 0.3, -2.5e15, 1e-3] * 3
+        assert vectorized._sequential(np.array(values), compensated=True) == vectorized._neumaier(values)
+        assert vectorized._sequential(np.array([1e16, 1.0, -1e16]), compensated=True) == 1.0
+        assert vectorized._sequential(np.array([1e16, 1.0, -1e16])) == 0.0
+
+    @pytest.mark.parametrize("method", ["pairwise", "kahan"])
+    def test_accurate_methods(self, backend, method, values):
+        """Test that the accurate methods agree with math.fsum."""
+        result = vectorized.suma_array(values, method)
+        assert result == pytest.approx(math.fsum(values), rel=1e-14, abs=1e-9)
+
+    def test_kahan_cancellation(self, backend):
+        """Test that Kahan summation recovers values lost by naive summation."""
+        values = [1e16, 1.0, -1e16] * 3
+        assert vectorized.suma_array(values, "kahan") == 3.0
+
+    def test_kahan_across_chunks(self, monkeypatch):
+        """Test Kahan summation when the input spans several chunks."""
+        monkeypatch.setattr(vectorized, "CHUNK_SIZE", 4)
+        values = np.array([1e16, 1.0, 1.0, 1.0, -1e16, 1.0, 1.0, 1.0, 1.0])
+        assert vectorized.suma_array(values, "kahan") == 7.0
+
+    def test_unknown_method(self, backend):
+        """Test that an unknown method is rejected."""
+        with pytest.raises(ValueError, match="Unknown summation method"):
+            vectorized.suma_array([1, 2], "magic")
+
+    @pytest.mark.parametrize("method", vectorized.METHODS)
+    def test_partial_sums(self, backend, method):
+        """Test that partial sums add back up to suma_array."""
+        values = [1e16, 1.0, -1e16, 2.5]
+        parts = vectorized.partial_sums(values, method)
+        assert vectorized.suma_array(parts, method) == vectorized.suma_array(values, method)
+
+
+class TestRestaArray:
+    """Test cases for resta_array."""
+
+    def test_list_input(self, backend):
+        """Test resta_array with a plain list (10 - 2 - 3)."""
+        assert vectorized.resta_array([10, 2, 3]) == 5.0
+
+    def test_single_value(self, backend):
+        """Test resta_array with a single value."""
+        assert vectorized.resta_array(array.array("d", [7.0])) == 7.0
+
+    def test_empty(self, backend):
+        """Test resta_array with no values."""
+        with pytest.raises(IndexError):
+            vectorized.resta_array([])
+
+    def test_matches_resta(self, backend, values):
+        """Test that the default method gives exactly utils.resta's result."""
+        assert vectorized.resta_array(values) == resta(*values)
+        assert vectorized.resta_array(values, "kahan") == pytest.approx(resta(*values), rel=1e-12)
+
+
+class TestBatchKernels:
+    """Test cases for the grouped batch kernels."""
+
+    def test_suma_batch(self):
+        """Test suma_batch over several bound jobs, including an empty one."""
+        assert vectorized.suma_batch([(1.0, 2.0), (), (3.0, 4.5)]) == [3.0, 0.0, 7.5]
+
+    def test_suma_batch_matches_suma(self, values):
+        """Test that suma_batch is bit-identical to suma, including cancellation."""
+        jobs = [tuple(values[i:i + 7]) for i in range(0, 700, 7)] + [(1e16, 1.0, -1e16), (1e16,)]
+        assert vectorized.suma_batch(jobs) == [suma(*job) for job in jobs]
+
+    def test_resta_batch_matches_resta(self, backend, values):
+        """Test that resta_batch is bit-identical to sequential resta."""
+        jobs = [tuple(values[i:i + 7]) for i in range(0, 700, 7)]
+        assert vectorized.resta_batch(jobs) == [resta(*job) for job in jobs]
+
+    def test_resta_batch_requires_values(self, backend):
+        """Test that resta_batch rejects a job with no values."""
+        with pytest.raises(IndexError):
+            vectorized.resta_batch([(1,), ()])
+
+    def test_batch_invalid_value(self, backend):
+        """Test that an unconvertible value fails the whole batch."""
+        with pytest.raises(ValueError):
+            vectorized.resta_batch([(1,), ("abc",)])
+
+
+class TestMainArrayDispatch:
+    """Test dispatching the array functions through main."""
+
+    def test_main_suma_array(self):
+        """Test suma_array through main with a method parameter."""
+        result = main.main(func="suma_array", params={"data": np.arange(10.0), "method": "kahan"})
+        assert result == 45.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,171 @@
+"""
+Test suite for wire.py.
+"""
+
+import array
+import io
+import os
+import struct
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+import main
+import registry
+import wire
+from utils import suma
+
+
+def exchange(*requests):
+    """Serve encoded requests and decode every response."""
+    output = io.BytesIO()
+    wire.serve(io.BytesIO(b"".join(map(wire.dumps, requests))), output)
+    output.seek(0)
+    responses = []
+    while True:
+        response = wire.read_frame(output)
+        if response is None:
+            return responses
+        responses.append(response)
+
+
+class TestCodec:
+    """Test cases for encoding and decoding values."""
+
+    def test_round_trip(self):
+        """Test every scalar and container type."""
+        value = {"none": None, "flags": [True, False], "int": -5, "float": 0.1, "text": "ÑANDÚ", "raw": b"\x00\xff"}
+        assert wire.loads(wire.dumps(value)) == value
+
+    def test_floats_are_exact(self):
+        """Test that floats survive without going through str."""
+        value = 1 / 3
+        assert wire.loads(wire.dumps(value)) == value
+
+    def test_big_int_sent_as_text(self):
+        """Test that integers beyond 64 bits do not break encoding."""
+        assert wire.loads(wire.dumps(2 ** 70)) == str(2 ** 70)
+
+    def test_float_array_zero_copy(self):
+        """Test that a float64 array decodes as an aligned memoryview over the frame."""
+        body = bytearray(wire.dumps({"data": array.array("d", [1.5, 2.5, 3.5])})[8:])
+        data = wire.decode(body)["data"]
+        assert isinstance(data, memoryview)
+        assert data.format == "d"
+        assert data.tolist() == [1.5, 2.5, 3.5]
+        body[-8:] = struct.pack("<d", 9.0)
+        assert data[2] == 9.0
+
+    def test_int_array(self):
+        """Test int64 arrays."""
+        assert wire.loads(wire.dumps(array.array("q", [1, -2]))).tolist() == [1, -2]
+
+    def test_numpy_arrays(self):
+        """Test that NumPy float64 and int64 arrays are packed."""
+        np = pytest.importorskip("numpy")
+        assert wire.loads(wire.dumps(np.arange(3.0))).tolist() == [0.0, 1.0, 2.0]
+        assert wire.loads(wire.dumps(np.arange(3))).format == "q"
+
+    def test_truncated_frame(self):
+        """Test that a frame cut short is reported."""
+        data = wire.dumps({"text": "hola"})
+        with pytest.raises(wire.WireError):
+            wire.loads(data[:-2])
+
+    def test_unknown_tag(self):
+        """Test that an unknown tag is reported."""
+        with pytest.raises(wire.WireError):
+            wire.decode(b"?")
+
+
+class TestServe:
+    """Test cases for the framed request loop."""
+
+    def test_float_array_suma(self):
+        """Test suma over a packed array matches suma over the same values."""
+        values = [0.1 * n for n in range(1000)]
+        (response,) = exchange({"id": 1, "func": "suma", "params": {"data": array.array("d", values)}})
+        assert response["value"] == suma(*values)
+
+    def test_array_not_expanded(self):
+        """Test that the array reaches the kernel as one buffer, not a tuple of floats."""
+        seen = []
+        with patch.object(registry.REGISTRY["resta"], "kernel", side_effect=lambda values: seen.append(values) or 0.0):
+            exchange({"id": 1, "func": "resta", "params": {"data": array.array("d", [5.0, 1.0])}})
+        assert isinstance(seen[0], memoryview)
+
+    def test_empty_array_resta(self):
+        """Test the arity check on the array path."""
+        (response,) = exchange({"id": 2, "func": "resta", "params": {"data": array.array("d")}})
+        assert "at least 1 argument" in response["error"]
+
+    def test_regular_requests(self):
+        """Test ordinary params, errors and pipelines over the wire."""
+        responses = exchange(
+            {"id": 1, "func": "lower", "params": {"a": "ÑANDÚ"}},
+            {"id": 2, "func": "suma", "params": {"a": "abc"}},
+            {"id": 3, "pipeline": [{"func": "suma", "params": {"a": 1}}]},
+            [1, 2],
+        )
+        assert responses[0] == {"id": 1, "func": "lower", "value": ["ñandú"]}
+        assert "could not convert" in responses[1]["error"]
+        assert responses[2] == {"id": 3, "results": [{"func": "suma", "value": 1.0}]}
+        assert responses[3] == {"id": None, "error": "Request should be a map."}
+
+    def test_array_function(self):
+        """Test an array parameter passed to suma_array."""
+        (response,) = exchange({"id": 1, "func": "suma_array", "params": {"data": array.array("d", [1, 2]), "method": "kahan"}})
+        assert response["value"] == 3.0
+
+    def test_truncated_stream(self):
+        """Test that a broken frame gets an error response and ends the loop."""
+        output = io.BytesIO()
+        wire.serve(io.BytesIO(wire.dumps({"id": 1})[:-3]), output)
+        assert "Truncated" in wire.loads(output.getvalue())["error"]
+
+    def test_bad_values_answered(self):
+        """Test that undecodable values get an error response and the loop goes on."""
+        bad_string = b"M" + struct.pack("<Q", 1) + b"s" + struct.pack("<Q", 4) + b"func" + b"s" + struct.pack("<Q", 1) + b"\xff"
+        list_key = b"M" + struct.pack("<Q", 1) + b"L" + struct.pack("<Q", 0) + b"N"
+        nested = (b"L" + struct.pack("<Q", 1)) * 5000 + b"N"
+        frames = [struct.pack("<Q", len(body)) + body for body in (bad_string, list_key, nested)]
+        output = io.BytesIO()
+        wire.serve(io.BytesIO(b"".join(frames) + wire.dumps({"id": 4, "func": "suma", "params": {"a": 1}})), output)
+        output.seek(0)
+        responses = [wire.read_frame(output) for _ in range(4)]
+        assert "Invalid UTF-8" in responses[0]["error"]
+        assert "Map keys" in responses[1]["error"]
+        assert "nested too deeply" in responses[2]["error"]
+        assert responses[3] == {"id": 4, "func": "suma", "value": 1.0}
+
+    def test_function_name_not_string(self):
+        """Test that list and map function names get an error response and the loop goes on."""
+        requests = [{"id": 1, "func": ["suma"]}, {"id": 2, "func": {"name": "suma"}, "params": {"a": 1}}]
+        requests.append({"id": 3, "func": "suma", "params": {"a": 1}})
+        output = io.BytesIO()
+        wire.serve(io.BytesIO(b"".join(map(wire.dumps, requests))), output)
+        output.seek(0)
+        responses = [wire.read_frame(output) for _ in range(3)]
+        assert responses[0]["error"] == "Function name should be a string."
+        assert responses[1]["error"] == "Function name should be a string."
+        assert responses[2] == {"id": 3, "func": "suma", "value": 1.0}
+
+    def test_oversized_frame(self):
+        """Test that a header over MAX_FRAME is rejected without allocating the body."""
+        output = io.BytesIO()
+        wire.serve(io.BytesIO(struct.pack("<Q", 1 << 62)), output)
+        assert "exceeds" in wire.loads(output.getvalue())["error"]
+
+    def test_cli(self):
+        """Test main.py --wire over a pipe."""
+        request = wire.dumps({"id": 9, "func": "suma", "params": {"data": array.array("d", [0.5] * 10)}})
+        process = subprocess.run(
+            [sys.executable, "main.py", "--wire"], input=request, capture_output=True, check=True,
+            cwd=os.path.dirname(main.__file__) or ".",
+        )
+        assert wire.loads(process.stdout) == {"id": 9, "func": "suma", "value": 5.0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
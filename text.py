@@ -0,0 +1,75 @@
+import sinks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OUTPUTS = ("list", "joined", "numpy")
+CHUNK_SIZE = 1 << 16
+
+
+def _as_strs(texts):
+    # str(text) returns the same object for an exact str, so only rebuild when something needs converting.
+    if isinstance(texts, (list, tuple)) and all(type(text) is str for text in texts):
+        return texts
+    return [str(text) for text in texts]
+
+
+def lower_texts(texts, output="list", sep="\n"):
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}', expected one of {OUTPUTS}.")
+    texts = _as_strs(texts)
+    if output == "joined":
+        if sep.isspace():
+            # Whitespace is neither cased nor case-ignorable, so final sigma sees the same word boundaries.
+            return sep.join(texts).lower()
+        return sep.join(map(str.lower, texts))
+    if output == "numpy":
+        return lower_array(texts)
+    return list(map(str.lower, texts))
+
+
+def lower_array(texts):
+    if np is None:
+        raise RuntimeError("NumPy is not installed.")
+    if hasattr(np, "strings"):
+        return np.strings.lower(np.array(texts, dtype=np.dtypes.StringDType()))
+    # Fixed-width unicode arrays lower per code point; object arrays call str.lower and keep special casing.
+    return np.char.lower(np.array(texts, dtype=object))
+
+
+def lower_bytes(data):
+    raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+    if raw.isascii():
+        return raw.lower()
+    lowered = raw.decode("utf-8").lower().encode("utf-8")
+    return bytearray(lowered) if isinstance(raw, bytearray) else lowered
+
+
+def lower_inplace(buffer):
+    view = memoryview(buffer).cast("B")
+    if view.readonly:
+        raise TypeError("lower_inplace() needs a writable buffer.")
+    starts = range(0, len(view), CHUNK_SIZE)
+    if all(view[start:start + CHUNK_SIZE].tobytes().isascii() for start in starts):
+        for start in starts:
+            view[start:start + CHUNK_SIZE] = view[start:start + CHUNK_SIZE].tobytes().lower()
+        return buffer
+    # Decoding comes before any write, so invalid UTF-8 leaves the buffer untouched.
+    lowered = view.tobytes().decode("utf-8").lower().encode("utf-8")
+    if len(lowered) == len(view):
+        view[:] = lowered
+        return buffer
+    view.release()
+    if not isinstance(buffer, bytearray):
+        raise ValueError("Lowering changed the buffer length; pass a bytearray to allow resizing.")
+    buffer[:] = lowered
+    return buffer
+
+
+def mayuscula_a_minuscula_bulk(texts, output="list", sep="\n"):
+    sinks.emit('mayuscula_a_minuscula', 'convirtiendo a minúsculas')
+    if isinstance(texts, (bytes, bytearray, memoryview)):
+        return lower_bytes(texts)
+    return lower_texts(texts, output, sep)
@@ -1,18 +1,48 @@
+import sinks
+
 def suma(*nums):
-    print('sumando')
-    nums_for_real = [float(num) for num in nums]
-    return sum(nums_for_real)
+    sinks.emit('suma', 'sumando')
+    return sum(map(float, nums))
 
 def resta(*nums):
-    print('restando')
-    nums_for_real = [float(num) for num in nums]
-    result = nums_for_real[0]
-    for num in nums_for_real[1:]:
-        result -= num
-    return result
+    sinks.emit('resta', 'restando')
+    return _restar(map(float, nums))
 
 def mayuscula_a_minuscula(*texts):
-    print('convirtiendo a minúsculas')
-    texts_for_real = [str(text) for text in texts]
-    lower_texts = [text.lower() for text in texts_for_real]
-    return lower_texts
+    sinks.emit('mayuscula_a_minuscula', 'convirtiendo a minúsculas')
+    return [str(text).lower() for text in texts]
+
+def suma_stream(nums):
+    sinks.emit('suma', 'sumando')
+    return sum(map(float, nums))
+
+def resta_stream(nums):
+    sinks.emit('resta', 'restando')
+    return _restar(map(float, nums))
+
+def mayuscula_a_minuscula_stream(texts):
+    sinks.emit('mayuscula_a_minuscula', 'convirtiendo a minúsculas')
+    for text in texts:
+        yield str(text).lower()
+
+def suma_floats(nums):
+    sinks.emit('suma', 'sumando')
+    return sum(nums)
+
+def resta_floats(nums):
+    sinks.emit('resta', 'restando')
+    return _restar(nums)
+
+def mayuscula_a_minuscula_strs(texts):
+    sinks.emit('mayuscula_a_minuscula', 'convirtiendo a minúsculas')
+    return [text.lower() for text in texts]
+
+def _restar(values):
+    values = iter(values)
+    for result in values:
+        break
+    else:
+        raise IndexError("resta() requires at least one number.")
+    for num in values:
+        result -= num
+    return result
@@ -0,0 +1,196 @@
+import math
+import sys
+
+import parsing
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+METHODS = ("fast", "pairwise", "kahan")
+CHUNK_SIZE = 1 << 16
+# From 3.12 on, sum() of floats adds Neumaier corrections; "fast" reproduces whichever sum() this interpreter has.
+COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def as_float_array(data):
+    if np is None:
+        raise RuntimeError("NumPy is not installed.")
+    if isinstance(data, np.ndarray):
+        values = data
+    else:
+        try:
+            values = np.asarray(memoryview(data))
+        except TypeError:
+            values = parsing.to_floats(data)
+    return values.astype(np.float64, copy=False).ravel()
+
+
+def _neumaier_parts(values):
+    total = 0.0
+    compensation = 0.0
+    for value in values:
+        step = total + value
+        if abs(total) >= abs(value):
+            compensation += (total - step) + value
+        else:
+            compensation += (value - step) + total
+        total = step
+    return [total, compensation]
+
+
+def _neumaier(values):
+    total, compensation = _neumaier_parts(values)
+    return total + compensation
+
+
+def _pairwise(values):
+    # Binary-counter merge: O(log n) partials, each added to one of equal weight.
+    stack = []
+    for value in values:
+        size = 1
+        while stack and stack[-1][0] == size:
+            value += stack.pop()[1]
+            size *= 2
+        stack.append((size, value))
+    total = 0.0
+    while stack:
+        total += stack.pop()[1]
+    return total
+
+
+_PYTHON_REDUCERS = {"fast": sum, "pairwise": _pairwise, "kahan": _neumaier}
+
+
+def _check_method(method):
+    if method not in METHODS:
+        raise ValueError(f"Unknown summation method '{method}', expected one of {METHODS}.")
+
+
+def _cascade(values):
+    # Pairwise sum that keeps every rounding error (TwoSum) and adds them back.
+    error = 0.0
+    while len(values) > 1:
+        if len(values) % 2:
+            values = np.append(values, 0.0)
+        left = values[0::2]
+        right = values[1::2]
+        pair_sums = left + right
+        virtual = pair_sums - left
+        error += float(np.add.reduce((left - (pair_sums - virtual)) + (right - virtual)))
+        values = pair_sums
+    return (float(values[0]) if len(values) else 0.0), error
+
+
+def _kahan_parts(values):
+    parts = []
+    for start in range(0, len(values), CHUNK_SIZE):
+        parts.extend(_cascade(values[start:start + CHUNK_SIZE]))
+    return parts
+
+
+def _sequential(values, total=0.0, compensated=False):
+    # Running totals are a cumulative sum, which NumPy adds strictly in order, so the last one equals adding
+    # the values one by one; sum()'s Neumaier corrections follow from each pair of consecutive totals.
+    compensation = 0.0
+    with np.errstate(over="ignore", invalid="ignore"):
+        for start in range(0, len(values), CHUNK_SIZE):
+            chunk = values[start:start + CHUNK_SIZE]
+            totals = np.add.accumulate(np.concatenate(([total], chunk)))
+            if compensated:
+                previous = totals[:-1]
+                steps = totals[1:]
+                errors = np.where(
+                    np.abs(previous) >= np.abs(chunk), (previous - steps) + chunk, (chunk - steps) + previous,
+                )
+                if start == 0:
+                    # sum() adds its first value to the start value 0 without a correction.
+                    errors[0] = 0.0
+                compensation = float(np.add.accumulate(np.concatenate(([compensation], errors)))[-1])
+            total = float(totals[-1])
+    if compensation and math.isfinite(compensation):
+        total += compensation
+    return total
+
+
+def _reduce(values, method):
+    if method == "fast":
+        return _sequential(values, compensated=COMPENSATED_SUM)
+    if method == "pairwise":
+        # NumPy's add.reduce sums pairwise.
+        return float(np.add.reduce(values))
+    return _neumaier(_kahan_parts(values))
+
+
+def suma_array(data, method="fast"):
+    _check_method(method)
+    if np is None:
+        return _PYTHON_REDUCERS[method](map(float, data))
+    return _reduce(as_float_array(data), method)
+
+
+def partial_sums(data, method="fast"):
+    # Floats whose sum, by the same method, is suma_array(data); kahan keeps its error terms unrounded.
+    _check_method(method)
+    if method != "kahan":
+        return [suma_array(data, method)]
+    if np is None:
+        return _neumaier_parts(map(float, data))
+    return _kahan_parts(as_float_array(data))
+
+
+def resta_array(data, method="fast"):
+    # "fast" subtracts one value at a time like resta; the other methods subtract an accurate sum of the rest.
+    _check_method(method)
+    if np is None:
+        values = iter(map(float, data))
+        first = next(values, None)
+        if first is None:
+            raise IndexError("resta_array() requires at least one value.")
+        if method == "fast":
+            for value in values:
+                first -= value
+            return first
+        return first - _PYTHON_REDUCERS[method](values)
+    values = as_float_array(data)
+    if len(values) == 0:
+        raise IndexError("resta_array() requires at least one value.")
+    if method == "fast":
+        return _sequential(np.negative(values[1:]), float(values[0]))
+    return float(values[0]) - _reduce(values[1:], method)
+
+
+def _segments(arg_lists):
+    lengths = np.fromiter(map(len, arg_lists), dtype=np.intp, count=len(arg_lists))
+    flat = [value for args in arg_lists for value in args]
+    values = parsing.to_floats(flat)
+    segment_ids = np.repeat(np.arange(len(arg_lists)), lengths)
+    return values, segment_ids, lengths
+
+
+def suma_batch(arg_lists):
+    # Jobs arrive bound, so already floats. sum() per job matches suma, which is compensated from 3.12 on, and
+    # is faster than flattening the jobs into one array just to split it again.
+    return [sum(args) for args in arg_lists]
+
+
+def _resta_sequential(args):
+    result = float(args[0])
+    for value in args[1:]:
+        result -= float(value)
+    return result
+
+
+def resta_batch(arg_lists):
+    if any(len(args) == 0 for args in arg_lists):
+        raise IndexError("resta_batch() requires at least one value per job.")
+    if np is None:
+        return [_resta_sequential(args) for args in arg_lists]
+    values, segment_ids, lengths = _segments(arg_lists)
+    starts = np.cumsum(lengths) - lengths
+    firsts = values[starts]
+    # a - b - c accumulated in order as a + (-b) + (-c), which is bit-identical.
+    np.negative(values, out=values)
+    values[starts] = firsts
+    return np.bincount(segment_ids, weights=values, minlength=len(arg_lists)).tolist()
@@ -0,0 +1,241 @@
+import array
+import struct
+import sys
+
+import planner
+import registry
+
+# A frame is an unsigned 64-bit little-endian body length followed by one encoded value.
+# Values are a one-byte tag and a payload; lengths and counts are unsigned 64-bit little-endian.
+# Array payloads start on an 8-byte boundary of the body, so they decode as aligned memoryviews.
+_LENGTH = struct.Struct("<Q")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_ARRAY_TAGS = {"d": b"D", "q": b"Q"}
+_ARRAY_FORMATS = {b"D": "d", b"Q": "q"}
+_PADDING = bytes(8)
+# Larger headers are rejected before anything is allocated; 1 GiB holds 128M float64 values.
+MAX_FRAME = 1 << 30
+
+
+class WireError(ValueError):
+    pass
+
+
+def _as_array(value):
+    # Anything exposing a contiguous one-dimensional float64 or int64 buffer is sent as packed data.
+    if not isinstance(value, (memoryview, array.array)) and type(value).__name__ != "ndarray":
+        return None
+    try:
+        view = memoryview(value)
+        if view.ndim != 1 or view.itemsize != 8:
+            return None
+        code = view.format.lstrip("@=<")
+        if code == "d":
+            return view.cast("B").cast("d")
+        if code in ("q", "l"):
+            return view.cast("B").cast("q")
+    except TypeError:
+        pass
+    return None
+
+
+def _encode(value, parts, size):
+    # Appends buffers to parts and returns the new body size.
+    if value is None:
+        parts.append(b"N")
+        return size + 1
+    if value is True or value is False:
+        parts.append(b"T" if value else b"F")
+        return size + 1
+    if isinstance(value, float):
+        parts.append(b"d" + _FLOAT.pack(value))
+        return size + 9
+    if isinstance(value, int) and -1 << 63 <= value < 1 << 63:
+        parts.append(b"i" + _INT.pack(value))
+        return size + 9
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        parts.append(b"s" + _LENGTH.pack(len(data)))
+        parts.append(data)
+        return size + 9 + len(data)
+    if isinstance(value, (bytes, bytearray)):
+        parts.append(b"b" + _LENGTH.pack(len(value)))
+        parts.append(value)
+        return size + 9 + len(value)
+    view = _as_array(value)
+    if view is not None:
+        parts.append(_ARRAY_TAGS[view.format] + _LENGTH.pack(len(view)))
+        size += 9
+        padding = -size % 8
+        parts.append(_PADDING[:padding])
+        parts.append(view.cast("B"))
+        return size + padding + view.nbytes
+    if isinstance(value, dict):
+        parts.append(b"M" + _LENGTH.pack(len(value)))
+        size += 9
+        for key, item in value.items():
+            size = _encode(str(key), parts, size)
+            size = _encode(item, parts, size)
+        return size
+    if isinstance(value, (list, tuple)):
+        parts.append(b"L" + _LENGTH.pack(len(value)))
+        size += 9
+        for item in value:
+            size = _encode(item, parts, size)
+        return size
+    if hasattr(value, "__iter__"):
+        return _encode(list(value), parts, size)
+    return _encode(str(value), parts, size)
+
+
+def encode(value):
+    parts = []
+    size = _encode(value, parts, 0)
+    return [_LENGTH.pack(size)] + parts
+
+
+def dumps(value):
+    return b"".join(encode(value))
+
+
+def _decode(view, offset):
+    tag = view[offset:offset + 1].tobytes()
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"d":
+        return _FLOAT.unpack_from(view, offset)[0], offset + 8
+    if tag == b"i":
+        return _INT.unpack_from(view, offset)[0], offset + 8
+    (length,) = _LENGTH.unpack_from(view, offset)
+    offset += 8
+    if tag in _ARRAY_FORMATS:
+        offset += -offset % 8
+        length *= 8
+    if tag in (b"s", b"b", b"D", b"Q") and offset + length > len(view):
+        raise WireError("Value runs past the end of the frame.")
+    if tag in (b"L", b"M") and length > len(view) - offset:
+        # Every item takes at least one byte.
+        raise WireError("Value runs past the end of the frame.")
+    if tag == b"s":
+        try:
+            return str(view[offset:offset + length], "utf-8"), offset + length
+        except UnicodeDecodeError as error:
+            raise WireError(f"Invalid UTF-8 string: {error}") from None
+    if tag == b"b":
+        return view[offset:offset + length].tobytes(), offset + length
+    if tag in _ARRAY_FORMATS:
+        return view[offset:offset + length].cast(_ARRAY_FORMATS[tag]), offset + length
+    if tag == b"L":
+        items = []
+        for _ in range(length):
+            item, offset = _decode(view, offset)
+            items.append(item)
+        return items, offset
+    if tag == b"M":
+        items = {}
+        for _ in range(length):
+            key, offset = _decode(view, offset)
+            if key is not None and not isinstance(key, (str, bytes, int, float)):
+                raise WireError(f"Map keys should be scalars, not {type(key).__name__}.")
+            items[key], offset = _decode(view, offset)
+        return items, offset
+    raise WireError(f"Unknown value tag {tag!r}.")
+
+
+def decode(body):
+    # Arrays in the result are memoryviews over body, not copies.
+    view = memoryview(body)
+    try:
+        value, offset = _decode(view, 0)
+    except struct.error as error:
+        raise WireError(f"Truncated frame: {error}") from None
+    except RecursionError:
+        raise WireError("Value nested too deeply.") from None
+    if offset != len(view):
+        raise WireError(f"{len(view) - offset} unexpected bytes after the value.")
+    return value
+
+
+def loads(data):
+    (length,) = _LENGTH.unpack_from(data, 0)
+    return decode(memoryview(data)[_LENGTH.size:_LENGTH.size + length])
+
+
+def _read_body(stream):
+    header = stream.read(_LENGTH.size)
+    if not header:
+        return None
+    if len(header) < _LENGTH.size:
+        raise WireError("Truncated frame header.")
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_FRAME:
+        raise WireError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit.")
+    # The only copy of the payload: from the stream into this buffer.
+    body = bytearray(length)
+    view = memoryview(body)
+    received = 0
+    while received < length:
+        count = stream.readinto(view[received:])
+        if not count:
+            raise WireError("Truncated frame body.")
+        received += count
+    return body
+
+
+def read_frame(stream):
+    body = _read_body(stream)
+    return None if body is None else decode(body)
+
+
+def write_frame(stream, value):
+    for part in encode(value):
+        stream.write(part)
+    stream.flush()
+
+
+def handle(request):
+    if not isinstance(request, dict):
+        return {"id": None, "error": "Request should be a map."}
+    func = request.get("func")
+    params = request.get("params", {})
+    buffered = isinstance(func, str) and isinstance(params, dict) and "pipeline" not in request
+    spec = registry.get(func) if buffered else None
+    values = planner.buffer_argument(spec, params) if spec is not None else None
+    if values is None:
+        import server
+        return server.handle(request)
+    response = {"id": request.get("id"), "func": func}
+    if spec.arity is not None and len(values) < spec.arity[0]:
+        response["error"] = f"{spec.name}() takes at least {spec.arity[0]} argument(s) ({len(values)} given)"
+        return response
+    try:
+        response["value"] = planner.run(spec, values, planner.choose(spec, values))
+    except Exception as error:
+        response["error"] = str(error)
+    return response
+
+
+def serve(stdin=None, stdout=None):
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    while True:
+        try:
+            body = _read_body(stdin)
+        except WireError as error:
+            # The stream is out of step with the frames, so nothing after this can be read.
+            write_frame(stdout, {"id": None, "error": str(error)})
+            return
+        if body is None:
+            return
+        try:
+            request = decode(body)
+        except WireError as error:
+            write_frame(stdout, {"id": None, "error": str(error)})
+            continue
+        write_frame(stdout, handle(request))